@@ -363,3 +363,9 @@ class PedidoDialog(tk.Toplevel):
 if __name__ == "__main__":
     app = SinfinesConradApp()
     app.mainloop()
+
+    # SINFINES_PERFIL_CATALOGOS=1 -> qué secciones de catálogo se llegaron a cargar
+    if os.environ.get("SINFINES_PERFIL_CATALOGOS"):
+        from utils.catalogs import catalog_profile, format_catalog_profile
+
+        print(format_catalog_profile(catalog_profile()))
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import json
-import math
 import tkinter as tk
 from tkinter import ttk, messagebox
 from turtle import lt
@@ -16,15 +15,31 @@ from utils.db import (
     get_estado_tarea,
     set_estado_tarea,
 )
+from engine.reglas import longitud_total_exterior, ref_cjto_intermedio, ref_ventana_inspeccion
+from engine.sinfin import camisa_para_espira
+from engine.capacidad import LLENADO_CLASES, LLENADO_DEFECTO, capacidad_definicion, texto_capacidad
+from engine.estructura import comprobar_eje_definicion, texto_comprobacion, texto_propuesto
+from engine.vibracion import critica_definicion, texto_critica
+from engine.rodamientos import rodamientos_definicion, texto_vida
+from engine.tornilleria import metrica_definicion, texto_tornillos
+from engine.espira import desarrollos_definicion, texto_desarrollo
+from engine.potencia import LAMBDA_CLASES, LAMBDA_DEFECTO, potencia_definicion, texto_potencia
 from utils.catalogs import (
-    load_catalogs,
+    get_catalogs,
+    catalog_backend,
+    catalog_model,
     filter_espesores_por_od,
     filter_rodamientos_por_tubo,
-    is_mecanizado_ok,
     tubo_id_mm,
 )
 from pathlib import Path
 from exporter.inventor_export import export_params_to_json
+from app.widgets import AutocompleteCombobox
+from utils.catalog_watch import changed_sections, get_catalog_watcher
+
+
+# Cada cuánto mira la ventana si el watcher ha recargado catálogos
+CATALOG_POLL_MS = 1000
 
 
 # ------------------ UI Helpers ------------------
@@ -165,8 +180,13 @@ class SinfinWindow(tk.Toplevel):
 
         _set_dark_style(self)
 
-        # Cargar catálogos desde JSON
-        self.catalogs = load_catalogs()
+        # Catálogos compartidos (se parsean una vez por proceso)
+        self.catalogs = get_catalogs()
+        self._model = catalog_model(self.catalogs)
+        # combos alimentados por una sección del catálogo (para la recarga en caliente)
+        self._catalog_combos: dict[str, List[ttk.Combobox]] = {}
+        self._catalog_watcher = get_catalog_watcher() if catalog_backend() == "json" else None
+        self._catalog_poll_job = None
 
         # ---------------- Vars (Definición) ----------------
         self.v_section = tk.StringVar(value="General")
@@ -223,6 +243,7 @@ class SinfinWindow(tk.Toplevel):
 
         # Tornillería automática (texto)
         self.v_metrica_tornillos = tk.StringVar()
+        self.v_tornillos_estado = tk.StringVar()      # readonly: comprobación a par (no se guarda)
 
         # Espiras/pasos
         self.v_diam_espira = tk.StringVar()
@@ -257,10 +278,46 @@ class SinfinWindow(tk.Toplevel):
         self.v_002A_camisa_od.trace_add("write", lambda *_: self._auto_ref_cjto_intermedio_002A())
         self.v_mangones_intermedios.trace_add("write", lambda *_: self._auto_ref_cjto_intermedio_002A())
         self.v_mangon_conduccion.trace_add("write", lambda *_: self._auto_ref_cjto_intermedio_002A())  # si usas ese diámetro para intermedio
-        self.v_diam_espira.trace_add("write", lambda *_: self._auto_camisa_tubo_002A())
         # Si tienes camisa_od:
         self.v_002A_camisa_od.trace_add("write", lambda *_: self._auto_ref_ventana_inspeccion_002A())
 
+        # Planos de testeros (Lista_eje_tubo.csv) del tubo eje y del tubo camisa
+        self.v_plano_testeros_eje = tk.StringVar(value="")     # readonly
+        self.v_002A_plano_testeros = tk.StringVar(value="")    # readonly
+        for v in (self.v_eje_od, self.v_eje_thk, self.v_002A_camisa_od, self.v_002A_camisa_thk):
+            v.trace_add("write", lambda *_: self._auto_plano_testeros())
+
+        # Capacidad de transporte (engine.capacidad), se muestra en GENERAL
+        self.v_rpm = tk.StringVar(value="")
+        self.v_coef_llenado = tk.StringVar(value=f"{LLENADO_DEFECTO:g}")
+        self.v_densidad_aparente = tk.StringVar(value="")    # t/m³
+        self.v_capacidad = tk.StringVar(value="")            # readonly
+        for v in (
+            self.v_diam_espira, self.v_eje_od, self.v_paso1, self.v_paso2, self.v_paso3,
+            self.v_angulo_inclinacion, self.v_sentido_material,
+            self.v_rpm, self.v_coef_llenado, self.v_densidad_aparente,
+        ):
+            v.trace_add("write", lambda *_: self._recalc_capacidad())
+
+        # Potencia / par (engine.potencia), se muestra en CONDUCCIÓN
+        self.v_factor_material = tk.StringVar(value=f"{LAMBDA_DEFECTO:g}")
+        self.v_potencia = tk.StringVar(value="")             # readonly
+        self.v_motorreductor = tk.StringVar(value="")
+        for v in (self.v_long_test, self.v_factor_material, self.v_tipo_dispos):
+            v.trace_add("write", lambda *_: self._recalc_potencia())
+
+        # Comprobación estructural del tubo eje (engine.estructura), se muestra en TORNILLO
+        self.v_comprobacion_eje = tk.StringVar(value="")     # readonly
+        self.v_eje_propuesto = tk.StringVar(value="")        # readonly
+        self._eje_propuesto = None
+        self.v_velocidad_critica = tk.StringVar(value="")   # readonly (engine.vibracion)
+
+        # Desarrollo plano de la espira (engine.espira, caché en disco)
+        self.v_desarrollo_espira = tk.StringVar(value="")   # readonly
+        for v in (self.v_diam_espira, self.v_eje_od, self.v_espesor_espira, self.v_paso1, self.v_paso2, self.v_paso3):
+            v.trace_add("write", lambda *_: self._recalc_desarrollo())
+        for v in (self.v_eje_thk, self.v_espesor_espira, self.v_mangones_intermedios, self.v_num_mangones_intermedios):
+            v.trace_add("write", lambda *_: self._recalc_eje())
 
         # 002B
         self.v_002B_chapa_artesa = tk.StringVar()
@@ -310,6 +367,14 @@ class SinfinWindow(tk.Toplevel):
         # PARTE 004 – CONDUCIDO
         self.v_rod_conducido = tk.StringVar()
 
+        # Vida L10h del rodamiento elegido (engine.rodamientos); candidatos ordenados por vida y coste
+        self.v_l10h_conduccion = tk.StringVar(value="")     # readonly
+        self.v_l10h_conducido = tk.StringVar(value="")      # readonly
+        self._rod_candidatos: List[str] = []
+        self._rod_vidas: dict = {"conduccion": {}, "conducido": {}}
+        self.v_rod_conduccion.trace_add("write", lambda *_: self._mostrar_vida_rodamientos())
+        self.v_rod_conducido.trace_add("write", lambda *_: self._mostrar_vida_rodamientos())
+
         # refs widgets
         self.cb_long_test: Optional[ttk.Combobox] = None
         self.ent_long_total_ext: Optional[tk.Entry] = None
@@ -332,6 +397,9 @@ class SinfinWindow(tk.Toplevel):
         self._build_ui()
         self._load_all()
 
+        if self._catalog_watcher is not None:
+            self._catalog_poll_job = self.after(CATALOG_POLL_MS, self._poll_catalogs)
+
     def _get_definicion_completa(self) -> dict:
         """
         Devuelve un dict con todos los parámetros necesarios para exportar a Inventor.
@@ -387,6 +455,10 @@ class SinfinWindow(tk.Toplevel):
             "boca_out_final_alto": self.bocas["out"]["final_alto"].get().strip(),
             "boca_out_offset_testero": self.bocas["out"]["offset_testero"].get().strip(),
 
+            # códigos de plano (Lista_eje_tubo.csv)
+            "plano_testeros_eje": self.v_plano_testeros_eje.get().strip(),
+            "plano_testeros_camisa": self.v_002A_plano_testeros.get().strip(),
+
             # opcional (DEJA SOLO UNA VEZ)
             "espesor_testero": (
                 self.v_002A_testeros.get().strip()
@@ -568,6 +640,12 @@ class SinfinWindow(tk.Toplevel):
     def _clear_right(self):
         for w in self.right.winfo_children():
             w.destroy()
+        self._catalog_combos = {}
+
+    def _catalog_combo(self, section: str, cb: ttk.Combobox) -> ttk.Combobox:
+        """Registra un combo cuyos valores salen de catalogs[section]."""
+        self._catalog_combos.setdefault(section, []).append(cb)
+        return cb
 
     def _make_form(self, title: str, cols: int = 2) -> ttk.Frame:
         """
@@ -667,48 +745,42 @@ class SinfinWindow(tk.Toplevel):
 
     # ------------------ Helpers automáticos ------------------
 
-    def _ceil_to_5(self, x: float) -> int:
-        return int(math.ceil(x / 5.0) * 5)
-
     def _auto_from_tubo(self):
         """
-        - Calcula ID del tubo y propone mangones = (ID + 10) redondeado a 5 por arriba.
-        - Tornillería automática: M12 x (ID + 25) redondeada a 5 por arriba.
+        Rellena desde la fila de compatibilidad del tubo (utils.catalog_model.Compatibilidad):
+        - tubo interior = ID + 0.2 y barra de compra a 5 por arriba
+        - mangones = (ID + 10) redondeado a 5 por arriba
+        - tornillería automática: menor métrica que aguanta el par (engine.tornilleria),
+          M12 x (ID + 25) redondeada a 5 por arriba si no hay par
         """
-        if not is_mecanizado_ok(self.v_eje_od.get(), self.v_eje_thk.get()):
+        row = self._model.compat(self.v_eje_od.get(), self.v_eje_thk.get())
+        if row is None or not row.mecanizado_ok:
             return
 
-        try:
-            id_calc = tubo_id_mm(self.v_eje_od.get(), self.v_eje_thk.get())
-            id_mm = float(id_calc) if id_calc is not None and str(
-                id_calc).strip() else None
-        except Exception:
-            id_mm = None
-
-        if id_mm is None:
-            self.v_tubo_int_conduccion.set("")
-            self.v_tubo_int_conducido.set("")
-            self.v_mangon_stock_conduccion.set("")
-            self.v_mangon_stock_conducido.set("")
-            return
-
-        tubo_int = id_mm + 0.2
-        mangon_compra = self._ceil_to_5(tubo_int)
-        self.v_tubo_int_conduccion.set(f"{tubo_int:.1f}")
-        self.v_tubo_int_conducido.set(f"{tubo_int:.1f}")
-        self.v_mangon_stock_conduccion.set(str(mangon_compra))
-        self.v_mangon_stock_conducido.set(str(mangon_compra))
-
-        mangon = self._ceil_to_5(id_mm + 10.0)
+        self.v_tubo_int_conduccion.set(f"{row.tubo_int:.1f}")
+        self.v_tubo_int_conducido.set(f"{row.tubo_int:.1f}")
+        self.v_mangon_stock_conduccion.set(str(row.mangon_stock))
+        self.v_mangon_stock_conducido.set(str(row.mangon_stock))
 
         # Solo autocompleta si vacío (no pisa lo que escriba el usuario)
         if not self.v_mangon_conduccion.get().strip():
-            self.v_mangon_conduccion.set(str(mangon))
+            self.v_mangon_conduccion.set(str(row.mangon))
         if not self.v_mangon_conducido.get().strip():
-            self.v_mangon_conducido.set(str(mangon))
+            self.v_mangon_conducido.set(str(row.mangon))
+
+        self.v_metrica_tornillos.set(row.tornillos)
+        self._recalc_tornillos()
 
-        bolt_len = self._ceil_to_5(id_mm + 25.0)
-        self.v_metrica_tornillos.set(f"M12x{bolt_len}")
+    def _recalc_tornillos(self, par_nm=None):
+        """Tornillería de la unión tubo–mangón por cortadura / aplastamiento con el par actual."""
+        if not hasattr(self, "v_factor_material"):
+            return
+        row = self._model.compat(self.v_eje_od.get(), self.v_eje_thk.get())
+        if row is None or not row.mecanizado_ok:
+            return
+        t = metrica_definicion(self._datos_eje(), self.catalogs, par_nm)
+        self.v_metrica_tornillos.set(t["texto"] if t is not None else row.tornillos)
+        self.v_tornillos_estado.set(texto_tornillos(t))
 
     def _parse_tube_item(self, item):
         """
@@ -739,10 +811,10 @@ class SinfinWindow(tk.Toplevel):
         """
         Camisa tubo (002A):
         ID_min = Ø_espira + 8 mm  (holgura 4 mm por lado)
-        Elegimos el tubo cuyo ID sea >= ID_min con el menor exceso.
-        Catálogo usado: catalogs["eje_od"] y catalogs["espesores_by_od"]
+        Elegimos el tubo cuyo ID sea >= ID_min con el menor exceso (si ninguno, el de mayor ID).
+        Catálogo usado: tubo_index del modelo tipado (ordenado por ID -> un bisect).
         """
-        de = _to_float_optional(self.v_diam_espira.get())
+        de = self._model.valor("diam_espira", self.v_diam_espira.get())
         if de is None:
             self.v_002A_tubo.set("")  # por compatibilidad si lo sigues usando
             if hasattr(self, "v_002A_camisa_od"):
@@ -751,46 +823,10 @@ class SinfinWindow(tk.Toplevel):
                 self.v_002A_camisa_thk.set("")
             return
 
-        id_min = float(de) + 8.0
-
-        eje_od = self.catalogs.get("eje_od", [])
-        espes_by = self.catalogs.get("espesores_by_od", {})
-
-        best = None  # (exceso, id, od, thk)
-        fallback = None  # el de mayor ID por si ninguno cumple
-
-        for od_s in eje_od:
-            try:
-                od = float(str(od_s).replace(",", "."))
-            except Exception:
-                continue
-
-            espesores = espes_by.get(str(od_s), espes_by.get(str(int(od)) if od.is_integer() else str(od), []))
-            for thk_s in espesores:
-                try:
-                    thk = float(str(thk_s).replace(",", "."))
-                except Exception:
-                    continue
-
-                tube_id = od - 2.0 * thk
-
-                # guardar fallback como el mayor ID
-                if fallback is None or tube_id > fallback[0]:
-                    fallback = (tube_id, od, thk)
-
-                if tube_id >= id_min:
-                    exceso = tube_id - id_min
-                    cand = (exceso, tube_id, od, thk)
-                    if best is None or cand[0] < best[0]:
-                        best = cand
-
-        if best is None and fallback is None:
+        tubo = camisa_para_espira(self._model, de)
+        if tubo is None:
             return  # no hay catálogo
-
-        if best is None:
-            tube_id, od, thk = fallback
-        else:
-            _, tube_id, od, thk = best
+        od, tube_id, thk = tubo.od, tubo.id, tubo.thk
 
         # Guarda en vars NUEVAS (si existen)
         if hasattr(self, "v_002A_camisa_od"):
@@ -801,28 +837,20 @@ class SinfinWindow(tk.Toplevel):
         # Si sigues usando v_002A_tubo (formato "OD / ID")
         self.v_002A_tubo.set(f"{od:.1f} / {tube_id:.1f}")
 
-    def _auto_ref_ventana_inspeccion_002A(self):
+    def _auto_plano_testeros(self):
         """
-        Si lleva ventana, propone una referencia en función de Ø camisa (OD).
-        Placeholder por rangos.
+        Código de plano de testeros del tubo eje y del tubo camisa.
+        Lookup O(1) en el índice (OD, espesor) del modelo (Lista_eje_tubo.csv).
         """
-        lleva = (self.v_002A_vi_lleva.get() or "").strip()
-        od = _to_float_optional(self.v_002A_camisa_od.get()) if hasattr(self, "v_002A_camisa_od") else None
-
-        if lleva != "Sí" or od is None:
-            self.v_002A_vi_ref.set("")
-            return
-
-        if od <= 150:
-            ref = "VI-150"
-        elif od <= 250:
-            ref = "VI-250"
-        elif od <= 400:
-            ref = "VI-400"
-        else:
-            ref = "VI-500"
-
-        self.v_002A_vi_ref.set(ref)
+        planos = self._model.planos
+        eje = self._model.tubo(self.v_eje_od.get(), self.v_eje_thk.get())
+        self.v_plano_testeros_eje.set(planos.codigo(eje.od, eje.thk) if eje is not None else "")
+        self.v_002A_plano_testeros.set(
+            planos.codigo(
+                _to_float_optional(self.v_002A_camisa_od.get()),
+                _to_float_optional(self.v_002A_camisa_thk.get()),
+            )
+        )
 
     def _cantidad_combobox(self, parent, textvariable):
         cb = ttk.Combobox(
@@ -880,6 +908,7 @@ class SinfinWindow(tk.Toplevel):
             width=18,
             style="Normal.TCombobox",
         )
+        self._catalog_combo("materials", cb_mat)
         row = 0
         row = self._add_row(form, row, "Material", cb_mat, expand=False)
 
@@ -927,6 +956,7 @@ class SinfinWindow(tk.Toplevel):
             width=18,
             style="Normal.TCombobox",
         )
+        self._catalog_combo("distancia_testeros", cb_len)
         self.cb_long_test = cb_len
         row = self._add_row(
             form, row, "Longitud entre testeros (mm)", cb_len, expand=False)
@@ -1016,6 +1046,34 @@ class SinfinWindow(tk.Toplevel):
         )
         row = self._add_row(form, row, "Cantidad bocas de entrada", cb_bocas, expand=False)
 
+        # Capacidad (ISO 7119 / CEMA): rpm + llenado + densidad -> m³/h y t/h en vivo
+        ent_rpm = ttk.Entry(form, textvariable=self.v_rpm, width=18)
+        row = self._add_row(form, row, "Velocidad (rpm)", ent_rpm, expand=False)
+        cb_llen = ttk.Combobox(
+            form,
+            textvariable=self.v_coef_llenado,
+            values=[f"{c:g}" for _, c in LLENADO_CLASES],
+            state="normal",
+            width=18,
+        )
+        row = self._add_row(
+            form, row, "Coeficiente de llenado", cb_llen, expand=False,
+            hint=" · ".join(f"{c:g} {n}" for n, c in LLENADO_CLASES),
+        )
+        ent_dens = ttk.Entry(form, textvariable=self.v_densidad_aparente, width=18)
+        row = self._add_row(form, row, "Densidad aparente (t/m³)", ent_dens, expand=False)
+        ent_cap = tk.Entry(
+            form,
+            textvariable=self.v_capacidad,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=26,
+        )
+        ent_cap.config(state="readonly")
+        row = self._add_row(form, row, "Capacidad de transporte [calc]", ent_cap, expand=False)
+
 
         # Observaciones (Text) - cuadro editable
         txt = tk.Text(form, height=4)
@@ -1027,6 +1085,7 @@ class SinfinWindow(tk.Toplevel):
 
         # aplicar estilos iniciales
         self._recalc_longitudes()
+        self._recalc_capacidad()
         self._apply_pending_style()
 
     def _build_tornillo(self):
@@ -1041,13 +1100,13 @@ class SinfinWindow(tk.Toplevel):
             )
 
         # 1) Eje OD (con botón oferta)
-        cb_od = ttk.Combobox(
+        cb_od = AutocompleteCombobox(
             form,
             textvariable=self.v_eje_od,
             values=self.catalogs.get("eje_od", []),
-            state="readonly",
         )
-        cb_od.bind("<<ComboboxSelected>>", lambda _e: self._on_eje_od_changed())
+        self._catalog_combo("eje_od", cb_od)
+        cb_od.bind("<<ComboboxSelected>>", lambda _e: self._on_eje_od_changed(), add="+")
         row = self._add_row(
             form,
             row,
@@ -1057,11 +1116,55 @@ class SinfinWindow(tk.Toplevel):
         )
 
         # 2) Espesor eje (filtrado por OD) (SIN botón oferta)
-        cb_thk = ttk.Combobox(form, textvariable=self.v_eje_thk, values=[], state="readonly")
-        cb_thk.bind("<<ComboboxSelected>>", lambda _e: self._on_eje_thk_changed())
+        cb_thk = AutocompleteCombobox(form, textvariable=self.v_eje_thk, values=[])
+        cb_thk.bind("<<ComboboxSelected>>", lambda _e: self._on_eje_thk_changed(), add="+")
         row = self._add_row(form, row, "Espesor tubo eje (mm)", cb_thk)
         self.cb_eje_thk = cb_thk
 
+        # Plano de testeros del tubo eje (automático)
+        ent_plano = tk.Entry(
+            form,
+            textvariable=self.v_plano_testeros_eje,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=22,
+        )
+        ent_plano.config(state="readonly")
+        row = self._add_row(form, row, "Plano testeros (automático)", ent_plano, expand=False)
+
+        # Flecha / tensión del tubo eje con la espira y el material (engine.estructura)
+        ent_comp = tk.Entry(
+            form,
+            textvariable=self.v_comprobacion_eje,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=48,
+        )
+        ent_comp.config(state="readonly")
+        row = self._add_row(form, row, "Comprobación eje [calc]", ent_comp, expand=False)
+        ent_prop = tk.Entry(
+            form,
+            textvariable=self.v_eje_propuesto,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=22,
+        )
+        ent_prop.config(state="readonly")
+        row = self._add_row(
+            form,
+            row,
+            "Tubo eje propuesto (más ligero que cumple)",
+            ent_prop,
+            action_widget=ttk.Button(form, text="Aplicar", command=self._aplicar_eje_propuesto),
+            expand=False,
+        )
+
         def mangon_cols(left_var: tk.StringVar, right_var: tk.StringVar) -> tk.Frame:
             f = ttk.Frame(form)
             ent_left = tk.Entry(
@@ -1151,6 +1254,22 @@ class SinfinWindow(tk.Toplevel):
         chk.grid(row=row, column=1, sticky="w", pady=6)
         row += 1
 
+        # Primera velocidad crítica con la disposición actual y mangones intermedios mínimos
+        ent_crit = tk.Entry(
+            form,
+            textvariable=self.v_velocidad_critica,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=48,
+        )
+        ent_crit.config(state="readonly")
+        row = self._add_row(
+            form, row, "Velocidad crítica [calc]", ent_crit, expand=False,
+            hint="rpm de trabajo / 1ª crítica; máximo 70 %",
+        )
+
         if self.v_mangones_intermedios.get():
             ent_n = ttk.Entry(form, textvariable=self.v_num_mangones_intermedios, width=18)
             row = self._add_row(
@@ -1193,24 +1312,39 @@ class SinfinWindow(tk.Toplevel):
             width=18,
         )
         ent_torn.config(state="readonly")
-        row = self._add_row(form, row, "Tornillería (automática)", ent_torn, expand=False)
+        row = self._add_row(
+            form, row, "Tornillería (automática)", ent_torn, expand=False,
+            hint="2 tornillos 8.8 por unión: cortadura y aplastamiento con el par de arranque",
+        )
+
+        ent_torn_estado = tk.Entry(
+            form,
+            textvariable=self.v_tornillos_estado,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=48,
+        )
+        ent_torn_estado.config(state="readonly")
+        row = self._add_row(form, row, "Tornillería a par [calc]", ent_torn_estado, expand=False)
 
         # Ø exterior espira (sin botón)
-        cb_de = ttk.Combobox(
+        cb_de = AutocompleteCombobox(
             form,
             textvariable=self.v_diam_espira,
             values=self.catalogs.get("diam_espira", []),
-            state="readonly",
         )
+        self._catalog_combo("diam_espira", cb_de)
         row = self._add_row(form, row, "DIAMETRO EXTERIOR ESPIRA (mm)", cb_de)
 
         # Espesor espira (CON botón único central)
-        cb_es = ttk.Combobox(
+        cb_es = AutocompleteCombobox(
             form,
             textvariable=self.v_espesor_espira,
             values=self.catalogs.get("espesores_chapa", []),
-            state="readonly",
         )
+        self._catalog_combo("espesores_chapa", cb_es)
         row = self._add_row(
             form,
             row,
@@ -1219,16 +1353,32 @@ class SinfinWindow(tk.Toplevel):
             action_widget=offer_btn("Espiras: espesor"),
         )
 
+        # Corona de corte de la espira (engine.espira, sustituye medir Espira_01_desarrollo.ipt)
+        ent_des = tk.Entry(
+            form,
+            textvariable=self.v_desarrollo_espira,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=52,
+        )
+        ent_des.config(state="readonly")
+        row = self._add_row(
+            form, row, "Desarrollo espira [calc]", ent_des, expand=False,
+            hint="Corona de corte del paso 1 (fibra neutra)",
+        )
+
         # Pasos (sin botones) con longitud de tramo
         def _paso_with_longitud(paso_var: tk.StringVar, long_var: tk.StringVar) -> ttk.Frame:
             frame = ttk.Frame(form)
-            cb = ttk.Combobox(
+            cb = AutocompleteCombobox(
                 frame,
                 textvariable=paso_var,
                 values=self.catalogs.get("pasos", []),
-                state="readonly",
                 width=8,
             )
+            self._catalog_combo("pasos", cb)
             lbl = ttk.Label(frame, text="Longitud")
             ent = ttk.Entry(frame, textvariable=long_var, width=8)
             cb.grid(row=0, column=0, sticky="w")
@@ -1347,12 +1497,12 @@ class SinfinWindow(tk.Toplevel):
             return ttk.Button(form, text="Pedir oferta", command=lambda: self._stub_offer(text))
 
         # Distancia entre testeros (una sola vez)
-        cb_dist = ttk.Combobox(
+        cb_dist = AutocompleteCombobox(
             form,
             textvariable=self.v_long_test,  # MISMA variable que en GENERAL
             values=self.catalogs.get("distancia_testeros", []),
-            state="readonly",
         )
+        self._catalog_combo("distancia_testeros", cb_dist)
         row = self._add_row(
             form,
             row,
@@ -1407,12 +1557,12 @@ class SinfinWindow(tk.Toplevel):
             )
 
             # --- 002A.002 TESTEROS ---
-            cb_testeros = ttk.Combobox(
+            cb_testeros = AutocompleteCombobox(
                 form,
                 textvariable=self.v_002A_testeros,
                 values=self.catalogs.get("espesores_chapa", []),
-                state="readonly",
             )
+            self._catalog_combo("espesores_chapa", cb_testeros)
             row = self._add_section_title(form, row, "002A.002  Testeros: Conformación")
             row = self._add_row(
                 form, row,
@@ -1420,6 +1570,13 @@ class SinfinWindow(tk.Toplevel):
                 cb_testeros,
                 action_widget=offer_btn("Camisa 002A: Testeros"),
             )
+            ent_plano = tk.Entry(
+                form, textvariable=self.v_002A_plano_testeros,
+                bg="#ffffff", fg="#000000", insertbackground="#000000",
+                relief="flat", width=22
+            )
+            ent_plano.config(state="readonly")
+            row = self._add_row(form, row, "002A.002  Plano testeros [auto]", ent_plano, expand=False)
 
             # --- 002A.003 VENTANA INSPECCIÓN ---
             row = self._add_section_title(form, row, "002A.003  Ventana de inspección")
@@ -1485,12 +1642,12 @@ class SinfinWindow(tk.Toplevel):
 
             # --- 002B.001 CHAPA ARTESA ---
             row = self._add_section_title(form, row, "002B.001  Chapa artesa")
-            cb_chapa = ttk.Combobox(
+            cb_chapa = AutocompleteCombobox(
                 form,
                 textvariable=self.v_002B_chapa_artesa,
                 values=self.catalogs.get("espesores_chapa", []),
-                state="readonly",
             )
+            self._catalog_combo("espesores_chapa", cb_chapa)
             row = self._add_row(
                 form, row,
                 "002B.001  Chapa artesa (espesor)",
@@ -1500,12 +1657,12 @@ class SinfinWindow(tk.Toplevel):
 
             # --- 002B.002 TESTEROS ---
             row = self._add_section_title(form, row, "002B.002  Testeros: Conformación")
-            cb_testeros = ttk.Combobox(
+            cb_testeros = AutocompleteCombobox(
                 form,
                 textvariable=self.v_002B_testeros,
                 values=self.catalogs.get("espesores_chapa", []),
-                state="readonly",
             )
+            self._catalog_combo("espesores_chapa", cb_testeros)
             row = self._add_row(
                 form, row,
                 "002B.002  Testeros (espesor)",
@@ -1550,14 +1707,27 @@ class SinfinWindow(tk.Toplevel):
             values=self.catalogs.get("tipo_disposicion", []),
             state="readonly",
         )
+        self._catalog_combo("tipo_disposicion", cb_tipo)
         row = self._add_row(
             form, row, "Disposición del motor (tipo)", cb_tipo)
 
-        self.cb_rod_conduccion = ttk.Combobox(
-            form, textvariable=self.v_rod_conduccion, values=[], state="readonly"
+        self.cb_rod_conduccion = AutocompleteCombobox(
+            form, textvariable=self.v_rod_conduccion, values=[]
         )
         row = self._add_row(
-            form, row, "Rodamiento (referencia)", self.cb_rod_conduccion)
+            form, row, "Rodamiento (referencia)", self.cb_rod_conduccion,
+            hint="Ordenados por vida L10h y coste (apoyo fijo: carga radial + axial)")
+        ent_vida = tk.Entry(
+            form,
+            textvariable=self.v_l10h_conduccion,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=36,
+        )
+        ent_vida.config(state="readonly")
+        row = self._add_row(form, row, "Vida rodamiento [calc]", ent_vida, expand=False)
 
         cb_pos = ttk.Combobox(
             form,
@@ -1565,25 +1735,107 @@ class SinfinWindow(tk.Toplevel):
             values=self.catalogs.get("posicion_motor", []),
             state="readonly",
         )
+        self._catalog_combo("posicion_motor", cb_pos)
         row = self._add_row(
             form, row, "Posición motorreductor-eje", cb_pos)
 
+        # Potencia (ISO 7119): λ material + capacidad de GENERAL -> kW, N·m y motorreductor
+        cb_lambda = ttk.Combobox(
+            form,
+            textvariable=self.v_factor_material,
+            values=[f"{c:g}" for _, c in LAMBDA_CLASES],
+            state="normal",
+            width=18,
+        )
+        row = self._add_row(
+            form, row, "Factor de material λ", cb_lambda, expand=False,
+            hint=" · ".join(f"{c:g} {n}" for n, c in LAMBDA_CLASES),
+        )
+        ent_pot = tk.Entry(
+            form,
+            textvariable=self.v_potencia,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=26,
+        )
+        ent_pot.config(state="readonly")
+        row = self._add_row(form, row, "Potencia / par [calc]", ent_pot, expand=False)
+
+        self.cb_motorreductor = ttk.Combobox(
+            form, textvariable=self.v_motorreductor, values=[], state="normal"
+        )
+        row = self._add_row(
+            form, row, "Motorreductor (propuesto)", self.cb_motorreductor,
+            hint="Ordenados por ajuste: potencia, par con factor de servicio y rpm",
+        )
+
         self._refresh_rodamientos()
+        self._recalc_potencia()
 
     def _build_conducido(self):
         form = self._make_form("PARTE 004 – CONDUCIDO")
         row = 0
 
-        self.cb_rod_conducido = ttk.Combobox(
-            form, textvariable=self.v_rod_conducido, values=[], state="readonly"
+        self.cb_rod_conducido = AutocompleteCombobox(
+            form, textvariable=self.v_rod_conducido, values=[]
         )
         row = self._add_row(
-            form, row, "Rodamiento (referencia)", self.cb_rod_conducido)
+            form, row, "Rodamiento (referencia)", self.cb_rod_conducido,
+            hint="Ordenados por vida L10h y coste (apoyo libre: solo carga radial)")
+        ent_vida = tk.Entry(
+            form,
+            textvariable=self.v_l10h_conducido,
+            bg="#ffffff",
+            fg="#000000",
+            insertbackground="#000000",
+            relief="flat",
+            width=36,
+        )
+        ent_vida.config(state="readonly")
+        row = self._add_row(form, row, "Vida rodamiento [calc]", ent_vida, expand=False)
 
         self._refresh_rodamientos()
 
         # ------------------ Events / Refresh ------------------
 
+    def destroy(self):
+        if getattr(self, "_catalog_poll_job", None) is not None:
+            self.after_cancel(self._catalog_poll_job)
+            self._catalog_poll_job = None
+        super().destroy()
+
+    def _poll_catalogs(self):
+        """
+        Recarga en caliente: el watcher recarga en su hilo; aquí (hilo de Tk) solo se
+        compara la referencia y se actualizan los values de los combos afectados.
+        """
+        nuevo = self._catalog_watcher.catalogs
+        if nuevo is not self.catalogs:
+            cambios = changed_sections(self.catalogs, nuevo)
+            self.catalogs = nuevo
+            self._model = catalog_model(nuevo)
+            if cambios:
+                self._apply_catalog_changes(cambios)
+        self._catalog_poll_job = self.after(CATALOG_POLL_MS, self._poll_catalogs)
+
+    def _apply_catalog_changes(self, cambios: set):
+        for section in cambios:
+            for cb in self._catalog_combos.get(section, []):
+                if cb.winfo_exists():
+                    cb.configure(values=list(self.catalogs.get(section, [])))
+
+        # combos derivados (filtrados por el tubo eje)
+        if cambios & {"eje_od", "espesores_by_od"} and hasattr(self, "cb_eje_thk") and self.cb_eje_thk.winfo_exists():
+            self.cb_eje_thk.configure(values=filter_espesores_por_od(self.catalogs, self.v_eje_od.get().strip()))
+        if cambios & {"eje_od", "espesores_by_od", "rodamientos"}:
+            self._refresh_rodamientos()
+        if cambios & {"eje_od", "espesores_by_od", "diam_espira"}:
+            self._auto_camisa_tubo_002A()
+        if "planos_testeros" in cambios:
+            self._auto_plano_testeros()
+
     def _on_camisa_changed(self):
         if self.v_section.get() == "Parte 002 – Camisa":
             self._render_section()
@@ -1622,15 +1874,18 @@ class SinfinWindow(tk.Toplevel):
 
         vals: List[str] = filter_rodamientos_por_tubo(
             self.catalogs, od, thk)
+        self._rod_candidatos = vals
 
-        if hasattr(self, "cb_rod_conduccion"):
+        if hasattr(self, "cb_rod_conduccion") and self.cb_rod_conduccion.winfo_exists():
             self.cb_rod_conduccion.configure(values=vals)
         if self.v_rod_conduccion.get() and self.v_rod_conduccion.get() not in vals:
             self.v_rod_conduccion.set("")
-        if hasattr(self, "cb_rod_conducido"):
+        if hasattr(self, "cb_rod_conducido") and self.cb_rod_conducido.winfo_exists():
             self.cb_rod_conducido.configure(values=vals)
         if self.v_rod_conducido.get() and self.v_rod_conducido.get() not in vals:
             self.v_rod_conducido.set("")
+        # orden por defecto: vida L10h y coste con las cargas actuales
+        self._recalc_rodamientos()
 
     def _apply_pending_style(self):
         """
@@ -1643,17 +1898,11 @@ class SinfinWindow(tk.Toplevel):
                 style="Pending.TCombobox" if self.v_pendiente_medir.get() else "Normal.TCombobox")
 
     def _recalc_longitudes(self):
-        lt = _to_float_optional(self.v_long_test.get())
-        lc = _to_float_optional(self.v_mangon_ext_conduccion.get())
-        ld = _to_float_optional(self.v_mangon_ext_conducido.get())
-
-        missing = []
-        if lt is None:
-            missing.append("Longitud entre testeros")
-        if lc is None:
-            missing.append("Longitud exterior mangón conducción")
-        if ld is None:
-            missing.append("Longitud exterior mangón conducido")
+        total, missing = longitud_total_exterior(
+            _to_float_optional(self.v_long_test.get()),
+            _to_float_optional(self.v_mangon_ext_conduccion.get()),
+            _to_float_optional(self.v_mangon_ext_conducido.get()),
+        )
 
         if missing:
             self.v_long_total_ext.set("")
@@ -1662,13 +1911,118 @@ class SinfinWindow(tk.Toplevel):
                 self.ent_long_total_ext.config(fg="#ff3b30", state="readonly")
             return
 
-        total = float(lt) + float(lc) + float(ld)
         self.v_long_total_ext.set(f"{total:.0f}")
         self.v_long_total_hint.set("")
 
         if self.ent_long_total_ext and self.ent_long_total_ext.winfo_exists():
             self.ent_long_total_ext.config(fg="#000000", state="readonly")
 
+    def _datos_transporte(self) -> dict:
+        """Entradas del formulario para engine.capacidad / engine.potencia."""
+        return {
+            "diam_espira": self.v_diam_espira.get(),
+            "eje_od": self.v_eje_od.get(),
+            "paso1": self.v_paso1.get(),
+            "paso2": self.v_paso2.get(),
+            "paso3": self.v_paso3.get(),
+            "rpm": self.v_rpm.get(),
+            "coef_llenado": self.v_coef_llenado.get(),
+            "densidad_aparente": self.v_densidad_aparente.get(),
+            "angulo_inclinacion_deg": self.v_angulo_inclinacion.get(),
+            "sentido_material": self.v_sentido_material.get(),
+        }
+
+    def _recalc_capacidad(self):
+        """Caudal m³/h y t/h con lo que haya en el formulario (engine.capacidad)."""
+        self.v_capacidad.set(texto_capacidad(capacidad_definicion(self._datos_transporte())))
+        self._recalc_potencia()
+
+    def _recalc_potencia(self):
+        """kW / N·m y motorreductores propuestos (engine.potencia); no pisa la elección."""
+        if not hasattr(self, "v_potencia"):
+            return
+        d = self._datos_transporte()
+        d.update({
+            "longitud_entre_testeros": self.v_long_test.get(),
+            "factor_material": self.v_factor_material.get(),
+            "tipo_disposicion": self.v_tipo_dispos.get(),
+        })
+        r = potencia_definicion(d)
+        self.v_potencia.set(texto_potencia(r))
+
+        cb = getattr(self, "cb_motorreductor", None)
+        if cb is not None and cb.winfo_exists():
+            cb["values"] = [m["ref"] for m in r["motorreductores"]]
+        self._recalc_eje(r["par_nm"])
+
+    def _recalc_eje(self, par_nm=None):
+        """Flecha / tensión del tubo elegido y tubo más ligero que cumple (cacheado por vano y carga)."""
+        if not hasattr(self, "v_comprobacion_eje"):
+            return
+        d = self._datos_eje()
+        r = comprobar_eje_definicion(d, self._model, par_nm=par_nm)
+        self._eje_propuesto = r["propuesto"]
+        self.v_comprobacion_eje.set(texto_comprobacion(r))
+        self.v_eje_propuesto.set(texto_propuesto(r))
+        self.v_velocidad_critica.set(texto_critica(critica_definicion(d, self._model)))
+        self._recalc_rodamientos(par_nm)
+        self._recalc_tornillos(par_nm)
+
+    def _datos_eje(self) -> dict:
+        """Entradas del formulario para engine.estructura / vibracion / rodamientos."""
+        d = self._datos_transporte()
+        d.update({
+            "eje_thk": self.v_eje_thk.get(),
+            "longitud_entre_testeros": self.v_long_test.get(),
+            "espesor_espira": self.v_espesor_espira.get(),
+            "mangones_intermedios": bool(self.v_mangones_intermedios.get()),
+            "num_mangones_intermedios": self.v_num_mangones_intermedios.get(),
+            "factor_material": self.v_factor_material.get(),
+            "tipo_disposicion": self.v_tipo_dispos.get(),
+        })
+        return d
+
+    def _recalc_rodamientos(self, par_nm=None):
+        """Ordena los rodamientos compatibles por vida L10h y coste (conducción y conducido)."""
+        if not hasattr(self, "v_l10h_conduccion"):
+            return
+        r = rodamientos_definicion(self._datos_eje(), self.catalogs, self._rod_candidatos, par_nm)
+        self._rod_vidas = {k: {f["name"]: f for f in r[k]} for k in ("conduccion", "conducido")}
+        for k, cb_attr in (("conduccion", "cb_rod_conduccion"), ("conducido", "cb_rod_conducido")):
+            vals = [f["name"] for f in r[k]] or list(self._rod_candidatos)
+            cb = getattr(self, cb_attr, None)
+            if cb is not None and cb.winfo_exists():
+                cb.configure(values=vals)
+        self._mostrar_vida_rodamientos()
+
+    def _mostrar_vida_rodamientos(self):
+        if not hasattr(self, "v_l10h_conduccion"):
+            return
+        self.v_l10h_conduccion.set(texto_vida(self._rod_vidas["conduccion"].get(self.v_rod_conduccion.get())))
+        self.v_l10h_conducido.set(texto_vida(self._rod_vidas["conducido"].get(self.v_rod_conducido.get())))
+
+    def _recalc_desarrollo(self):
+        """Ø int / Ø ext de la corona, hueco y espiras por disco del primer paso."""
+        r = desarrollos_definicion({
+            "diam_espira": self.v_diam_espira.get(),
+            "eje_od": self.v_eje_od.get(),
+            "espesor_espira": self.v_espesor_espira.get(),
+            "paso1": self.v_paso1.get(),
+            "paso2": self.v_paso2.get(),
+            "paso3": self.v_paso3.get(),
+        })
+        self.v_desarrollo_espira.set(texto_desarrollo(r[0][1]) if r else "")
+
+    def _aplicar_eje_propuesto(self):
+        t = self._eje_propuesto
+        if t is None:
+            return
+        self.v_eje_od.set(t.od_text)
+        self._on_eje_od_changed()
+        self.v_eje_thk.set(t.thk_text)
+        self._refresh_rodamientos()
+        self._auto_from_tubo()
+
     def _build_progress_tab(self):
         top = ttk.Frame(self.tab_prog)
         top.pack(fill="x", padx=16, pady=12)
@@ -1756,36 +2110,17 @@ class SinfinWindow(tk.Toplevel):
 
         od_camisa = _to_float_optional(self.v_002A_camisa_od.get())
         dm = _to_float_optional(self.v_mangon_conduccion.get())  # cambia si tienes var específica
-        if od_camisa is None or dm is None:
-            self.v_002A_cjto_lleva.set(True)
-            self.v_002A_cjto_ref.set("CJTO-INTERMEDIO (pendiente datos)")
-            return
-
         self.v_002A_cjto_lleva.set(True)
-        self.v_002A_cjto_ref.set(f"CJTO-OD{od_camisa:.0f}-DM{dm:.0f}")
+        self.v_002A_cjto_ref.set(ref_cjto_intermedio(od_camisa, dm))
 
     def _auto_ref_ventana_inspeccion_002A(self):
         """
-        Si lleva ventana, propone una referencia en función de Ø camisa.
-        Aquí pongo una lógica placeholder (tablas por rangos).
+        Si lleva ventana, propone una referencia en función de Ø camisa
+        (tabla por rangos en engine.reglas).
         """
         lleva = (self.v_002A_vi_lleva.get() or "").strip()
-        od = _to_float_optional(self.v_002A_camisa_od.get())
-        if lleva != "Sí" or od is None:
-            self.v_002A_vi_ref.set("")
-            return
-
-        # ejemplo por rangos (AJUSTABLE)
-        if od <= 150:
-            ref = "VI-150"
-        elif od <= 250:
-            ref = "VI-250"
-        elif od <= 400:
-            ref = "VI-400"
-        else:
-            ref = "VI-500"
-
-        self.v_002A_vi_ref.set(ref)
+        od = _to_float_optional(self.v_002A_camisa_od.get()) if hasattr(self, "v_002A_camisa_od") else None
+        self.v_002A_vi_ref.set(ref_ventana_inspeccion(od) if lleva == "Sí" else "")
 
 
     # ------------------ Load / Save ------------------
@@ -1836,12 +2171,17 @@ class SinfinWindow(tk.Toplevel):
         self.v_boca_entrada_general.set(str(d.get("boca_entrada_general", d.get("boca_entrada", "ABAJO"))).upper())
         self.v_cant_bocas_entrada.set(str(d.get("cantidad_bocas_entrada", "1")))
         self._sync_boca_entrada_from_sentido_material()
+        self.v_rpm.set(str(d.get("rpm", "")))
+        self.v_coef_llenado.set(str(d.get("coef_llenado", f"{LLENADO_DEFECTO:g}")))
+        self.v_densidad_aparente.set(str(d.get("densidad_aparente", "")))
 
         self._pending_obs = d.get("observaciones", "")
 
         # Disposición motor (Parte 003)
         self.v_tipo_dispos.set(
             d.get("tipo_disposicion", self.v_tipo_dispos.get()))
+        self.v_factor_material.set(str(d.get("factor_material", f"{LAMBDA_DEFECTO:g}")))
+        self.v_motorreductor.set(str(d.get("motorreductor", "")))
 
         # TORNILLO
         self.v_eje_od.set(d.get("eje_od", self.v_eje_od.get()))
@@ -1951,9 +2291,14 @@ class SinfinWindow(tk.Toplevel):
             "sentido_material": self.v_sentido_material.get().strip(),
             "boca_entrada_general": self.v_boca_entrada_general.get().strip(),
             "cantidad_bocas_entrada": self.v_cant_bocas_entrada.get().strip(),
+            "rpm": self.v_rpm.get().strip(),
+            "coef_llenado": self.v_coef_llenado.get().strip(),
+            "densidad_aparente": self.v_densidad_aparente.get().strip(),
 
             # Disposición motor (Parte 003)
             "tipo_disposicion": self.v_tipo_dispos.get().strip(),
+            "factor_material": self.v_factor_material.get().strip(),
+            "motorreductor": self.v_motorreductor.get().strip(),
 
             # TORNILLO
             "eje_od": self.v_eje_od.get().strip(),
@@ -0,0 +1,104 @@
+# app/widgets.py
+"""
+Widgets reutilizables de la interfaz.
+
+AutocompleteCombobox: combo de catálogo en el que se puede escribir. La lista
+desplegable se filtra con utils.autocomplete.PrefixIndex en cada pulsación y, al
+salir del campo (o con Enter), el texto tiene que acabar siendo una entrada del
+catálogo, igual que con state="readonly":
+  - si coincide con una entrada, se acepta
+  - si la búsqueda deja una única candidata, se completa con ella
+  - si no, se vuelve al último valor válido
+"""
+from __future__ import annotations
+
+from tkinter import ttk
+from typing import Iterable, List
+
+from utils.autocomplete import PrefixIndex
+
+# Teclas que no cambian el texto: no se vuelve a filtrar
+_NAV_KEYS = {
+    "Up", "Down", "Left", "Right", "Return", "KP_Enter", "Tab", "Escape",
+    "Home", "End", "Prior", "Next",
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+}
+
+
+class AutocompleteCombobox(ttk.Combobox):
+    def __init__(self, master=None, values: Iterable[str] = (), fuzzy: bool = True, limit: int = 50, **kw):
+        kw["state"] = "normal"
+        self._index = PrefixIndex(values)
+        self._fuzzy = fuzzy
+        self._limit = limit
+        self._last_valid = ""
+        super().__init__(master, values=list(self._index.values), **kw)
+
+        self.bind("<KeyRelease>", self._on_key, add="+")
+        self.bind("<FocusIn>", self._on_focus_in, add="+")
+        self.bind("<FocusOut>", lambda _e: self._commit(), add="+")
+        self.bind("<Return>", lambda _e: self._commit(), add="+")
+        self.bind("<KP_Enter>", lambda _e: self._commit(), add="+")
+        self.bind("<<ComboboxSelected>>", self._on_selected, add="+")
+
+    def bind(self, sequence=None, func=None, add=None):
+        # los handlers de fuera se encadenan: sin add="+" Tk sustituiría _on_selected/_commit
+        # y _last_valid dejaría de seguir la lista (doble <<ComboboxSelected>> al salir)
+        if func is not None and not add:
+            add = "+"
+        return super().bind(sequence, func, add)
+
+    # ------------------ valores ------------------
+
+    def set_values(self, values: Iterable[str]):
+        """Cambia el catálogo del combo (reconstruye el índice)."""
+        self._index = PrefixIndex(values)
+        super().configure(values=list(self._index.values))
+
+    def configure(self, cnf=None, **kw):
+        # configure(values=...) desde la ventana = cambio de catálogo, no de filtro
+        if isinstance(cnf, dict) and "values" in cnf:
+            cnf = dict(cnf)
+            kw["values"] = cnf.pop("values")
+        if "values" in kw:
+            self.set_values(kw.pop("values"))
+            if not cnf and not kw:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def suggestions(self, text: str) -> List[str]:
+        return self._index.search(text, self._limit, self._fuzzy)
+
+    # ------------------ eventos ------------------
+
+    def _on_focus_in(self, _e=None):
+        text = self.get()
+        if not text or text in self._index.values:
+            self._last_valid = text
+
+    def _on_key(self, e):
+        if e.keysym in _NAV_KEYS:
+            return
+        text = self.get()
+        vals = self.suggestions(text) if text else list(self._index.values)
+        super().configure(values=vals)
+
+    def _on_selected(self, _e=None):
+        self._last_valid = self.get()
+        super().configure(values=list(self._index.values))
+
+    def _commit(self):
+        text = self.get()
+        valores = self._index.values
+        if text and text not in valores:
+            cands = self._index.search(text, 2, self._fuzzy)
+            text = cands[0] if len(cands) == 1 else self._last_valid
+            self.set(text)
+
+        super().configure(values=list(valores))
+        if text != self._last_valid:
+            self._last_valid = text
+            # mismo aviso que al elegir en la lista (los handlers recalculan)
+            self.event_generate("<<ComboboxSelected>>")
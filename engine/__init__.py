@@ -0,0 +1,15 @@
+# engine/__init__.py
+"""
+Motor de cálculo del sinfín, sin interfaz.
+
+    from engine import calcular
+    derivados = calcular(definicion)      # definicion = dict guardado por SinfinWindow
+
+Las reglas de geometría (ID del tubo, mangones, tornillería, camisa, referencias,
+longitudes, parámetros de Inventor) viven aquí y en utils.catalog_model; la UI, los
+exportadores y los procesos por lotes llaman a estas funciones en vez de repetirlas.
+No pongas aquí código con `self` de Tk ni StringVar.
+"""
+from engine.sinfin import calcular, calcular_pedido
+
+__all__ = ["calcular", "calcular_pedido"]
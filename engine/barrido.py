@@ -0,0 +1,296 @@
+# engine/barrido.py
+"""
+Barrido del espacio de diseño: todas las combinaciones Ø espira × paso × tubo eje
+(la camisa sale de la espira con la regla de 002A) evaluadas como arrays de NumPy.
+
+    b = barrido(diam_espira=rango(100, 400, 5), pasos=rango(50, 400, 10))
+    top = b.ranking()[:20]                       # válidas, ordenadas
+    top.filtrar(top["eje_od"] >= 60).filas(10)   # lista de dicts
+    definicion = top.definicion(0)                # dict listo para un sinfín nuevo
+
+Lo que depende solo del tubo (mecanizado, rodamientos, mangón, tornillos) se toma de
+la matriz de compatibilidad del catálogo (una vez por tubo); lo que depende de la
+espira (camisa) es un np.searchsorted por Ø. El resto son operaciones vectoriales:
+10⁶ combinaciones en una fracción de segundo.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from engine.catalogo import modelo_catalogo
+from engine.reglas import (
+    ALTURA_ESPIRA_MIN_MM,
+    ESPESOR_TESTERO_DEFECTO_MM,
+    HOLGURA_MANGONES_INVENTOR_MM,
+    PASO_REL_MAX,
+    PASO_REL_MIN,
+)
+from engine.tornilleria import metrica_definicion
+from utils.catalog_model import CAMISA_HOLGURA_MM, TORNILLO_METRICA, CatalogModel, Tubo, parse_num
+
+Numeros = Union[Sequence[float], np.ndarray]
+
+# Columnas booleanas de comprobación (todas True -> "valido")
+CHECKS = ("mecanizado_ok", "rodamiento_ok", "espira_ok", "paso_ok", "camisa_ok")
+
+
+def rango(inicio: float, fin: float, paso: float) -> np.ndarray:
+    """Valores de inicio a fin (ambos incluidos) cada `paso`."""
+    n = int(np.floor((fin - inicio) / paso + 1e-9)) + 1
+    return inicio + paso * np.arange(max(n, 0), dtype=float)
+
+
+def _texto(v: float) -> str:
+    return f"{float(v):g}"
+
+
+class Barrido:
+    """
+    Tabla de resultados: columnas NumPy del mismo largo (b["paso"], b["valido"], ...).
+    filtrar/ordenar/slicing devuelven otra Barrido sobre los mismos tubos.
+    """
+
+    __slots__ = ("cols", "tubos", "camisas")
+
+    def __init__(self, cols: Dict[str, np.ndarray], tubos: Sequence[Tubo], camisas: Sequence[Tubo]):
+        self.cols = cols
+        self.tubos = tubos        # cols["eje"] indexa aquí
+        self.camisas = camisas    # cols["camisa"] indexa aquí
+
+    def __len__(self) -> int:
+        return len(self.cols["de"])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.cols[key]
+        return Barrido({k: v[key] for k, v in self.cols.items()}, self.tubos, self.camisas)
+
+    @property
+    def columnas(self) -> List[str]:
+        return list(self.cols)
+
+    def filtrar(self, mask: Optional[np.ndarray] = None, **iguales: Any) -> "Barrido":
+        """Filas con mask True y columna == valor para cada iguales (p.ej. valido=True)."""
+        m = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        for col, v in iguales.items():
+            m &= self.cols[col] == v
+        return self[m]
+
+    def validos(self) -> "Barrido":
+        return self[self.cols["valido"]]
+
+    def ordenar(self, *claves: str) -> "Barrido":
+        """Orden estable por columnas; "-col" = descendente. La primera clave manda."""
+        if not claves:
+            return self
+        keys = []
+        for c in reversed(claves):
+            v = self.cols[c.lstrip("-")]
+            keys.append(-v.astype(float) if c.startswith("-") else v)
+        return self[np.lexsort(keys)]
+
+    def ranking(self) -> "Barrido":
+        """Solo las válidas (descarta el resto), por menor camisa, menor eje y paso más largo (menos espiras)."""
+        return self.validos().ordenar("camisa_od", "eje_od", "-paso", "de")
+
+    def fila(self, i: int, base: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fila i como dict. "tornillos" es la métrica por par de engine.tornilleria (con
+        rpm/llenado de `base`), la misma que pondrá definicion(i, base).
+        """
+        out = {k: v[i].item() for k, v in self.cols.items()}
+        t = metrica_definicion(self._campos(out, base))
+        out["tornillos"] = t["texto"] if t is not None else f"{TORNILLO_METRICA}x{out['tornillo_len']}"
+        return out
+
+    def filas(self, limit: Optional[int] = None, base: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+        n = len(self) if limit is None else min(limit, len(self))
+        return [self.fila(i, base) for i in range(n)]
+
+    def _campos(self, r: Mapping[str, Any], base: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        eje = self.tubos[r["eje"]]
+        camisa = self.camisas[r["camisa"]]
+        d = dict(base or {})
+        d.update({
+            "camisa_tipo": "CIRCULAR",
+            "eje_od": eje.od_text,
+            "eje_thk": eje.thk_text,
+            "eje_id_calc": _texto(eje.id),
+            "diam_espira": _texto(r["de"]),
+            "paso1": _texto(r["paso"]),
+            "mangon_conduccion": str(r["mangon"]),
+            "mangon_conducido": str(r["mangon"]),
+            "002A_tubo": f"{camisa.od:.1f} / {camisa.id:.1f}",
+        })
+        return d
+
+    def definicion(self, i: int, base: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Definición de sinfín (mismas claves que guarda SinfinWindow) para la fila i.
+        `base` aporta el resto de campos (material, bocas...).
+        """
+        r = self.fila(i, base)
+        d = self._campos(r, base)
+        d["metrica_tornillos"] = r["tornillos"]
+        return d
+
+
+def _tubos(model: CatalogModel, tubos: Optional[Iterable[Any]]) -> List[Tubo]:
+    if tubos is None:
+        return list(model.tubos)
+    out = []
+    for t in tubos:
+        if isinstance(t, Tubo):
+            out.append(t)
+            continue
+        od, thk = t
+        tubo = model.tubo_num(parse_num(od), parse_num(thk)) or model.tubo(od, thk)
+        if tubo is not None:
+            out.append(tubo)
+    return out
+
+
+def _valores(model: CatalogModel, seccion: str, valores: Optional[Numeros]) -> np.ndarray:
+    if valores is None:
+        return np.array([it.value for it in model.lista(seccion)], dtype=float)
+    return np.asarray(valores, dtype=float).ravel()
+
+
+def barrido(
+    diam_espira: Optional[Numeros] = None,
+    pasos: Optional[Numeros] = None,
+    tubos: Optional[Iterable[Any]] = None,
+    longitud: Optional[float] = None,
+    espesor_testero: float = ESPESOR_TESTERO_DEFECTO_MM,
+    model: Optional[CatalogModel] = None,
+) -> Barrido:
+    """
+    Evalúa todas las combinaciones. Sin argumentos usa las listas del catálogo
+    (diam_espira, pasos y todos los tubos). Con `longitud` (entre testeros) añade
+    num_espiras con la misma regla que el exportador de Inventor.
+    """
+    model = modelo_catalogo(model)
+
+    des = _valores(model, "diam_espira", diam_espira)
+    ps = _valores(model, "pasos", pasos)
+    ejes = _tubos(model, tubos)
+    nd, npas, nt = len(des), len(ps), len(ejes)
+
+    # --- por tubo eje (fila de compatibilidad) ---
+    rows = [model.compat(t.od_text, t.thk_text) for t in ejes]
+    t_od = np.array([t.od for t in ejes], dtype=float)
+    t_thk = np.array([t.thk for t in ejes], dtype=float)
+    t_id = np.array([t.id for t in ejes], dtype=float)
+    t_ok = np.array([r.mecanizado_ok for r in rows], dtype=bool)
+    t_nrod = np.array([len(r.rodamientos) for r in rows], dtype=np.int32)
+    t_mangon = np.array([r.mangon for r in rows], dtype=np.int32)
+    t_torn = np.array([r.tornillo_len for r in rows], dtype=np.int32)
+
+    # --- por espira (camisa 002A: menor ID >= Ø + holgura, si no el mayor) ---
+    camisas = model.tubo_index.ordenados()
+    c_ids = np.array([t.id for t in camisas], dtype=float)
+    pos = np.searchsorted(c_ids, des + CAMISA_HOLGURA_MM, side="left")
+    d_camisa_ok = pos < len(camisas)
+    mayor = model.tubo_index.mayor()
+    d_camisa = np.where(d_camisa_ok, pos, camisas.index(mayor) if mayor is not None else 0).astype(np.int32)
+    c_od = np.array([t.od for t in camisas], dtype=float)
+
+    # --- rejilla (espira, paso, tubo) aplanada ---
+    n = nd * npas * nt
+    i_de = np.repeat(np.arange(nd, dtype=np.int32), npas * nt)
+    i_p = np.tile(np.repeat(np.arange(npas, dtype=np.int32), nt), nd)
+    i_t = np.tile(np.arange(nt, dtype=np.int32), nd * npas)
+
+    de = des[i_de]
+    paso = ps[i_p]
+    eje_od = t_od[i_t]
+    cols: Dict[str, np.ndarray] = {
+        "de": de,
+        "paso": paso,
+        "eje": i_t,
+        "eje_od": eje_od,
+        "eje_thk": t_thk[i_t],
+        "eje_id": t_id[i_t],
+        "mangon": t_mangon[i_t],
+        "tornillo_len": t_torn[i_t],
+        "n_rodamientos": t_nrod[i_t],
+        "camisa": d_camisa[i_de],
+        "camisa_od": c_od[d_camisa][i_de] if len(camisas) else np.zeros(n),
+        "camisa_id": c_ids[d_camisa][i_de] if len(camisas) else np.zeros(n),
+    }
+    cols["altura_espira"] = (de - eje_od) / 2.0
+    cols["paso_rel"] = paso / de
+    cols["holgura_radial"] = (cols["camisa_id"] - de) / 2.0
+
+    cols["mecanizado_ok"] = t_ok[i_t]
+    cols["rodamiento_ok"] = t_nrod[i_t] > 0
+    cols["espira_ok"] = cols["altura_espira"] >= ALTURA_ESPIRA_MIN_MM
+    cols["paso_ok"] = (cols["paso_rel"] >= PASO_REL_MIN) & (cols["paso_rel"] <= PASO_REL_MAX)
+    cols["camisa_ok"] = d_camisa_ok[i_de]
+    valido = np.ones(n, dtype=bool)
+    for c in CHECKS:
+        valido &= cols[c]
+    cols["valido"] = valido
+
+    if longitud is not None:
+        largo = longitud - 2.0 * espesor_testero - HOLGURA_MANGONES_INVENTOR_MM
+        cols["num_espiras"] = np.floor(largo / paso).astype(np.int32)
+
+    return Barrido(cols, ejes, camisas)
+
+
+COLUMNAS_RESUMEN = ("de", "paso", "eje_od", "eje_thk", "camisa_od", "mangon", "tornillos", "n_rodamientos")
+
+
+def main(argv=None) -> int:
+    """
+    python -m engine.barrido [--espira 100:400:5] [--paso 50:400:10] [--longitud 3000] [--top 20]
+                             [--crear PEDIDO_ID]   (da de alta la primera fila como sinfín)
+    """
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m engine.barrido")
+    ap.add_argument("--espira", help="ini:fin:paso (por defecto, lista del catálogo)")
+    ap.add_argument("--paso", help="ini:fin:paso (por defecto, lista del catálogo)")
+    ap.add_argument("--longitud", type=float, help="longitud entre testeros (añade num_espiras)")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--crear", type=int, metavar="PEDIDO_ID")
+    args = ap.parse_args(argv)
+
+    def _rango(txt):
+        return None if not txt else rango(*(float(x) for x in txt.split(":")))
+
+    b = barrido(_rango(args.espira), _rango(args.paso), longitud=args.longitud)
+    top = b.ranking()
+    print(f"{len(b)} combinaciones, {len(top)} válidas")
+    cols = COLUMNAS_RESUMEN + (("num_espiras",) if args.longitud is not None else ())
+    print(";".join(cols))
+    for r in top.filas(args.top):
+        print(";".join(r[c] if isinstance(r[c], str) else f"{r[c]:g}" for c in cols))
+
+    if args.crear is not None and len(top):
+        from utils.db import connect
+
+        con = connect()
+        try:
+            sid = crear_sinfin_desde_fila(con, args.crear, "Barrido 1", top, 0)
+        finally:
+            con.close()
+        print(f"Sinfín creado: {sid}")
+    return 0
+
+
+def crear_sinfin_desde_fila(con, pedido_id: int, nombre: str, b: Barrido, i: int,
+                            base: Optional[Mapping[str, Any]] = None) -> int:
+    """Da de alta un sinfín en el pedido con la definición de la fila i. Devuelve su id."""
+    from utils.db import create_sinfin, set_sinfin_definicion
+
+    sinfin_id = create_sinfin(con, pedido_id, nombre)
+    set_sinfin_definicion(con, sinfin_id, b.definicion(i, base))
+    return sinfin_id
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+# engine/capacidad.py
+"""
+Capacidad de transporte del sinfín (criterio ISO 7119 / CEMA).
+
+    Q_v [m³/h] = 60 · π/4 · (D² − d²) · S · n · φ · C
+    Q_m [t/h]  = Q_v · ρ
+
+  D = Ø espira, d = Ø eje (m), S = paso (m), n = rpm, φ = coeficiente de llenado,
+  C = reducción por inclinación (solo material de SUBIDA), ρ = densidad aparente (t/m³).
+
+Con paso variable (paso1..3) manda el menor: es la zona de alimentación la que
+limita el caudal. Todas las funciones aceptan escalares o arrays de NumPy (se
+evalúa un pedido entero o un barrido en una sola llamada).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_model import parse_num
+
+# Coeficiente de llenado por clase de material (AJUSTABLE)
+LLENADO_CLASES: Tuple[Tuple[str, float], ...] = (
+    ("Ligero no abrasivo (harinas, cereal)", 0.45),
+    ("Ligero poco abrasivo (sal, carbón fino)", 0.30),
+    ("Pesado abrasivo (arena, cemento, ceniza)", 0.15),
+)
+LLENADO_DEFECTO = 0.30
+
+# Reducción de caudal por inclinación: (grados, C), interpolación lineal (orientativa)
+INCLINACION_C: Tuple[Tuple[float, float], ...] = (
+    (0.0, 1.00),
+    (5.0, 0.90),
+    (10.0, 0.80),
+    (15.0, 0.70),
+    (20.0, 0.65),
+    (25.0, 0.60),
+    (30.0, 0.55),
+)
+_ANG = np.array([a for a, _ in INCLINACION_C])
+_C = np.array([c for _, c in INCLINACION_C])
+
+
+def coef_inclinacion(angulo_deg, subida=True) -> np.ndarray:
+    """C por ángulo (grados, |ángulo| y saturado en los extremos). Material de bajada: 1."""
+    c = np.interp(np.abs(np.asarray(angulo_deg, dtype=float)), _ANG, _C)
+    return np.where(np.asarray(subida, dtype=bool), c, 1.0)
+
+
+def capacidad(de_mm, eje_mm, paso_mm, rpm, llenado=LLENADO_DEFECTO, densidad_t_m3=np.nan,
+              angulo_deg=0.0, subida=True) -> Dict[str, np.ndarray]:
+    """
+    Caudal volumétrico (m³/h) y másico (t/h) vectorizado (broadcasting de NumPy).
+    Datos que falten como NaN -> resultado NaN en esa posición.
+    """
+    de = np.asarray(de_mm, dtype=float) / 1000.0
+    d = np.nan_to_num(np.asarray(eje_mm, dtype=float)) / 1000.0
+    s = np.asarray(paso_mm, dtype=float) / 1000.0
+    area = np.pi / 4.0 * (de ** 2 - d ** 2)
+    c = coef_inclinacion(angulo_deg, subida)
+    q_m3h = 60.0 * area * s * np.asarray(rpm, dtype=float) * np.asarray(llenado, dtype=float) * c
+    return {
+        "area_m2": area,
+        "v_axial_m_s": s * np.asarray(rpm, dtype=float) / 60.0,
+        "coef_inclinacion": c,
+        "q_m3h": q_m3h,
+        "q_th": q_m3h * np.asarray(densidad_t_m3, dtype=float),
+    }
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+_CAMPOS = ("de", "eje", "paso", "rpm", "llenado", "densidad", "angulo", "subida")
+
+
+def _num(v: Any, defecto: float = np.nan) -> float:
+    x = parse_num(v)
+    return defecto if x is None else x
+
+
+def datos_definicion(definicion: Mapping[str, Any]) -> Tuple[float, ...]:
+    """Entradas de capacidad de una definición (mismo orden que _CAMPOS)."""
+    g = definicion.get
+    pasos = [p for p in (parse_num(g(k)) for k in ("paso1", "paso2", "paso3")) if p]
+    return (
+        _num(g("diam_espira")),
+        _num(g("eje_od"), 0.0),
+        min(pasos) if pasos else np.nan,
+        _num(g("rpm")),
+        _num(g("coef_llenado"), LLENADO_DEFECTO),
+        _num(g("densidad_aparente")),
+        _num(g("angulo_inclinacion_deg"), 0.0),
+        str(g("sentido_material") or "SUBIDA").strip().upper() != "BAJADA",
+    )
+
+
+def capacidad_definiciones(definiciones: Iterable[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """Capacidad de muchas definiciones en una sola evaluación vectorizada."""
+    filas = [datos_definicion(d) for d in definiciones]
+    if not filas:
+        return {k: np.empty(0) for k in ("area_m2", "v_axial_m_s", "coef_inclinacion", "q_m3h", "q_th")}
+    a = np.array(filas, dtype=float)
+    cols = dict(zip(_CAMPOS, a.T))
+    return capacidad(cols["de"], cols["eje"], cols["paso"], cols["rpm"], cols["llenado"],
+                     cols["densidad"], cols["angulo"], cols["subida"].astype(bool))
+
+
+def _opt(x) -> Optional[float]:
+    x = float(x)
+    return None if np.isnan(x) else x
+
+
+def capacidad_definicion(definicion: Mapping[str, Any]) -> Dict[str, Optional[float]]:
+    """Capacidad de un sinfín (None en lo que no se pueda calcular)."""
+    r = capacidad_definiciones([definicion])
+    return {k: _opt(v[0]) for k, v in r.items()}
+
+
+def capacidad_pedido(con, pedido_id: int) -> Dict[int, Dict[str, Optional[float]]]:
+    """{sinfin_id: capacidad} de todos los sinfines del pedido (una consulta, una evaluación)."""
+    from utils.db import list_sinfines_definiciones
+
+    filas = list_sinfines_definiciones(con, pedido_id)
+    r = capacidad_definiciones(d for _, _, d in filas)
+    return {sid: {k: _opt(v[i]) for k, v in r.items()} for i, (sid, _, _) in enumerate(filas)}
+
+
+def capacidad_barrido(b, rpm, llenado=LLENADO_DEFECTO, densidad_t_m3=np.nan,
+                      angulo_deg=0.0, subida=True):
+    """Añade q_m3h / q_th a un engine.barrido.Barrido (mismas filas) y lo devuelve."""
+    r = capacidad(b["de"], b["eje_od"], b["paso"], rpm, llenado, densidad_t_m3, angulo_deg, subida)
+    b.cols["q_m3h"] = r["q_m3h"]
+    b.cols["q_th"] = r["q_th"]
+    return b
+
+
+def texto_capacidad(r: Mapping[str, Optional[float]]) -> str:
+    """"12.3 m³/h · 9.8 t/h" para la UI ("" si no hay caudal)."""
+    if r.get("q_m3h") is None:
+        return ""
+    s = f"{r['q_m3h']:.1f} m³/h"
+    if r.get("q_th") is not None:
+        s += f" · {r['q_th']:.1f} t/h"
+    return s
@@ -0,0 +1,19 @@
+# engine/catalogo.py
+"""
+Acceso del motor al modelo de catálogos. Las funciones del engine aceptan un
+CatalogModel opcional; sin él usan el de los catálogos compartidos (get_catalogs).
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from utils.catalog_model import CatalogModel
+
+
+def modelo_catalogo(model: Optional[CatalogModel] = None) -> CatalogModel:
+    """El modelo recibido o, si es None, el de los catálogos compartidos."""
+    if model is not None:
+        return model
+    from utils.catalogs import catalog_model, get_catalogs
+
+    return catalog_model(get_catalogs())
@@ -0,0 +1,433 @@
+# engine/corte.py
+"""
+Plan de corte 1D (cutting stock) de las compras de tubo y barra: tubo eje, tubo camisa
+y barra de mangones de varios pedidos a la vez, agrupados por (OD, espesor, material)
+contra los largos comerciales.
+
+Cortes por sinfín:
+  - eje:     longitud Inventor (engine.reglas), partida en vanos si lleva mangones intermedios
+  - camisa:  longitud entre testeros (solo camisa circular; la artesa es chapa)
+  - mangón:  barra del Ø de compra; largo = exterior + testero + holgura Inventor / 2
+             + inserción en el tubo; los intermedios, 2 × inserción
+
+Algoritmo: best-fit decreasing en barras del largo mayor (bisect sobre los sobrantes
+ordenados: O(n log n), miles de cortes en milisegundos) y, con pocos largos distintos,
+también el procedimiento secuencial por patrones (mochila acotada con NumPy); se queda
+el que compra menos metros. Mejora local: la barra menos llena se vacía moviendo o
+intercambiando cortes con las demás (el desperdicio se concentra en una sola barra), y
+cada barra pasa al largo comercial más corto en el que cabe. Cada corte consume su
+largo + KERF_MM (el último no necesita corte).
+Se da la cota inferior ⌈Σ cortes / largo mayor⌉ para juzgar el resultado.
+"""
+from __future__ import annotations
+
+import csv
+import math
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.estructura import num_vanos
+from engine.reglas import ESPESOR_TESTERO_DEFECTO_MM, HOLGURA_MANGONES_INVENTOR_MM
+from utils.catalog_model import CatalogModel, parse_num
+
+STOCK_TUBO_MM = (6000.0, 12000.0)
+STOCK_BARRA_MM = (3000.0, 6000.0)
+KERF_MM = 3.0                   # hoja de sierra
+EPS = 1e-6
+
+# Materiales de compra (AJUSTABLES): tubo estructural y barra de mangones
+MATERIAL_TUBO = "S355J2H"
+MATERIAL_BARRA = "C45"
+INSERCION_MANGON_MM = 150.0     # largo del mangón dentro del tubo eje (AJUSTABLE)
+MEJORA_PASADAS = 50
+PRIMA_LARGOS = 0.5              # valor de un corte = w·(1 + prima·w / barra)
+PATRONES_MAX_LARGOS = 60        # con más largos distintos solo best-fit (la mochila crece)
+
+
+class Corte(NamedTuple):
+    """Un trozo a cortar. thk = 0 para barra maciza."""
+
+    ref: str
+    largo: float
+    od: float
+    thk: float
+    material: str
+    tipo: str
+
+    @property
+    def grupo(self) -> Tuple[float, float, str]:
+        return self.od, self.thk, self.material
+
+
+class Barra:
+    """Barra comercial con sus cortes. Capacidad = largo + kerf (el último corte no lo gasta)."""
+
+    __slots__ = ("largo", "cortes", "usado")
+
+    def __init__(self, largo: float):
+        self.largo = float(largo)
+        self.cortes: List[Corte] = []
+        self.usado = 0.0            # Σ (largo + kerf)
+
+    def libre(self, kerf: float) -> float:
+        return self.largo + kerf - self.usado
+
+    def sobrante(self, kerf: float) -> float:
+        return max(self.libre(kerf) - kerf, 0.0) if self.cortes else self.largo
+
+    def poner(self, c: Corte, kerf: float):
+        self.cortes.append(c)
+        self.usado += c.largo + kerf
+
+    def quitar(self, c: Corte, kerf: float):
+        self.cortes.remove(c)
+        self.usado -= c.largo + kerf
+
+
+class PlanGrupo:
+    """Barras de un grupo (od, thk, material) y los cortes más largos que cualquier barra."""
+
+    __slots__ = ("od", "thk", "material", "barras", "no_caben", "kerf")
+
+    def __init__(self, od: float, thk: float, material: str, barras: List[Barra], no_caben: List[Corte], kerf: float):
+        self.od = od
+        self.thk = thk
+        self.material = material
+        self.barras = barras
+        self.no_caben = no_caben
+        self.kerf = kerf
+
+    @property
+    def nombre(self) -> str:
+        return f"Ø{self.od:g}x{self.thk:g} {self.material}" if self.thk else f"Ø{self.od:g} {self.material}"
+
+    @property
+    def largo_comprado(self) -> float:
+        return sum(b.largo for b in self.barras)
+
+    @property
+    def largo_cortes(self) -> float:
+        return sum(c.largo for b in self.barras for c in b.cortes)
+
+    @property
+    def desperdicio(self) -> Optional[float]:
+        """Fracción del largo comprado que no sale en cortes (kerf incluido)."""
+        total = self.largo_comprado
+        return 1.0 - self.largo_cortes / total if total else None
+
+    def cota_inferior(self, stock: Sequence[float]) -> int:
+        total = sum(c.largo + self.kerf for b in self.barras for c in b.cortes)
+        return int(math.ceil(total / (max(stock) + self.kerf) - EPS)) if total else 0
+
+    def barras_por_largo(self) -> Dict[float, int]:
+        out: Dict[float, int] = {}
+        for b in sorted(self.barras, key=lambda b: -b.largo):
+            out[b.largo] = out.get(b.largo, 0) + 1
+        return out
+
+    def patrones(self) -> List[Tuple[float, Tuple[float, ...], int]]:
+        """[(largo barra, cortes ordenados, nº de barras iguales)], los más repetidos primero."""
+        n: Dict[Tuple[float, Tuple[float, ...]], int] = {}
+        for b in self.barras:
+            k = (b.largo, tuple(sorted((c.largo for c in b.cortes), reverse=True)))
+            n[k] = n.get(k, 0) + 1
+        return sorted(((l, p, k) for (l, p), k in n.items()), key=lambda t: (-t[2], -t[0], t[1]))
+
+
+def _best_fit(cortes: Sequence[Corte], largo: float, kerf: float) -> List[Barra]:
+    """Best-fit decreasing: cada corte a la barra abierta que deja menos sobrante."""
+    barras: List[Barra] = []
+    libres: List[Tuple[float, int]] = []        # (libre, índice) ordenado
+    for c in sorted(cortes, key=lambda c: -c.largo):
+        need = c.largo + kerf
+        i = bisect_left(libres, (need - EPS, -1))
+        if i < len(libres):
+            _, k = libres.pop(i)
+        else:
+            k = len(barras)
+            barras.append(Barra(largo))
+        barras[k].poner(c, kerf)
+        insort(libres, (barras[k].libre(kerf), k))
+    return barras
+
+
+def _patron(pesos: np.ndarray, valores: np.ndarray, maximos: np.ndarray, capacidad: int) -> np.ndarray:
+    """
+    Mochila acotada: cuántas piezas de cada largo (peso en mm enteros) dan más valor
+    en una barra. Cada largo se parte en paquetes 1, 2, 4... (mochila 0/1 con NumPy).
+    """
+    paquetes: List[Tuple[int, int]] = []           # (índice de largo, nº de piezas)
+    for i, m in enumerate(maximos):
+        k = 1
+        while m > 0:
+            q = min(k, int(m))
+            paquetes.append((i, q))
+            m -= q
+            k *= 2
+    dp = np.zeros(capacidad + 1, dtype=float)
+    toma = np.zeros((len(paquetes), capacidad + 1), dtype=bool)
+    for j, (i, q) in enumerate(paquetes):
+        w = int(pesos[i]) * q
+        if w > capacidad:
+            continue
+        cand = dp[:-w] + valores[i] * q
+        mejor = cand > dp[w:] + EPS
+        toma[j, w:] = mejor
+        dp[w:] = np.where(mejor, cand, dp[w:])
+    cuenta = np.zeros(len(pesos), dtype=np.int64)
+    c = int(dp.argmax())
+    for j in range(len(paquetes) - 1, -1, -1):
+        if toma[j, c]:
+            i, q = paquetes[j]
+            cuenta[i] += q
+            c -= int(pesos[i]) * q
+    return cuenta
+
+
+def _por_patrones(cortes: Sequence[Corte], largo: float, kerf: float) -> List[Barra]:
+    """
+    Procedimiento secuencial por patrones: el patrón que más llena la barra con la
+    demanda pendiente se repite cuantas veces permita la demanda. El valor de cada
+    pieza es su largo con una prima a los largos (colocar pronto las piezas difíciles:
+    si no, al final quedan solas). Bueno con pocos largos distintos (sinfines
+    repetidos); ahí best-fit deja más retal.
+    """
+    por_largo: Dict[float, List[Corte]] = defaultdict(list)
+    for c in cortes:
+        por_largo[c.largo].append(c)
+    largos = sorted(por_largo, reverse=True)
+    pesos = np.array([int(math.ceil(l + kerf - EPS)) for l in largos], dtype=np.int64)
+    demanda = np.array([len(por_largo[l]) for l in largos], dtype=np.int64)
+    capacidad = int(math.floor(largo + kerf + EPS))
+    valores = pesos * (1.0 + PRIMA_LARGOS * pesos / capacidad)
+    barras: List[Barra] = []
+    while demanda.any():
+        cuenta = _patron(pesos, valores, demanda, capacidad)
+        usados = cuenta > 0
+        if not usados.any():
+            break
+        veces = int((demanda[usados] // cuenta[usados]).min())
+        for _ in range(veces):
+            b = Barra(largo)
+            for i in np.flatnonzero(usados):
+                for _ in range(int(cuenta[i])):
+                    b.poner(por_largo[largos[i]].pop(), kerf)
+            barras.append(b)
+        demanda -= cuenta * veces
+    return barras
+
+
+def _mejorar(barras: List[Barra], kerf: float, pasadas: int = MEJORA_PASADAS) -> List[Barra]:
+    """
+    Vacía la barra menos llena: mueve cada corte a la barra con menos hueco en que
+    quepa o, si no cabe, lo cambia por uno más corto de otra barra que así queda más
+    llena. Se repite mientras se gane algo; las barras vacías se eliminan.
+    """
+    for _ in range(pasadas):
+        if len(barras) < 2:
+            break
+        barras.sort(key=lambda b: b.usado)
+        e = barras[0]
+        otras = barras[1:]
+        mejora = False
+        for c in sorted(e.cortes, key=lambda c: -c.largo):
+            need = c.largo + kerf
+            destino = min((b for b in otras if b.libre(kerf) >= need - EPS), key=lambda b: b.libre(kerf), default=None)
+            if destino is not None:
+                e.quitar(c, kerf)
+                destino.poner(c, kerf)
+                mejora = True
+                continue
+            # intercambio 1 por 1: el corte d (más corto) vuelve a e, c ocupa su sitio
+            mejor = None
+            for b in otras:
+                hueco = b.libre(kerf)
+                for d in b.cortes:
+                    ganancia = c.largo - d.largo
+                    if ganancia > EPS and hueco + d.largo >= c.largo - EPS and (mejor is None or ganancia > mejor[0]):
+                        mejor = (ganancia, b, d)
+            if mejor is not None:
+                _, b, d = mejor
+                b.quitar(d, kerf)
+                e.quitar(c, kerf)
+                b.poner(c, kerf)
+                e.poner(d, kerf)
+                mejora = True
+        if not e.cortes:
+            barras.remove(e)
+        if not mejora:
+            break
+    return barras
+
+
+def _ajustar_largos(barras: List[Barra], stock: Sequence[float], kerf: float):
+    """Cada barra al largo comercial más corto en que caben sus cortes."""
+    for b in barras:
+        for largo in sorted(stock):
+            if b.usado <= largo + kerf + EPS:
+                b.largo = float(largo)
+                break
+
+
+def optimizar(cortes: Iterable[Corte], stock: Sequence[float], kerf: float = KERF_MM) -> Tuple[List[Barra], List[Corte]]:
+    """Plan de un grupo: (barras, cortes que no caben en ningún largo comercial)."""
+    mayor = max(stock)
+    cortes = list(cortes)
+    no_caben = [c for c in cortes if c.largo > mayor + EPS]
+    validos = [c for c in cortes if c.largo <= mayor + EPS and c.largo > 0]
+    planes = [_best_fit(validos, mayor, kerf)]
+    if len({c.largo for c in validos}) <= PATRONES_MAX_LARGOS:
+        planes.append(_por_patrones(validos, mayor, kerf))
+    for barras in planes:
+        _mejorar(barras, kerf)
+        _ajustar_largos(barras, stock, kerf)
+    barras = min(planes, key=lambda bs: (sum(b.largo for b in bs), len(bs)))
+    barras.sort(key=lambda b: (-b.largo, b.libre(kerf)))
+    return barras, no_caben
+
+
+def plan_corte(
+    cortes: Iterable[Corte],
+    stock_tubo: Sequence[float] = STOCK_TUBO_MM,
+    stock_barra: Sequence[float] = STOCK_BARRA_MM,
+    kerf: float = KERF_MM,
+) -> List[PlanGrupo]:
+    """Agrupa por (OD, espesor, material) y optimiza cada grupo (tubo o barra maciza)."""
+    grupos: Dict[Tuple[float, float, str], List[Corte]] = defaultdict(list)
+    for c in cortes:
+        grupos[c.grupo].append(c)
+    out = []
+    for (od, thk, material), lista in sorted(grupos.items()):
+        barras, no_caben = optimizar(lista, stock_tubo if thk > 0 else stock_barra, kerf)
+        out.append(PlanGrupo(od, thk, material, barras, no_caben, kerf))
+    return out
+
+
+# ------------------ cortes desde definiciones guardadas ------------------
+
+def cortes_definicion(
+    definicion: Mapping[str, Any],
+    nombre: str = "",
+    model: Optional[CatalogModel] = None,
+) -> List[Corte]:
+    """Tubo eje, camisa y mangones de una definición (se omite lo que no tenga datos)."""
+    from engine.sinfin import calcular
+
+    g = definicion.get
+    c = calcular(definicion, model)
+    out: List[Corte] = []
+
+    od = parse_num(g("eje_od"))
+    thk = parse_num(g("eje_thk"))
+    li = c.get("longitud_inventor")
+    n = num_vanos(definicion)
+    if od and thk and li and li > 0:
+        out.extend(Corte(f"{nombre} eje".strip(), round(li / n, 1), od, thk, MATERIAL_TUBO, "eje") for _ in range(n))
+
+    lt = parse_num(g("longitud_entre_testeros"))
+    if str(g("camisa_tipo") or "").upper() != "ARTESA" and c.get("camisa_od") and lt:
+        out.append(Corte(f"{nombre} camisa".strip(), lt, c["camisa_od"], c["camisa_thk"], MATERIAL_TUBO, "camisa"))
+
+    d = c.get("mangon_stock")
+    if d:
+        testero = parse_num(g("espesor_testero", g("002A_testeros")))
+        testero = testero if testero is not None else ESPESOR_TESTERO_DEFECTO_MM
+        for lado in ("conduccion", "conducido"):
+            ext = parse_num(g(f"mangon_ext_{lado}"))
+            if ext is not None:
+                largo = ext + testero + HOLGURA_MANGONES_INVENTOR_MM / 2.0 + INSERCION_MANGON_MM
+                out.append(Corte(f"{nombre} mangón {lado}".strip(), largo, float(d), 0.0, MATERIAL_BARRA, "mangon"))
+        out.extend(
+            Corte(f"{nombre} mangón intermedio".strip(), 2.0 * INSERCION_MANGON_MM, float(d), 0.0, MATERIAL_BARRA,
+                  "mangon")
+            for _ in range(n - 1)
+        )
+    return out
+
+
+def cortes_pedidos(con, pedido_ids: Optional[Iterable[int]] = None, model: Optional[CatalogModel] = None) -> List[Corte]:
+    """Cortes de todos los sinfines de los pedidos (None = pedidos abiertos)."""
+    from utils.db import list_pedidos_abiertos, list_sinfines_definiciones
+
+    if pedido_ids is None:
+        pedido_ids = list_pedidos_abiertos(con)
+    out: List[Corte] = []
+    for pid in pedido_ids:
+        for sid, nombre, d in list_sinfines_definiciones(con, pid):
+            out.extend(cortes_definicion(d, f"P{pid}/{nombre or sid}", model))
+    return out
+
+
+def plan_pedidos(con, pedido_ids: Optional[Iterable[int]] = None, model: Optional[CatalogModel] = None,
+                 **kwargs) -> List[PlanGrupo]:
+    return plan_corte(cortes_pedidos(con, pedido_ids, model), **kwargs)
+
+
+# ------------------ salida ------------------
+
+def texto_plan(planes: Iterable[PlanGrupo]) -> List[str]:
+    """Una línea por grupo: "Ø60.3x5 S355J2H: 12 barras (10×6000, 2×3000) · desperdicio 4.1 %"."""
+    lineas = []
+    for p in planes:
+        if p.barras:
+            largos = ", ".join(f"{n}×{l:g}" for l, n in p.barras_por_largo().items())
+            s = f"{p.nombre}: {len(p.barras)} barras ({largos}) · desperdicio {100.0 * p.desperdicio:.1f} %"
+        else:
+            s = f"{p.nombre}: sin barras"
+        if p.no_caben:
+            s += f" · NO CABEN: {', '.join(sorted({c.ref for c in p.no_caben}))}"
+        lineas.append(s)
+    return lineas
+
+
+COLUMNAS_CSV = ("od", "thk", "material", "barra", "largo_barra", "cortes", "refs", "sobrante")
+
+
+def exportar_csv(planes: Iterable[PlanGrupo], path: str) -> int:
+    """Plan de corte a CSV (';', una fila por barra). Devuelve el nº de barras."""
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(COLUMNAS_CSV)
+        for p in planes:
+            for i, b in enumerate(p.barras, start=1):
+                cortes = sorted(b.cortes, key=lambda c: -c.largo)
+                w.writerow([
+                    f"{p.od:g}", f"{p.thk:g}", p.material, i, f"{b.largo:g}",
+                    "+".join(f"{c.largo:g}" for c in cortes),
+                    " | ".join(c.ref for c in cortes),
+                    f"{b.sobrante(p.kerf):g}",
+                ])
+                n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    """python -m engine.corte [PEDIDO_ID ...] [--csv plan.csv] [--kerf 3]   (sin ids: pedidos abiertos)"""
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m engine.corte")
+    ap.add_argument("pedidos", type=int, nargs="*")
+    ap.add_argument("--csv", metavar="RUTA")
+    ap.add_argument("--kerf", type=float, default=KERF_MM)
+    args = ap.parse_args(argv)
+
+    from utils.db import connect
+
+    con = connect()
+    try:
+        planes = plan_pedidos(con, args.pedidos or None, kerf=args.kerf)
+    finally:
+        con.close()
+    for linea in texto_plan(planes):
+        print(linea)
+    if args.csv:
+        print(f"{exportar_csv(planes, args.csv)} barras -> {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+# engine/espira.py
+"""
+Desarrollo plano de la espira (lo que hoy se saca modelando Espira_01_desarrollo.ipt).
+
+Una vuelta de hélice (paso S) entre Ø int d y Ø ext D se corta de una corona plana:
+
+    L_i = √((π·d)² + S²)      L_e = √((π·D)² + S²)      h = (D − d) / 2
+    r = h · L_i / (L_e − L_i)     R = r + h                (radios de la corona)
+    θ = L_e / R                    hueco = 360° − θ         (sector que se recorta)
+
+Corrección de fibra neutra: θ y los radios neutros salen de las hélices de la fibra
+neutra del conformado, d_n = d + K·t y D_n = D − K·t (K = FACTOR_K, AJUSTABLE; K = 0
+es la geometría pura); los bordes de corte se devuelven K·t/2 hacia fuera
+(r = r_n − K·t/2, R = R_n + K·t/2), así la corona mantiene la altura (D − d)/2 de la
+espira. Espiras por disco: sectores de ángulo θ que caben en una corona.
+
+Los resultados se memorizan en memoria y en una BD SQLite en disco
+(data/desarrollos_espira.db): un diseño repetido no se recalcula nunca.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_model import parse_num
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DB_PATH = os.path.join(BASE_DIR, "data", "desarrollos_espira.db")
+
+FACTOR_K = 0.5
+DENSIDAD_ACERO_KG_MM3 = 7.85e-6
+CACHE_VERSION = 2               # subir si cambian las fórmulas (invalida la caché en disco)
+
+
+class Desarrollo(NamedTuple):
+    """Corona de corte de una espira (mm y grados)."""
+
+    r_int: float
+    r_ext: float
+    angulo_deg: float           # sector que forma la espira
+    hueco_deg: float            # 360 − ángulo (se recorta)
+    espiras_por_disco: int
+    long_int: float             # hélice interior desarrollada (fibra neutra)
+    long_ext: float
+    masa_kg: float
+
+    @property
+    def d_int(self) -> float:
+        return 2.0 * self.r_int
+
+    @property
+    def d_ext(self) -> float:
+        return 2.0 * self.r_ext
+
+
+def desarrollos(de_mm, di_mm, paso_mm, espesor_mm, k: float = FACTOR_K) -> Dict[str, np.ndarray]:
+    """Versión vectorizada (broadcasting): columnas de Desarrollo como arrays."""
+    t = np.asarray(espesor_mm, dtype=float)
+    d = np.asarray(di_mm, dtype=float) + k * t
+    D = np.asarray(de_mm, dtype=float) - k * t
+    s = np.asarray(paso_mm, dtype=float)
+    li = np.hypot(np.pi * d, s)
+    le = np.hypot(np.pi * D, s)
+    h = (D - d) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_n = h * li / (le - li)
+        R_n = r_n + h
+        ang = np.degrees(le / R_n)
+        por_disco = np.floor(360.0 / ang + 1e-9)
+    r = r_n - k * t / 2.0
+    R = R_n + k * t / 2.0
+    area = np.radians(ang) / 2.0 * (R ** 2 - r ** 2)
+    return {
+        "r_int": r,
+        "r_ext": R,
+        "angulo_deg": ang,
+        "hueco_deg": 360.0 - ang,
+        "espiras_por_disco": por_disco,
+        "long_int": li,
+        "long_ext": le,
+        "masa_kg": area * t * DENSIDAD_ACERO_KG_MM3,
+    }
+
+
+def desarrollo(de_mm: float, di_mm: float, paso_mm: float, espesor_mm: float, k: float = FACTOR_K) -> Desarrollo:
+    """Desarrollo de una espira (sin caché). ValueError si la geometría no es válida."""
+    if not (de_mm > di_mm > 0 and paso_mm > 0 and espesor_mm >= 0) or de_mm - di_mm <= 2.0 * k * espesor_mm:
+        raise ValueError(f"Espira no válida: Øe={de_mm!r} Øi={di_mm!r} paso={paso_mm!r} e={espesor_mm!r}")
+    c = desarrollos(de_mm, di_mm, paso_mm, espesor_mm, k)
+    return Desarrollo(
+        float(c["r_int"]), float(c["r_ext"]), float(c["angulo_deg"]), float(c["hueco_deg"]),
+        int(c["espiras_por_disco"]), float(c["long_int"]), float(c["long_ext"]), float(c["masa_kg"]),
+    )
+
+
+# ------------------ caché en disco ------------------
+
+class CacheDesarrollos:
+    """
+    Memo de desarrollos: dict en memoria delante de una tabla SQLite.
+    Clave = entradas redondeadas a 0.01 mm + K + CACHE_VERSION.
+    """
+
+    def __init__(self, path: str = CACHE_DB_PATH):
+        self.path = path
+        self._mem: Dict[str, Desarrollo] = {}
+        self._lock = threading.Lock()
+        self._con: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._con is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            con = sqlite3.connect(self.path, check_same_thread=False)
+            con.execute("CREATE TABLE IF NOT EXISTS desarrollos (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)")
+            con.commit()
+            self._con = con
+        return self._con
+
+    @staticmethod
+    def clave(de_mm: float, di_mm: float, paso_mm: float, espesor_mm: float, k: float) -> str:
+        return f"v{CACHE_VERSION}|{de_mm:.2f}|{di_mm:.2f}|{paso_mm:.2f}|{espesor_mm:.2f}|{k:.3f}"
+
+    def obtener(self, de_mm: float, di_mm: float, paso_mm: float, espesor_mm: float,
+                k: float = FACTOR_K) -> Desarrollo:
+        key = self.clave(de_mm, di_mm, paso_mm, espesor_mm, k)
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self.hits += 1
+                return hit
+            con = self._db()
+            row = con.execute("SELECT valor FROM desarrollos WHERE clave = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                d = Desarrollo(*json.loads(row[0]))
+            else:
+                self.misses += 1
+                d = desarrollo(de_mm, di_mm, paso_mm, espesor_mm, k)
+                with con:
+                    con.execute(
+                        "INSERT OR REPLACE INTO desarrollos (clave, valor) VALUES (?, ?)", (key, json.dumps(list(d)))
+                    )
+            self._mem[key] = d
+            return d
+
+    def close(self):
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+
+_CACHE: Optional[CacheDesarrollos] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def cache_por_defecto() -> CacheDesarrollos:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = CacheDesarrollos()
+        return _CACHE
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+def desarrollos_definicion(
+    definicion: Mapping[str, Any],
+    cache: Optional[CacheDesarrollos] = None,
+    k: float = FACTOR_K,
+) -> List[Tuple[float, Desarrollo]]:
+    """[(paso, Desarrollo)] de los pasos distintos de la definición ([] si faltan datos)."""
+    g = definicion.get
+    de = parse_num(g("diam_espira"))
+    di = parse_num(g("eje_od"))
+    t = parse_num(g("espesor_espira"))
+    if de is None or di is None or t is None:
+        return []
+    cache = cache if cache is not None else cache_por_defecto()
+    out: List[Tuple[float, Desarrollo]] = []
+    for p in dict.fromkeys(p for p in (parse_num(g(k_)) for k_ in ("paso1", "paso2", "paso3")) if p):
+        try:
+            out.append((p, cache.obtener(de, di, p, t, k)))
+        except ValueError:
+            continue
+    return out
+
+
+def texto_desarrollo(d: Optional[Desarrollo]) -> str:
+    """"Øi 58.9 · Øe 197.3 · hueco 42.1° · 1/disco" para la UI."""
+    if d is None:
+        return ""
+    return (
+        f"Øi {d.d_int:.1f} · Øe {d.d_ext:.1f} · hueco {d.hueco_deg:.1f}° · "
+        f"{d.espiras_por_disco}/disco · {d.masa_kg:.2f} kg"
+    )
+
+
+def num_discos(num_espiras: int, d: Desarrollo) -> int:
+    """Coronas a cortar para num_espiras vueltas."""
+    return int(math.ceil(num_espiras / max(d.espiras_por_disco, 1)))
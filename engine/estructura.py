@@ -0,0 +1,249 @@
+# engine/estructura.py
+"""
+Comprobación estructural del tubo eje: flecha, tensión combinada (flexión + torsión)
+y peso del vano entre mangones, para TODOS los tubos del catálogo a la vez (NumPy).
+
+Modelo: viga biapoyada de vano L (entre testeros / nº de vanos si hay mangones
+intermedios) con carga repartida w = tubo + espira + material.
+
+    flecha   δ  = 5·w·L⁴ / (384·E·I)
+    flexión  σ  = (w·L²/8) / W          W  = 2·I / OD
+    torsión  τ  = M_t / Wp              Wp = 2·W
+    combinada σv = √(σ² + 3·τ²)         (von Mises)
+
+Pasa el tubo mecanizable, con altura de espira mínima, δ <= FLECHA_MAX_MM y
+σv <= TENSION_ADM_MPA; se propone el más ligero (kg/m). Los resultados se cachean
+por (vano, carga): cambiar campos que no intervienen no recalcula nada.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from engine.catalogo import modelo_catalogo
+from engine.reglas import ALTURA_ESPIRA_MIN_MM
+from utils.catalog_model import MECANIZADO_MAX_MM, MECANIZADO_MIN_MM, CatalogModel, Tubo, parse_num, tubo_key
+
+E_ACERO_MPA = 210000.0
+DENSIDAD_ACERO_KG_MM3 = 7.85e-6
+G_M_S2 = 9.81
+
+# Límites (AJUSTABLES): flecha CEMA 1/4" entre apoyos; tensión admisible a fatiga (eje girando)
+FLECHA_MAX_MM = 6.35
+TENSION_ADM_MPA = 80.0
+ESPESOR_ESPIRA_DEFECTO_MM = 4.0
+
+CHECKS_EJE = ("mecanizado_ok", "espira_ok", "flecha_ok", "tension_ok")
+
+
+@lru_cache(maxsize=8)
+def secciones(tubos: Tuple[Tubo, ...]) -> Dict[str, np.ndarray]:
+    """Propiedades de sección de los tubos (mm, mm², mm⁴, kg/m); cacheado por catálogo."""
+    od = np.array([t.od for t in tubos], dtype=float)
+    di = np.array([t.id for t in tubos], dtype=float)
+    area = np.pi / 4.0 * (od ** 2 - di ** 2)
+    inercia = np.pi / 64.0 * (od ** 4 - di ** 4)
+    return {
+        "od": od,
+        "id": di,
+        "area_mm2": area,
+        "inercia_mm4": inercia,
+        "w_mm3": 2.0 * inercia / od,
+        "kg_m": area * DENSIDAD_ACERO_KG_MM3 * 1000.0,
+    }
+
+
+def masa_espira_kg_m(de_mm, eje_od_mm, paso_mm, espesor_mm) -> np.ndarray:
+    """Masa de la espira por metro de eje (desarrollo helicoidal de la corona)."""
+    de = np.asarray(de_mm, dtype=float)
+    d = np.asarray(eje_od_mm, dtype=float)
+    s = np.asarray(paso_mm, dtype=float)
+    h = np.maximum((de - d) / 2.0, 0.0)
+    dm = (de + d) / 2.0
+    area_por_mm = h * np.sqrt((np.pi * dm) ** 2 + s ** 2) / s
+    return area_por_mm * np.asarray(espesor_mm, dtype=float) * DENSIDAD_ACERO_KG_MM3 * 1000.0
+
+
+class Carga(NamedTuple):
+    """Todo lo que carga el eje salvo el propio tubo (clave de caché junto al vano)."""
+
+    de_mm: float
+    paso_mm: float
+    espesor_espira_mm: float = ESPESOR_ESPIRA_DEFECTO_MM
+    llenado: float = 0.0
+    densidad_t_m3: float = 0.0
+    par_nm: float = 0.0
+
+
+class ComprobacionEje:
+    """Resultado por tubo (columnas NumPy en el orden de model.tubos) + tubo propuesto."""
+
+    __slots__ = ("tubos", "cols", "propuesto")
+
+    def __init__(self, tubos: Tuple[Tubo, ...], cols: Dict[str, np.ndarray]):
+        self.tubos = tubos
+        self.cols = cols
+        ok = np.flatnonzero(cols["ok"])
+        if len(ok):
+            # el más ligero; a igualdad de peso, el de menor OD
+            i = ok[np.lexsort((cols["od"][ok], cols["kg_m"][ok]))[0]]
+            self.propuesto: Optional[Tubo] = tubos[i]
+        else:
+            self.propuesto = None
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self.cols[col]
+
+    def fila(self, tubo: Optional[Tubo]) -> Optional[Dict[str, Any]]:
+        """Valores de un tubo (None si no es del catálogo)."""
+        if tubo is None:
+            return None
+        k = tubo_key(tubo.od, tubo.thk)
+        for i, t in enumerate(self.tubos):
+            if tubo_key(t.od, t.thk) == k:
+                return {c: v[i].item() for c, v in self.cols.items()}
+        return None
+
+
+def _evaluar(tubos: Tuple[Tubo, ...], mecanizado: np.ndarray, vano_mm: float, carga: Carga) -> Dict[str, np.ndarray]:
+    s = secciones(tubos)
+    od = s["od"]
+    h_espira = (carga.de_mm - od) / 2.0
+    espira = masa_espira_kg_m(carga.de_mm, od, carga.paso_mm, carga.espesor_espira_mm)
+    material = carga.llenado * np.pi / 4.0 * np.maximum(carga.de_mm ** 2 - od ** 2, 0.0) * carga.densidad_t_m3 * 1e-3
+    kg_m_total = s["kg_m"] + espira + material
+    w = kg_m_total * G_M_S2 / 1000.0                                  # N/mm
+    L = float(vano_mm)
+
+    flecha = 5.0 * w * L ** 4 / (384.0 * E_ACERO_MPA * s["inercia_mm4"])
+    sigma = w * L ** 2 / 8.0 / s["w_mm3"]
+    tau = carga.par_nm * 1000.0 / (2.0 * s["w_mm3"])
+    sigma_v = np.sqrt(sigma ** 2 + 3.0 * tau ** 2)
+
+    cols = {
+        "od": od,
+        "thk": np.array([t.thk for t in tubos], dtype=float),
+        "kg_m": s["kg_m"],
+        "kg_m_total": kg_m_total,
+        "peso_vano_kg": kg_m_total * L / 1000.0,
+        "flecha_mm": flecha,
+        "sigma_mpa": sigma,
+        "tau_mpa": tau,
+        "sigma_v_mpa": sigma_v,
+        "mecanizado_ok": mecanizado,
+        "espira_ok": h_espira >= ALTURA_ESPIRA_MIN_MM,
+        "flecha_ok": flecha <= FLECHA_MAX_MM,
+        "tension_ok": sigma_v <= TENSION_ADM_MPA,
+    }
+    ok = np.ones(len(tubos), dtype=bool)
+    for c in CHECKS_EJE:
+        ok &= cols[c]
+    cols["ok"] = ok
+    return cols
+
+
+@lru_cache(maxsize=256)
+def _comprobar(tubos: Tuple[Tubo, ...], vano_mm: float, carga: Carga) -> ComprobacionEje:
+    # clave = tupla de tubos (como secciones): un modelo recargado no queda retenido en la caché
+    s = secciones(tubos)
+    mm = s["od"] - s["id"]
+    mecanizado = (mm >= MECANIZADO_MIN_MM) & (mm <= MECANIZADO_MAX_MM)
+    return ComprobacionEje(tubos, _evaluar(tubos, mecanizado, vano_mm, carga))
+
+
+def comprobar_ejes(vano_mm: float, carga: Carga, model: Optional[CatalogModel] = None) -> ComprobacionEje:
+    """Todos los tubos eje del catálogo para un vano y una carga (cacheado)."""
+    carga = Carga(*(round(float(x), 3) for x in carga))
+    return _comprobar(modelo_catalogo(model).tubos, round(float(vano_mm), 1), carga)
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+def num_vanos(definicion: Mapping[str, Any]) -> int:
+    """Vanos entre apoyos: 1 + mangones intermedios (si los lleva)."""
+    if not definicion.get("mangones_intermedios"):
+        return 1
+    n = parse_num(definicion.get("num_mangones_intermedios"))
+    return 1 + max(int(n or 0), 0)
+
+
+def carga_definicion(definicion: Mapping[str, Any], par_nm: Optional[float] = None) -> Optional[Carga]:
+    """Carga del eje desde la definición (None si falta Ø espira o paso)."""
+    g = definicion.get
+    de = parse_num(g("diam_espira"))
+    pasos = [p for p in (parse_num(g(k)) for k in ("paso1", "paso2", "paso3")) if p]
+    if not de or not pasos:
+        return None
+    return Carga(
+        de_mm=de,
+        paso_mm=min(pasos),
+        espesor_espira_mm=parse_num(g("espesor_espira")) or ESPESOR_ESPIRA_DEFECTO_MM,
+        llenado=parse_num(g("coef_llenado")) or 0.0,
+        densidad_t_m3=parse_num(g("densidad_aparente")) or 0.0,
+        par_nm=par_nm or 0.0,
+    )
+
+
+def comprobar_eje_definicion(
+    definicion: Mapping[str, Any],
+    model: Optional[CatalogModel] = None,
+    par_nm: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    {"tubo": fila del tubo elegido o None, "propuesto": Tubo o None, "vano_mm": ...}.
+    par_nm: si no se da, sale de engine.potencia con los datos de la definición.
+    """
+    model = modelo_catalogo(model)
+    lt = parse_num(definicion.get("longitud_entre_testeros"))
+    if par_nm is None:
+        from engine.potencia import potencia_definiciones
+
+        par = float(potencia_definiciones([definicion])["par_nm"][0])
+        par_nm = None if np.isnan(par) else par
+    carga = carga_definicion(definicion, par_nm)
+    if not lt or carga is None:
+        return {"tubo": None, "propuesto": None, "vano_mm": None}
+    vano = lt / num_vanos(definicion)
+    res = comprobar_ejes(vano, carga, model)
+    tubo = model.tubo(definicion.get("eje_od"), definicion.get("eje_thk"))
+    return {"tubo": res.fila(tubo), "propuesto": res.propuesto, "vano_mm": vano}
+
+
+def comprobar_pedido(con, pedido_id: int, model: Optional[CatalogModel] = None) -> Dict[int, Dict[str, Any]]:
+    """{sinfin_id: comprobar_eje_definicion} de todo el pedido (una consulta)."""
+    from engine.potencia import potencia_definiciones
+    from utils.db import list_sinfines_definiciones
+
+    model = modelo_catalogo(model)
+    filas = list_sinfines_definiciones(con, pedido_id)
+    pares = potencia_definiciones([d for _, _, d in filas])["par_nm"]
+    return {
+        sid: comprobar_eje_definicion(d, model, par_nm=None if np.isnan(p) else float(p))
+        for (sid, _nombre, d), p in zip(filas, pares)
+    }
+
+
+def texto_comprobacion(r: Mapping[str, Any]) -> str:
+    """"OK · flecha 2.1 mm · σv 35 MPa · 120 kg/vano" para la UI ("" sin datos)."""
+    f = r.get("tubo")
+    if not f:
+        return ""
+    estado = "OK" if f["ok"] else "NO CUMPLE"
+    return (
+        f"{estado} · flecha {f['flecha_mm']:.1f} mm · σv {f['sigma_v_mpa']:.0f} MPa"
+        f" · {f['peso_vano_kg']:.0f} kg/vano"
+    )
+
+
+def texto_propuesto(r: Mapping[str, Any]) -> str:
+    t = r.get("propuesto")
+    return f"{t.od_text} x {t.thk_text}" if t is not None else ""
+
+
+def tubos_que_cumplen(res: ComprobacionEje) -> List[Tubo]:
+    """Tubos que pasan, del más ligero al más pesado."""
+    ok = np.flatnonzero(res["ok"])
+    orden = ok[np.lexsort((res["od"][ok], res["kg_m"][ok]))]
+    return [res.tubos[i] for i in orden]
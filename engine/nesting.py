@@ -0,0 +1,453 @@
+# engine/nesting.py
+"""
+Anidado 2D en chapa de los recortes de calderería: coronas de espira (engine.espira),
+discos y rectángulos (testeros), por grupos de (material, espesor).
+
+Formas de colisión:
+  - corona: círculo Ø ext con hueco Ø int (en el hueco caben piezas pequeñas)
+  - disco:  círculo macizo
+  - rect:   rectángulo alineado con los ejes (se prueba también girado 90°)
+
+Colocación "abajo-izquierda" sobre puntos candidatos: esquinas de las piezas ya
+puestas, posiciones tangentes a 60° entre círculos iguales (empaquetado hexagonal)
+y centros de huecos libres (se prueban los primeros: no gastan chapa). Las
+colisiones se consultan en una rejilla uniforme (índice espacial): cada prueba solo
+mira las piezas de las celdas que toca. En una chapa solo se añaden piezas, así
+que un candidato que falló para una forma no se vuelve a probar con otra igual.
+
+Aprovechamiento = área real de las piezas (los sectores de espira, no la corona
+entera) / área de las chapas. Todas las chapas del grupo salen del formato mayor;
+la última se rehace con el formato más pequeño en el que quepa.
+"""
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from engine.espira import CacheDesarrollos, desarrollos_definicion
+from engine.reglas import ESPESOR_TESTERO_DEFECTO_MM
+from utils.catalog_model import CatalogModel, ceil_to_5, parse_num
+
+FORMATOS_CHAPA_MM = ((3000.0, 1500.0), (2500.0, 1250.0), (2000.0, 1000.0))
+SEPARACION_MM = 10.0            # entre piezas (ancho de corte + puente; AJUSTABLE)
+MARGEN_MM = 10.0                # al borde de la chapa
+CELDA_MM = 250.0                # lado de celda de la rejilla
+EPS = 1e-6
+
+TESTEROS_POR_SINFIN = 2
+ALA_TESTERO_MM = 50.0           # testero cuadrado: Ø camisa + 2·ala (AJUSTABLE)
+HOLGURA_ARTESA_MM = 25.0        # camisa artesa (002B): Ø espira + 2·holgura
+
+FORMAS = ("corona", "disco", "rect")
+
+
+class Pieza(NamedTuple):
+    """
+    Recorte a anidar. corona: a = radio ext, b = radio del hueco; disco: a = radio;
+    rect: a × b. area = área real por unidad (None: la de la forma).
+    """
+
+    ref: str
+    forma: str
+    a: float
+    b: float = 0.0
+    material: str = ""
+    espesor: float = 0.0
+    cantidad: int = 1
+    area: Optional[float] = None
+
+    @property
+    def area_forma(self) -> float:
+        if self.forma == "rect":
+            return self.a * self.b
+        return math.pi * (self.a ** 2 - (self.b ** 2 if self.forma == "corona" else 0.0))
+
+    @property
+    def area_real(self) -> float:
+        return self.area if self.area is not None else self.area_forma
+
+    @property
+    def area_envolvente(self) -> float:
+        return self.a * self.b if self.forma == "rect" else 4.0 * self.a ** 2
+
+
+class Colocada(NamedTuple):
+    """Pieza en la chapa. Círculos: x, y = centro, a = radio, b = hueco; rect: esquina inf. izq., a × b."""
+
+    ref: str
+    forma: str
+    x: float
+    y: float
+    a: float
+    b: float
+    area: float
+
+    @property
+    def caja(self) -> Tuple[float, float, float, float]:
+        if self.forma == "rect":
+            return self.x, self.y, self.x + self.a, self.y + self.b
+        return self.x - self.a, self.y - self.a, self.x + self.a, self.y + self.a
+
+
+def _separadas(p: Colocada, q: Colocada, sep: float) -> bool:
+    """True si p y q no se solapan (con separación sep), contando los huecos de las coronas."""
+    if p.forma != "rect" and q.forma != "rect":
+        d = math.hypot(p.x - q.x, p.y - q.y)
+        return (
+            d >= p.a + q.a + sep - EPS
+            or d + p.a + sep <= q.b + EPS
+            or d + q.a + sep <= p.b + EPS
+        )
+    if p.forma != "rect":
+        p, q = q, p
+    px0, py0, px1, py1 = p.caja
+    if q.forma == "rect":
+        qx0, qy0, qx1, qy1 = q.caja
+        return px1 + sep <= qx0 + EPS or qx1 + sep <= px0 + EPS or py1 + sep <= qy0 + EPS or qy1 + sep <= py0 + EPS
+    # p rect, q círculo: fuera del círculo o entero dentro del hueco
+    dx = max(px0 - q.x, 0.0, q.x - px1)
+    dy = max(py0 - q.y, 0.0, q.y - py1)
+    if math.hypot(dx, dy) >= q.a + sep - EPS:
+        return True
+    fx = max(abs(px0 - q.x), abs(px1 - q.x))
+    fy = max(abs(py0 - q.y), abs(py1 - q.y))
+    return math.hypot(fx, fy) + sep <= q.b + EPS
+
+
+class Chapa:
+    """Una chapa con sus piezas, la rejilla de colisiones y los puntos candidatos."""
+
+    def __init__(self, ancho: float, alto: float, separacion: float = SEPARACION_MM,
+                 margen: float = MARGEN_MM, celda: float = CELDA_MM):
+        self.ancho = float(ancho)
+        self.alto = float(alto)
+        self.separacion = float(separacion)
+        self.margen = float(margen)
+        self.celda = float(celda)
+        self.piezas: List[Colocada] = []
+        self._rejilla: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._candidatos: Set[Tuple[float, float]] = {(self.margen, self.margen)}
+        self._tangentes: Dict[float, Set[Tuple[float, float]]] = defaultdict(set)
+        self._huecos: List[Tuple[float, float, float]] = []
+        self._fallidos: Dict[Tuple[str, float, float], Set[Tuple[float, float]]] = defaultdict(set)
+        self._no_cabe: Set[Tuple[str, float, float]] = set()
+
+    @property
+    def area(self) -> float:
+        return self.ancho * self.alto
+
+    @property
+    def area_piezas(self) -> float:
+        return sum(p.area for p in self.piezas)
+
+    @property
+    def aprovechamiento(self) -> float:
+        return self.area_piezas / self.area
+
+    @property
+    def formato(self) -> str:
+        return f"{self.ancho:g}x{self.alto:g}"
+
+    # --- índice espacial ---
+
+    def _celdas(self, x0: float, y0: float, x1: float, y1: float) -> Iterable[Tuple[int, int]]:
+        c = self.celda
+        for i in range(int(x0 // c), int(x1 // c) + 1):
+            for j in range(int(y0 // c), int(y1 // c) + 1):
+                yield i, j
+
+    def _cabe(self, p: Colocada) -> bool:
+        x0, y0, x1, y1 = p.caja
+        m = self.margen
+        if x0 < m - EPS or y0 < m - EPS or x1 > self.ancho - m + EPS or y1 > self.alto - m + EPS:
+            return False
+        s = self.separacion
+        vistos: Set[int] = set()
+        for celda in self._celdas(x0 - s, y0 - s, x1 + s, y1 + s):
+            for k in self._rejilla.get(celda, ()):
+                if k not in vistos:
+                    vistos.add(k)
+                    if not _separadas(p, self.piezas[k], s):
+                        return False
+        return True
+
+    def _anadir(self, p: Colocada):
+        k = len(self.piezas)
+        self.piezas.append(p)
+        x0, y0, x1, y1 = p.caja
+        for celda in self._celdas(x0, y0, x1, y1):
+            self._rejilla[celda].append(k)
+
+        s, m = self.separacion, self.margen
+        self._candidatos.update(((x1 + s, y0), (x0, y1 + s), (x1 + s, m), (m, y1 + s)))
+        if p.forma != "rect":
+            d = 2.0 * p.a + s
+            self._tangentes[p.a].update(
+                (p.x + d * math.cos(t) - p.a, p.y + d * math.sin(t) - p.a)
+                for t in (math.radians(a) for a in range(0, 360, 60))
+            )
+            if p.b > s:
+                self._huecos.append((p.x, p.y, p.b))
+
+    # --- colocación ---
+
+    def colocar(self, pieza: Pieza) -> bool:
+        """Coloca una unidad de la pieza (abajo-izquierda). False si no cabe en esta chapa."""
+        firma = (pieza.forma, pieza.a, pieza.b)
+        if firma in self._no_cabe:
+            return False
+        area = pieza.area_real
+        if pieza.forma == "rect":
+            medidas = [(pieza.a, pieza.b)] + ([(pieza.b, pieza.a)] if pieza.a != pieza.b else [])
+            r_env = math.hypot(pieza.a, pieza.b) / 2.0
+        else:
+            medidas = [(2.0 * pieza.a, 2.0 * pieza.a)]
+            r_env = pieza.a
+
+        def en(x: float, y: float, w: float, h: float) -> Colocada:
+            if pieza.forma == "rect":
+                return Colocada(pieza.ref, "rect", x, y, w, h, area)
+            return Colocada(pieza.ref, pieza.forma, x + pieza.a, y + pieza.a, pieza.a,
+                            pieza.b if pieza.forma == "corona" else 0.0, area)
+
+        # 1) huecos de coronas (del más ajustado al más holgado)
+        for i in sorted(range(len(self._huecos)), key=lambda i: self._huecos[i][2]):
+            cx, cy, r = self._huecos[i]
+            if r_env + self.separacion > r + EPS:
+                continue
+            for w, h in medidas:
+                p = en(cx - w / 2.0, cy - h / 2.0, w, h)
+                if self._cabe(p):
+                    del self._huecos[i]
+                    self._anadir(p)
+                    return True
+
+        # 2) puntos candidatos, de abajo a arriba y de izquierda a derecha
+        fallidos = self._fallidos[firma]
+        pool = self._candidatos | self._tangentes.get(pieza.a, set()) if pieza.forma != "rect" else self._candidatos
+        for x, y in sorted(pool - fallidos, key=lambda c: (c[1], c[0])):
+            for w, h in medidas:
+                p = en(x, y, w, h)
+                if self._cabe(p):
+                    self._anadir(p)
+                    return True
+            fallidos.add((x, y))
+        self._no_cabe.add(firma)
+        return False
+
+
+class ResultadoGrupo:
+    """Chapas de un grupo (material, espesor) y las piezas que no caben en ningún formato."""
+
+    __slots__ = ("material", "espesor", "chapas", "no_caben")
+
+    def __init__(self, material: str, espesor: float, chapas: List[Chapa], no_caben: List[str]):
+        self.material = material
+        self.espesor = espesor
+        self.chapas = chapas
+        self.no_caben = no_caben
+
+    @property
+    def area_piezas(self) -> float:
+        return sum(c.area_piezas for c in self.chapas)
+
+    @property
+    def area_chapas(self) -> float:
+        return sum(c.area for c in self.chapas)
+
+    @property
+    def aprovechamiento(self) -> Optional[float]:
+        return self.area_piezas / self.area_chapas if self.chapas else None
+
+    def formatos(self) -> Dict[str, int]:
+        """{"3000x1500": n} en el orden de las chapas."""
+        out: Dict[str, int] = {}
+        for c in self.chapas:
+            out[c.formato] = out.get(c.formato, 0) + 1
+        return out
+
+
+def _unidades(piezas: Iterable[Pieza]) -> List[Pieza]:
+    """Una entrada por unidad, de mayor a menor envolvente (orden estable)."""
+    out = [p for p in piezas for _ in range(max(int(p.cantidad), 0))]
+    out.sort(key=lambda p: -p.area_envolvente)
+    return out
+
+
+def _llenar(unidades: Sequence[Pieza], formato: Tuple[float, float], separacion: float, margen: float) -> Optional[Chapa]:
+    """Todas las unidades en una sola chapa del formato (None si no caben)."""
+    ch = Chapa(*formato, separacion=separacion, margen=margen)
+    return ch if all(ch.colocar(u) for u in unidades) else None
+
+
+def anidar_grupo(
+    piezas: Iterable[Pieza],
+    formatos: Sequence[Tuple[float, float]] = FORMATOS_CHAPA_MM,
+    separacion: float = SEPARACION_MM,
+    margen: float = MARGEN_MM,
+) -> Tuple[List[Chapa], List[str]]:
+    """
+    Anida piezas del mismo material y espesor: primera chapa en la que cabe cada
+    unidad, abriendo chapas del formato mayor. Devuelve (chapas, refs que no caben).
+    """
+    por_area = sorted(formatos, key=lambda f: f[0] * f[1])
+    mayor = por_area[-1]
+    chapas: List[Chapa] = []
+    asignadas: List[List[Pieza]] = []
+    no_caben: List[str] = []
+    for u in _unidades(piezas):
+        for ch, lista in zip(chapas, asignadas):
+            if ch.colocar(u):
+                lista.append(u)
+                break
+        else:
+            ch = Chapa(*mayor, separacion=separacion, margen=margen)
+            if not ch.colocar(u):
+                no_caben.append(u.ref)
+                continue
+            chapas.append(ch)
+            asignadas.append([u])
+
+    if chapas:
+        for f in por_area[:-1]:
+            ch = _llenar(asignadas[-1], f, separacion, margen)
+            if ch is not None:
+                chapas[-1] = ch
+                break
+    return chapas, no_caben
+
+
+def anidar(
+    piezas: Iterable[Pieza],
+    formatos: Sequence[Tuple[float, float]] = FORMATOS_CHAPA_MM,
+    separacion: float = SEPARACION_MM,
+    margen: float = MARGEN_MM,
+) -> List[ResultadoGrupo]:
+    """Agrupa por (material, espesor) y anida cada grupo. Grupos ordenados por material y espesor."""
+    grupos: Dict[Tuple[str, float], List[Pieza]] = defaultdict(list)
+    for p in piezas:
+        if p.forma not in FORMAS:
+            raise ValueError(f"Forma no válida: {p.forma!r}")
+        grupos[(p.material, float(p.espesor))].append(p)
+    out = []
+    for (material, espesor), lista in sorted(grupos.items()):
+        chapas, no_caben = anidar_grupo(lista, formatos, separacion, margen)
+        out.append(ResultadoGrupo(material, espesor, chapas, no_caben))
+    return out
+
+
+# ------------------ piezas desde definiciones guardadas ------------------
+
+def piezas_definicion(
+    definicion: Mapping[str, Any],
+    nombre: str = "",
+    model: Optional[CatalogModel] = None,
+    cache: Optional[CacheDesarrollos] = None,
+) -> List[Pieza]:
+    """
+    Coronas de espira (paso 1, nº de espiras de engine.sinfin) y testeros cuadrados
+    (Ø camisa + 2·ala; artesa: Ø espira + 2·holgura) de una definición.
+    """
+    from engine.sinfin import calcular
+
+    g = definicion.get
+    c = calcular(definicion, model)
+    material = str(g("material") or "").strip()
+    out: List[Pieza] = []
+
+    n = c.get("num_espiras")
+    des = desarrollos_definicion(definicion, cache)
+    t = parse_num(g("espesor_espira"))
+    if des and n and t:
+        d = des[0][1]
+        sector = math.radians(d.angulo_deg) / 2.0 * (d.r_ext ** 2 - d.r_int ** 2)
+        por = max(d.espiras_por_disco, 1)
+        llenas, resto = divmod(int(n), por)
+        if llenas:
+            out.append(Pieza(f"{nombre} espira".strip(), "corona", d.r_ext, d.r_int, material, t, llenas, por * sector))
+        if resto:
+            out.append(Pieza(f"{nombre} espira".strip(), "corona", d.r_ext, d.r_int, material, t, 1, resto * sector))
+
+    if str(g("camisa_tipo") or "").upper() == "ARTESA":
+        de = parse_num(g("diam_espira"))
+        base = de + 2.0 * HOLGURA_ARTESA_MM if de else None
+        testero = parse_num(g("espesor_testero", g("002B_testeros")))
+    else:
+        base = c.get("camisa_od")
+        testero = parse_num(g("espesor_testero", g("002A_testeros")))
+    if base:
+        lado = float(ceil_to_5(base + 2.0 * ALA_TESTERO_MM))
+        out.append(Pieza(f"{nombre} testero".strip(), "rect", lado, lado, material,
+                         testero if testero is not None else ESPESOR_TESTERO_DEFECTO_MM, TESTEROS_POR_SINFIN))
+    return out
+
+
+def piezas_pedidos(
+    con,
+    pedido_ids: Iterable[int],
+    model: Optional[CatalogModel] = None,
+    cache: Optional[CacheDesarrollos] = None,
+) -> List[Pieza]:
+    """Piezas de todos los sinfines de los pedidos (una consulta por pedido)."""
+    from utils.db import list_sinfines_definiciones
+
+    out: List[Pieza] = []
+    for pid in pedido_ids:
+        for sid, nombre, d in list_sinfines_definiciones(con, pid):
+            out.extend(piezas_definicion(d, f"P{pid}/{nombre or sid}", model, cache))
+    return out
+
+
+def anidar_pedidos(
+    con,
+    pedido_ids: Iterable[int],
+    formatos: Sequence[Tuple[float, float]] = FORMATOS_CHAPA_MM,
+    model: Optional[CatalogModel] = None,
+    cache: Optional[CacheDesarrollos] = None,
+) -> List[ResultadoGrupo]:
+    return anidar(piezas_pedidos(con, pedido_ids, model, cache), formatos)
+
+
+def texto_informe(resultado: Iterable[ResultadoGrupo]) -> List[str]:
+    """Una línea por grupo: "S355J2+N e4: 3 chapas (2×3000x1500, 1×2000x1000) · 71.2 %"."""
+    lineas = []
+    for r in resultado:
+        if r.chapas:
+            formatos = ", ".join(f"{n}×{f}" for f, n in r.formatos().items())
+            s = f"{r.material or '?'} e{r.espesor:g}: {len(r.chapas)} chapas ({formatos}) · {100.0 * r.aprovechamiento:.1f} %"
+        else:
+            s = f"{r.material or '?'} e{r.espesor:g}: sin chapas"
+        if r.no_caben:
+            s += f" · NO CABEN: {', '.join(sorted(set(r.no_caben)))}"
+        lineas.append(s)
+    return lineas
+
+
+def main(argv=None) -> int:
+    """python -m engine.nesting PEDIDO_ID [PEDIDO_ID ...] [--formato 3000x1500 ...]"""
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m engine.nesting")
+    ap.add_argument("pedidos", type=int, nargs="+")
+    ap.add_argument("--formato", action="append", help="ancho x alto en mm (repetible)")
+    args = ap.parse_args(argv)
+    formatos = (
+        tuple(tuple(float(v) for v in f.lower().split("x")) for f in args.formato)
+        if args.formato else FORMATOS_CHAPA_MM
+    )
+
+    from utils.db import connect
+
+    con = connect()
+    try:
+        res = anidar_pedidos(con, args.pedidos, formatos)
+    finally:
+        con.close()
+    for linea in texto_informe(res):
+        print(linea)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+# engine/potencia.py
+"""
+Potencia y par de accionamiento (criterio ISO 7119 / DIN 15262) y preselección de
+motorreductor.
+
+    P_H  = Q · L · λ / 367          (transporte horizontal, kW; Q en t/h, L en m)
+    P_N  = D · L / 20               (en vacío, kW; D = Ø espira en m)
+    P_St = Q · H / 367              (elevación, kW; H = L · sen(ángulo), solo de SUBIDA)
+    P    = (P_H + P_N + P_St) / η   (η de la transmisión según tipo_disposicion)
+    M    = 9550 · P / n             (N·m)
+
+El catálogo de motorreductores (data/motorreductores.json) se puntúa entero con
+NumPy: cumple potencia, par con factor de servicio y rpm dentro de tolerancia; se
+ordena por sobredimensionado, desvío de velocidad y precio.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from engine.capacidad import capacidad_definiciones
+from utils.catalog_model import parse_num
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOTORREDUCTORES_JSON = os.path.join(BASE_DIR, "data", "motorreductores.json")
+
+# Factor de material λ (resistencia al avance) por clase (AJUSTABLE)
+LAMBDA_CLASES: Tuple[Tuple[str, float], ...] = (
+    ("Ligero (cereal, harina)", 1.2),
+    ("Medio (carbón, sal)", 2.0),
+    ("Pesado / abrasivo (arena, cemento, ceniza)", 4.0),
+)
+LAMBDA_DEFECTO = 2.0
+
+# Rendimiento de la transmisión por disposición del motor (catálogo tipo_disposicion)
+RENDIMIENTO_DISPOSICION: Dict[str, float] = {
+    "Directo": 1.0,
+    "Con acoplamiento": 0.98,
+    "Con cadena": 0.93,
+    "Con correa": 0.95,
+}
+FACTOR_SERVICIO_DEFECTO = 1.25
+TOLERANCIA_RPM = 0.15
+
+
+def potencia(q_th, longitud_m, de_mm, angulo_deg=0.0, lambda_=LAMBDA_DEFECTO, subida=True,
+             rendimiento=1.0) -> Dict[str, np.ndarray]:
+    """Potencias parciales y total (kW), vectorizado por broadcasting."""
+    q = np.asarray(q_th, dtype=float)
+    L = np.asarray(longitud_m, dtype=float)
+    h = L * np.sin(np.radians(np.abs(np.asarray(angulo_deg, dtype=float))))
+    h = np.where(np.asarray(subida, dtype=bool), h, 0.0)
+
+    p_h = q * L * np.asarray(lambda_, dtype=float) / 367.0
+    p_n = np.asarray(de_mm, dtype=float) / 1000.0 * L / 20.0
+    p_st = q * h / 367.0
+    return {
+        "p_h_kw": p_h,
+        "p_n_kw": p_n,
+        "p_st_kw": p_st,
+        "p_kw": (p_h + p_n + p_st) / np.asarray(rendimiento, dtype=float),
+    }
+
+
+def par_nm(p_kw, rpm) -> np.ndarray:
+    return 9550.0 * np.asarray(p_kw, dtype=float) / np.asarray(rpm, dtype=float)
+
+
+# ------------------ catálogo de motorreductores ------------------
+
+class Motorreductores:
+    """Catálogo en columnas NumPy (kw, rpm, par, fs, precio) + refs/nombres."""
+
+    __slots__ = ("refs", "names", "kw", "rpm", "par", "fs", "precio")
+
+    def __init__(self, items: List[Mapping[str, Any]]):
+        items = [it for it in items if parse_num(it.get("kw")) and parse_num(it.get("rpm"))]
+        self.refs = [str(it.get("ref") or it.get("name")) for it in items]
+        self.names = [str(it.get("name") or it.get("ref")) for it in items]
+
+        def col(k, defecto):
+            return np.array([parse_num(it.get(k)) or defecto for it in items], dtype=float)
+
+        self.kw = col("kw", 0.0)
+        self.rpm = col("rpm", 0.0)
+        self.par = np.where(col("par", 0.0) > 0, col("par", 0.0), par_nm(self.kw, np.maximum(self.rpm, 1e-9)))
+        self.fs = col("fs", 1.0)
+        self.precio = col("precio", 0.0)
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+
+_CATALOGOS: Dict[str, Tuple[Tuple[int, int], Motorreductores]] = {}
+_CATALOGOS_LOCK = threading.Lock()
+
+
+def cargar_motorreductores(path: str = MOTORREDUCTORES_JSON) -> Motorreductores:
+    """Catálogo compartido; solo se relee si cambia el fichero (mtime/tamaño)."""
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return Motorreductores([])
+    firma = (st.st_mtime_ns, st.st_size)
+    with _CATALOGOS_LOCK:
+        hit = _CATALOGOS.get(key)
+        if hit is not None and hit[0] == firma:
+            return hit[1]
+        with open(key, "r", encoding="utf-8") as f:
+            cat = Motorreductores(json.load(f))
+        _CATALOGOS[key] = (firma, cat)
+        return cat
+
+
+def seleccionar_motorreductor(
+    p_kw: float,
+    par: float,
+    rpm: float,
+    catalogo: Optional[Motorreductores] = None,
+    fs: float = FACTOR_SERVICIO_DEFECTO,
+    tol_rpm: float = TOLERANCIA_RPM,
+    limit: Optional[int] = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Motorreductores que cumplen (kW >= P, par·fs_cat >= M·fs, |Δrpm| <= tol), mejor primero.
+    Puntuación = kW/P (sobredimensionado) + 2·|Δrpm|/rpm; a igualdad, más barato.
+    """
+    cat = catalogo if catalogo is not None else cargar_motorreductores()
+    if not len(cat) or not p_kw or not rpm or p_kw <= 0 or rpm <= 0:
+        return []
+    desvio = np.abs(cat.rpm - rpm) / rpm
+    ok = (cat.kw >= p_kw) & (cat.par * cat.fs >= par * fs) & (desvio <= tol_rpm)
+    idx = np.flatnonzero(ok)
+    if not len(idx):
+        return []
+    score = cat.kw[idx] / p_kw + 2.0 * desvio[idx]
+    orden = idx[np.lexsort((cat.precio[idx], score))]
+    if limit is not None:
+        orden = orden[:limit]
+    return [
+        {
+            "ref": cat.refs[i],
+            "name": cat.names[i],
+            "kw": float(cat.kw[i]),
+            "rpm": float(cat.rpm[i]),
+            "par": float(cat.par[i]),
+            "fs": float(cat.fs[i]),
+            "precio": float(cat.precio[i]),
+            "holgura_par": float(cat.par[i] * cat.fs[i] / (par * fs)) if par > 0 else None,
+        }
+        for i in orden
+    ]
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+def _datos(definicion: Mapping[str, Any]) -> Tuple[float, float, float, float, float, float, bool]:
+    g = definicion.get
+    lt = parse_num(g("longitud_entre_testeros"))
+    lam = parse_num(g("factor_material"))
+    return (
+        np.nan if lt is None else lt / 1000.0,
+        parse_num(g("diam_espira")) or np.nan,
+        parse_num(g("angulo_inclinacion_deg")) or 0.0,
+        LAMBDA_DEFECTO if lam is None else lam,
+        RENDIMIENTO_DISPOSICION.get(str(g("tipo_disposicion") or "").strip(), 1.0),
+        parse_num(g("rpm")) or np.nan,
+        str(g("sentido_material") or "SUBIDA").strip().upper() != "BAJADA",
+    )
+
+
+def potencia_definiciones(definiciones: List[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """Potencia y par de muchas definiciones en una evaluación (capacidad incluida)."""
+    cap = capacidad_definiciones(definiciones)
+    if not definiciones:
+        return {k: np.empty(0) for k in ("p_h_kw", "p_n_kw", "p_st_kw", "p_kw", "par_nm", "q_th")}
+    a = np.array([_datos(d) for d in definiciones], dtype=float)
+    L, de, ang, lam, eta, rpm, subida = a.T
+    r = potencia(cap["q_th"], L, de, ang, lam, subida.astype(bool), eta)
+    r["par_nm"] = par_nm(r["p_kw"], rpm)
+    r["q_th"] = cap["q_th"]
+    return r
+
+
+def _opt(x) -> Optional[float]:
+    x = float(x)
+    return None if np.isnan(x) else x
+
+
+def potencia_definicion(definicion: Mapping[str, Any], limit: Optional[int] = 10) -> Dict[str, Any]:
+    """Potencia, par y motorreductores propuestos para un sinfín (None si faltan datos)."""
+    r = potencia_definiciones([definicion])
+    out: Dict[str, Any] = {k: _opt(v[0]) for k, v in r.items()}
+    rpm = parse_num(definicion.get("rpm"))
+    out["motorreductores"] = (
+        seleccionar_motorreductor(out["p_kw"], out["par_nm"], rpm, limit=limit)
+        if out["p_kw"] is not None and out["par_nm"] is not None else []
+    )
+    return out
+
+
+def potencia_pedido(con, pedido_id: int, limit: int = 3) -> Dict[int, Dict[str, Any]]:
+    """{sinfin_id: potencia + motorreductores} para todo el pedido (una consulta)."""
+    from utils.db import list_sinfines_definiciones
+
+    filas = list_sinfines_definiciones(con, pedido_id)
+    r = potencia_definiciones([d for _, _, d in filas])
+    cat = cargar_motorreductores()
+    out: Dict[int, Dict[str, Any]] = {}
+    for i, (sid, _nombre, d) in enumerate(filas):
+        fila: Dict[str, Any] = {k: _opt(v[i]) for k, v in r.items()}
+        fila["motorreductores"] = (
+            seleccionar_motorreductor(fila["p_kw"], fila["par_nm"], parse_num(d.get("rpm")), cat, limit=limit)
+            if fila["p_kw"] is not None and fila["par_nm"] is not None else []
+        )
+        out[sid] = fila
+    return out
+
+
+def texto_potencia(r: Mapping[str, Any]) -> str:
+    """"3.2 kW · 510 N·m" para la UI ("" si no se puede calcular)."""
+    if r.get("p_kw") is None:
+        return ""
+    s = f"{r['p_kw']:.2f} kW"
+    if r.get("par_nm") is not None:
+        s += f" · {r['par_nm']:.0f} N·m"
+    return s
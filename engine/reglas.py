@@ -0,0 +1,80 @@
+# engine/reglas.py
+"""
+Reglas de diseño sobre números ya parseados (mm). Funciones puras: sin catálogos,
+sin Tk y sin E/S. Lo que depende del catálogo de tubos está en
+utils.catalog_model (Compatibilidad, TuboIndex).
+"""
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Tuple
+
+# Inventor: el largo del tubo en el dibujo no es la distancia entre testeros
+HOLGURA_MANGONES_INVENTOR_MM = 100.0   # 50 + 50
+ESPESOR_TESTERO_DEFECTO_MM = 10.0
+
+# Ventana de inspección: referencia por Ø camisa (OD) -> tabla por rangos (AJUSTABLE)
+VENTANAS_INSPECCION: Tuple[Tuple[float, str], ...] = (
+    (150.0, "VI-150"),
+    (250.0, "VI-250"),
+    (400.0, "VI-400"),
+)
+VENTANA_INSPECCION_MAX = "VI-500"
+
+CJTO_INTERMEDIO_PENDIENTE = "CJTO-INTERMEDIO (pendiente datos)"
+
+
+def ref_ventana_inspeccion(od_camisa: Optional[float]) -> str:
+    """Referencia de ventana de inspección para el Ø exterior de camisa ("" sin dato)."""
+    if od_camisa is None:
+        return ""
+    for limite, ref in VENTANAS_INSPECCION:
+        if od_camisa <= limite:
+            return ref
+    return VENTANA_INSPECCION_MAX
+
+
+def ref_cjto_intermedio(od_camisa: Optional[float], d_mangon: Optional[float]) -> str:
+    """Referencia del conjunto de sujeción de mangón intermedio."""
+    if od_camisa is None or d_mangon is None:
+        return CJTO_INTERMEDIO_PENDIENTE
+    return f"CJTO-OD{od_camisa:.0f}-DM{d_mangon:.0f}"
+
+
+def longitud_total_exterior(
+    long_testeros: Optional[float],
+    mangon_ext_conduccion: Optional[float],
+    mangon_ext_conducido: Optional[float],
+) -> Tuple[Optional[float], List[str]]:
+    """
+    Largo total exterior = entre testeros + mangón exterior conducción + conducido.
+    Devuelve (total, faltan): total None si falta algún dato (faltan = nombres de campo).
+    """
+    faltan = []
+    if long_testeros is None:
+        faltan.append("Longitud entre testeros")
+    if mangon_ext_conduccion is None:
+        faltan.append("Longitud exterior mangón conducción")
+    if mangon_ext_conducido is None:
+        faltan.append("Longitud exterior mangón conducido")
+    if faltan:
+        return None, faltan
+    return long_testeros + mangon_ext_conduccion + mangon_ext_conducido, faltan
+
+
+def longitud_inventor(long_testeros: float, espesor_testero: float = ESPESOR_TESTERO_DEFECTO_MM) -> float:
+    """Largo del tubo en Inventor: L_app - 2·testero - holgura de mangones."""
+    return long_testeros - 2.0 * espesor_testero - HOLGURA_MANGONES_INVENTOR_MM
+
+
+def num_espiras(largo: float, paso: float) -> int:
+    """Espiras completas que caben en `largo` con el paso dado."""
+    if paso <= 0:
+        raise ValueError(f"Paso no válido: {paso!r}")
+    return int(math.floor(largo / paso))
+
+
+# Barrido de diseño (engine.barrido): comprobaciones de geometría (AJUSTABLES)
+ALTURA_ESPIRA_MIN_MM = 10.0     # (Ø espira - Ø eje) / 2
+PASO_REL_MIN = 0.5              # paso / Ø espira: medio paso ...
+PASO_REL_MAX = 1.5              # ... hasta paso largo (estándar = 1.0)
@@ -0,0 +1,241 @@
+# engine/rodamientos.py
+"""
+Vida nominal L10h de los rodamientos (ISO 281) con las cargas del eje, y orden de
+los candidatos por vida y coste en una sola pasada vectorizada.
+
+Cargas en los apoyos extremos (engine.estructura, vano extremo):
+    Fr = peso del vano · g / 2 · cos(ángulo)
+    Fa = empuje del material 2·M / (Dm·tan(α + ρ)) + peso total · g · sen(ángulo)
+         (solo en conducción: es el apoyo fijo; el conducido es libre)
+
+Rodamientos de rodillos a rótula (serie 222/223 E):
+    P   = Fr + Y1·Fa          si Fa/Fr <= e
+    P   = 0.67·Fr + Y2·Fa     si Fa/Fr >  e
+    L10h = 10⁶ / (60·n) · (C / P)^(10/3)
+    s0  = C0 / (Fr + Y0·Fa)
+
+Cumple si L10h >= L10H_OBJETIVO y s0 >= S0_MIN. Orden: los que cumplen primero,
+del más barato al más caro (coste = volumen de acero π/4·(D² − d²)·B: el catálogo no
+trae precios), y luego el resto por vida decreciente.
+"""
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.estructura import G_M_S2, comprobar_eje_definicion
+from utils.catalog_model import CatalogModel, Rodamiento, parse_num
+
+# Rodillos a rótula: factores orientativos (AJUSTABLES por serie si el proveedor los da)
+EXPONENTE_VIDA = 10.0 / 3.0
+E_AXIAL = 0.27
+Y1 = 2.5
+Y2 = 3.7
+Y0 = 2.5
+
+L10H_OBJETIVO = 20000.0      # h, servicio continuo
+S0_MIN = 1.5
+ROZAMIENTO_MATERIAL = 0.4    # μ material-espira -> ρ = atan(μ)
+
+
+class TablaRodamientos:
+    """Columnas NumPy (d, D, B, C, C0 en kN, coste en cm³ de acero) de una lista de rodamientos."""
+
+    __slots__ = ("names", "pos", "d", "D", "B", "C", "C0", "coste")
+
+    def __init__(self, rodamientos: Sequence[Rodamiento]):
+        self.names = [r.name for r in rodamientos]
+        self.pos: Dict[str, int] = {}
+        for i, n in enumerate(self.names):
+            self.pos.setdefault(n, i)
+
+        def col(attr):
+            return np.array([getattr(r, attr) if getattr(r, attr) is not None else np.nan for r in rodamientos],
+                            dtype=float)
+
+        self.d = col("d")
+        self.D = col("D")
+        self.B = col("B")
+        self.C = col("C")
+        self.C0 = col("C0")
+        self.coste = np.pi / 4.0 * (self.D ** 2 - self.d ** 2) * self.B / 1000.0      # cm³
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@lru_cache(maxsize=8)
+def tabla_catalogo(rodamientos: Tuple[Rodamiento, ...]) -> TablaRodamientos:
+    """Tabla de todo el catálogo (una vez por modelo)."""
+    return TablaRodamientos(rodamientos)
+
+
+def vida(tabla: TablaRodamientos, fr_n: float, fa_n: float, rpm: float) -> Dict[str, np.ndarray]:
+    """Carga equivalente P (N), L10h (h) y s0 de todos los rodamientos de la tabla."""
+    fr = max(float(fr_n), 0.0)
+    fa = max(float(fa_n), 0.0)
+    if fr > 0 and fa / fr <= E_AXIAL:
+        p = fr + Y1 * fa
+    else:
+        p = 0.67 * fr + Y2 * fa
+    p0 = fr + Y0 * fa
+    with np.errstate(divide="ignore", invalid="ignore"):
+        l10h = 1e6 / (60.0 * rpm) * (tabla.C * 1000.0 / p) ** EXPONENTE_VIDA if p > 0 and rpm > 0 \
+            else np.full(len(tabla), np.inf)
+        s0 = tabla.C0 * 1000.0 / p0 if p0 > 0 else np.full(len(tabla), np.inf)
+    l10h = np.where(np.isnan(tabla.C), np.nan, l10h)
+    s0 = np.where(np.isnan(tabla.C0), np.nan, s0)
+    return {"p_n": np.full(len(tabla), p), "l10h": l10h, "s0": s0}
+
+
+def ranking(tabla: TablaRodamientos, idx: np.ndarray, fr_n: float, fa_n: float, rpm: float) -> Dict[str, np.ndarray]:
+    """
+    Ordena las posiciones idx de la tabla: cumplen (más baratos primero), después el
+    resto por vida decreciente y al final los que no tienen C/C0 (en su orden).
+    """
+    v = vida(tabla, fr_n, fa_n, rpm)
+    l10h = v["l10h"][idx]
+    s0 = v["s0"][idx]
+    ok = (l10h >= L10H_OBJETIVO) & (s0 >= S0_MIN)
+    sin_dato = np.isnan(l10h)
+    grupo = np.where(ok, 0, np.where(sin_dato, 2, 1))
+    clave_ok = np.where(ok, tabla.coste[idx], 0.0)
+    clave_vida = np.where(ok | sin_dato, 0.0, -np.nan_to_num(l10h))
+    orden = np.lexsort((np.arange(len(idx)), clave_vida, clave_ok, grupo))
+    return {"idx": idx[orden], "l10h": l10h[orden], "s0": s0[orden], "ok": ok[orden]}
+
+
+def _tabla(nombres: Optional[Iterable[str]], catalogs: Optional[Mapping[str, Any]]) -> Tuple[TablaRodamientos, np.ndarray]:
+    if catalogs is None:
+        from utils.catalogs import get_catalogs
+
+        catalogs = get_catalogs()
+    store = catalogs.get("_store")
+    if store is not None:
+        # SQLite: los rodamientos no están en memoria; solo se leen los candidatos
+        rods = [r for r in (store.rodamiento(n) for n in (nombres or store.rodamientos_todos())) if r is not None]
+        t = TablaRodamientos(rods)
+        return t, np.arange(len(t))
+
+    from utils.catalogs import catalog_model
+
+    t = tabla_catalogo(catalog_model(catalogs).rodamientos)
+    if nombres is None:
+        return t, np.array(sorted(set(t.pos.values())), dtype=int)
+    return t, np.array([t.pos[n] for n in nombres if n in t.pos], dtype=int)
+
+
+def ordenar_rodamientos(
+    nombres: Optional[Iterable[str]],
+    fr_n: float,
+    fa_n: float,
+    rpm: float,
+    catalogs: Optional[Mapping[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """[{name, l10h, s0, ok, coste}] de los candidatos (None = todo el catálogo), mejor primero."""
+    t, idx = _tabla(list(nombres) if nombres is not None else None, catalogs)
+    if not len(idx):
+        return []
+    r = ranking(t, idx, fr_n, fa_n, rpm)
+    return [
+        {
+            "name": t.names[i],
+            "l10h": None if np.isnan(h) else float(h),
+            "s0": None if np.isnan(s) else float(s),
+            "ok": bool(ok),
+            "coste": float(t.coste[i]),
+        }
+        for i, h, s, ok in zip(r["idx"], r["l10h"], r["s0"], r["ok"])
+    ]
+
+
+# ------------------ cargas desde la definición ------------------
+
+def empuje_axial_n(par_nm: float, de_mm: float, eje_mm: float, paso_mm: float,
+                   mu: float = ROZAMIENTO_MATERIAL) -> float:
+    """Empuje del material sobre la espira (N) para el par de accionamiento."""
+    dm = (de_mm + eje_mm) / 2.0 / 1000.0
+    if dm <= 0 or paso_mm <= 0:
+        return 0.0
+    alfa = math.atan(paso_mm / 1000.0 / (math.pi * dm))
+    return 2.0 * par_nm / (dm * math.tan(alfa + math.atan(mu)))
+
+
+def cargas_apoyos(
+    definicion: Mapping[str, Any],
+    model: Optional[CatalogModel] = None,
+    par_nm: Optional[float] = None,
+) -> Optional[Dict[str, float]]:
+    """{"fr_conduccion","fa_conduccion","fr_conducido","fa_conducido"} en N (None sin datos)."""
+    if par_nm is None:
+        from engine.potencia import potencia_definiciones
+
+        par = float(potencia_definiciones([definicion])["par_nm"][0])
+        par_nm = None if np.isnan(par) else par
+    eje = comprobar_eje_definicion(definicion, model, par_nm=par_nm or 0.0)
+    fila = eje["tubo"]
+    if fila is None:
+        return None
+
+    g = definicion.get
+    ang = math.radians(abs(parse_num(g("angulo_inclinacion_deg")) or 0.0))
+    peso_vano = fila["peso_vano_kg"] * G_M_S2
+    peso_total = fila["kg_m_total"] * (parse_num(g("longitud_entre_testeros")) or 0.0) / 1000.0 * G_M_S2
+    pasos = [p for p in (parse_num(g(k)) for k in ("paso1", "paso2", "paso3")) if p]
+    fa = empuje_axial_n(par_nm or 0.0, parse_num(g("diam_espira")) or 0.0, fila["od"], min(pasos)) \
+        + peso_total * math.sin(ang)
+    fr = peso_vano / 2.0 * math.cos(ang)
+    return {"fr_conduccion": fr, "fa_conduccion": fa, "fr_conducido": fr, "fa_conducido": 0.0}
+
+
+def rodamientos_definicion(
+    definicion: Mapping[str, Any],
+    catalogs: Optional[Mapping[str, Any]] = None,
+    nombres: Optional[Iterable[str]] = None,
+    par_nm: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    {"cargas": ..., "conduccion": [...], "conducido": [...]} con los candidatos
+    (por defecto los compatibles con el tubo eje) ordenados por vida y coste.
+    Sin cargas o sin rpm las listas quedan vacías.
+    """
+    if catalogs is None:
+        from utils.catalogs import get_catalogs
+
+        catalogs = get_catalogs()
+    from utils.catalogs import catalog_model, filter_rodamientos_por_tubo
+
+    g = definicion.get
+    if nombres is None:
+        nombres = filter_rodamientos_por_tubo(catalogs, str(g("eje_od") or ""), str(g("eje_thk") or ""))
+    nombres = list(nombres)
+    rpm = parse_num(g("rpm"))
+    cargas = cargas_apoyos(definicion, catalog_model(catalogs), par_nm)
+    if cargas is None or not rpm:
+        return {"cargas": cargas, "conduccion": [], "conducido": []}
+    return {
+        "cargas": cargas,
+        "conduccion": ordenar_rodamientos(nombres, cargas["fr_conduccion"], cargas["fa_conduccion"], rpm, catalogs),
+        "conducido": ordenar_rodamientos(nombres, cargas["fr_conducido"], cargas["fa_conducido"], rpm, catalogs),
+    }
+
+
+def rodamientos_pedido(con, pedido_id: int, catalogs: Optional[Mapping[str, Any]] = None) -> Dict[int, Dict[str, Any]]:
+    """{sinfin_id: rodamientos_definicion} de todo el pedido (una consulta)."""
+    from utils.db import list_sinfines_definiciones
+
+    return {sid: rodamientos_definicion(d, catalogs) for sid, _nombre, d in list_sinfines_definiciones(con, pedido_id)}
+
+
+def texto_vida(fila: Optional[Mapping[str, Any]]) -> str:
+    """"L10h 48 000 h · s0 6.1 · OK" para la UI ("" sin datos)."""
+    if not fila or fila.get("l10h") is None:
+        return ""
+    h = fila["l10h"]
+    txt = f"L10h {h:,.0f} h".replace(",", " ") if np.isfinite(h) else "L10h ∞"
+    if fila.get("s0") is not None and np.isfinite(fila["s0"]):
+        txt += f" · s0 {fila['s0']:.1f}"
+    return txt + (" · OK" if fila.get("ok") else " · NO CUMPLE")
@@ -0,0 +1,123 @@
+# engine/sinfin.py
+"""
+Valores derivados de una definición de sinfín (el dict que guarda SinfinWindow).
+
+    d = calcular({"eje_od": "60.3", "eje_thk": "2.6", "diam_espira": "200", ...})
+    d["mangon"], d["metrica_tornillos"], d["camisa_tubo"], d["num_espiras"]
+
+Entradas como texto (coma decimal admitida); salidas numéricas o None si falta el
+dato. Con el modelo de catálogo ya cargado cada llamada son unos microsegundos
+(lookups por hash / bisect).
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Mapping, Optional
+
+from engine.catalogo import modelo_catalogo
+from engine.reglas import (
+    ESPESOR_TESTERO_DEFECTO_MM,
+    longitud_inventor,
+    longitud_total_exterior,
+    num_espiras,
+    ref_cjto_intermedio,
+    ref_ventana_inspeccion,
+)
+from engine.tornilleria import metrica_definicion
+from utils.catalog_model import CAMISA_HOLGURA_MM, CatalogModel, Tubo, parse_num
+
+
+def _si(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("sí", "si", "true", "1")
+
+
+def camisa_para_espira(model: CatalogModel, diam_espira: Optional[float]) -> Optional[Tubo]:
+    """Tubo camisa 002A: el menor ID >= Ø espira + holgura (si ninguno, el de mayor ID)."""
+    if diam_espira is None:
+        return None
+    return model.tubo_index.camisa(diam_espira, CAMISA_HOLGURA_MM)
+
+
+def calcular(
+    definicion: Mapping[str, Any],
+    model: Optional[CatalogModel] = None,
+    catalogs: Optional[Mapping[str, Any]] = None,
+    par_nm: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Todos los valores derivados de la definición (ver claves en el cuerpo).
+    par_nm: par de accionamiento para la tornillería (si no se da, sale de engine.potencia).
+    """
+    model = modelo_catalogo(model)
+    g = definicion.get
+    out: Dict[str, Any] = {}
+
+    # --- Tubo eje: fila de la matriz de compatibilidad ---
+    row = model.compat(g("eje_od"), g("eje_thk"))
+    ok = row is not None and row.mecanizado_ok
+    out["eje_id"] = row.id if row is not None else None
+    out["mecanizado_ok"] = ok
+    out["rodamientos"] = row.rodamientos if row is not None else ()
+    out["tubo_int"] = row.tubo_int if ok else None
+    out["mangon_stock"] = row.mangon_stock if ok else None
+    out["mangon"] = row.mangon if ok else None
+    # tornillería por par (la misma función que usa la ventana); sin métrica que cumpla, regla M12
+    torn = metrica_definicion(definicion, catalogs, par_nm) if ok else None
+    out["metrica_tornillos"] = torn["texto"] if torn is not None else None
+    out["tornillos_ok"] = torn["ok"] if torn is not None else None
+
+    # --- Camisa 002A ---
+    de = model.valor("diam_espira", g("diam_espira"))
+    camisa = camisa_para_espira(model, de)
+    out["camisa_od"] = camisa.od if camisa is not None else None
+    out["camisa_id"] = camisa.id if camisa is not None else None
+    out["camisa_thk"] = camisa.thk if camisa is not None else None
+    out["camisa_tubo"] = f"{camisa.od:.1f} / {camisa.id:.1f}" if camisa is not None else ""
+    out["plano_testeros_eje"] = model.planos.codigo(row.tubo.od, row.tubo.thk) if row is not None else ""
+    out["plano_testeros_camisa"] = model.planos.codigo(camisa.od, camisa.thk) if camisa is not None else ""
+
+    lleva_vi = g("002A_vi_lleva", g("002A_ventana_inspeccion"))
+    out["ventana_inspeccion_ref"] = ref_ventana_inspeccion(out["camisa_od"]) if _si(lleva_vi) else ""
+
+    if g("mangones_intermedios"):
+        dm = parse_num(g("mangon_conduccion"))
+        out["cjto_intermedio_ref"] = ref_cjto_intermedio(out["camisa_od"], dm if dm is not None else out["mangon"])
+    else:
+        out["cjto_intermedio_ref"] = ""
+
+    # --- Longitudes ---
+    lt = parse_num(g("longitud_entre_testeros"))
+    total, faltan = longitud_total_exterior(
+        lt, parse_num(g("mangon_ext_conduccion")), parse_num(g("mangon_ext_conducido"))
+    )
+    out["longitud_total_ext"] = total
+    out["faltan_longitud"] = faltan
+
+    # --- Inventor ---
+    paso = parse_num(g("paso1", g("paso_espira")))
+    testero = parse_num(g("espesor_testero", g("002A_testeros")))
+    testero = testero if testero is not None else ESPESOR_TESTERO_DEFECTO_MM
+    if lt is not None:
+        out["longitud_inventor"] = longitud_inventor(lt, testero)
+        out["num_espiras"] = num_espiras(out["longitud_inventor"], paso) if paso and paso > 0 else None
+    else:
+        out["longitud_inventor"] = None
+        out["num_espiras"] = None
+    return out
+
+
+def calcular_pedido(con, pedido_id: int, model: Optional[CatalogModel] = None) -> Dict[int, Dict[str, Any]]:
+    """{sinfin_id: calcular(definicion)} de todos los sinfines del pedido (una consulta)."""
+    from utils.db import list_sinfines_definiciones
+
+    from engine.potencia import potencia_definiciones
+
+    model = modelo_catalogo(model)
+    filas = list_sinfines_definiciones(con, pedido_id)
+    pares = potencia_definiciones([d for _, _, d in filas])["par_nm"]
+    return {
+        sid: calcular(d, model, par_nm=0.0 if math.isnan(p) else float(p))
+        for (sid, _nombre, d), p in zip(filas, pares)
+    }
@@ -0,0 +1,185 @@
+# engine/tornilleria.py
+"""
+Tornillos pasantes de la unión tubo eje – mangón: cortadura y aplastamiento frente al
+par de accionamiento (criterio EN 1993-1-8, tornillo 8.8 y tubo S355).
+
+Cada tornillo atraviesa el tubo y el mangón: dos planos de corte en la pared
+interior del tubo, separados el Ø interior (ID). Con n tornillos por unión:
+
+    F (por plano)  = M_d / (n · ID)             M_d = M · FACTOR_PAR_ARRANQUE
+    cortadura      F <= A · TAU_ADM_MPA         A = π·d²/4
+    aplastamiento  F <= d · e_tubo · APLASTAMIENTO_ADM_MPA
+
+Las capacidades por métrica (N por plano y N por mm de pared) se precalculan una
+vez por catálogo de métricas; la comprobación al editar es un producto y un
+argmax sobre la tabla. Sin par conocido queda la métrica mínima de taller (M12).
+Largo: ID + holgura proporcional a la métrica (M12 -> +25, la regla de siempre),
+redondeado a 5 por arriba.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_model import TORNILLO_HOLGURA_MM, TORNILLO_METRICA, ceil_to_5, parse_num
+
+FUB_MPA = 800.0                 # tornillo 8.8
+FU_TUBO_MPA = 490.0             # S355
+GAMMA_M2 = 1.25
+TAU_ADM_MPA = 0.6 * FUB_MPA / GAMMA_M2
+ALFA_APLASTAMIENTO = 0.5        # distancias a borde reducidas en tubo (AJUSTABLE)
+APLASTAMIENTO_ADM_MPA = 2.5 * ALFA_APLASTAMIENTO * FU_TUBO_MPA / GAMMA_M2
+
+TORNILLOS_POR_UNION = 2
+FACTOR_PAR_ARRANQUE = 2.0       # par de arranque / nominal
+DIAM_REL_MAX = 0.35             # agujero <= 35 % del ID (no debilitar el mangón)
+METRICA_MIN_MM = 12.0           # estándar de taller: no se baja de M12 (AJUSTABLE)
+METRICA_REFERENCIA_MM = 12.0    # TORNILLO_HOLGURA_MM está definida para M12
+
+METRICAS_DEFECTO = ("M8", "M10", "M12", "M14", "M16", "M18", "M20", "M22", "M24", "M27", "M30")
+
+
+def diametro_metrica(texto: Any) -> Optional[float]:
+    """"M16" -> 16.0 (None si no es una métrica)."""
+    s = str(texto or "").strip().upper()
+    return parse_num(s[1:]) if s.startswith("M") else None
+
+
+class TablaMetricas:
+    """Capacidades por métrica, ordenadas de menor a mayor Ø."""
+
+    __slots__ = ("textos", "d", "cortante_n", "aplastamiento_n_mm")
+
+    def __init__(self, metricas: Iterable[Any]):
+        pares = sorted(
+            {(d, str(m).strip().upper()) for m in metricas if (d := diametro_metrica(m))},
+        )
+        self.textos = tuple(m for _, m in pares)
+        self.d = np.array([d for d, _ in pares], dtype=float)
+        self.cortante_n = np.pi / 4.0 * self.d ** 2 * TAU_ADM_MPA
+        self.aplastamiento_n_mm = self.d * APLASTAMIENTO_ADM_MPA
+
+    def __len__(self) -> int:
+        return len(self.textos)
+
+
+@lru_cache(maxsize=8)
+def tabla_metricas(metricas: Tuple[str, ...] = METRICAS_DEFECTO) -> TablaMetricas:
+    return TablaMetricas(metricas)
+
+
+def capacidad_par_nm(tabla: TablaMetricas, id_mm: float, thk_mm: float, n: int = TORNILLOS_POR_UNION) -> np.ndarray:
+    """Par admisible (N·m) de la unión con cada métrica (0 si el agujero es demasiado grande)."""
+    por_plano = np.minimum(tabla.cortante_n, tabla.aplastamiento_n_mm * thk_mm)
+    cap = n * id_mm * por_plano / 1000.0
+    return np.where(tabla.d <= DIAM_REL_MAX * id_mm, cap, 0.0)
+
+
+def largo_tornillo(id_mm: float, d_mm: float) -> int:
+    return ceil_to_5(id_mm + TORNILLO_HOLGURA_MM * d_mm / METRICA_REFERENCIA_MM)
+
+
+def seleccionar_tornillo(
+    par_nm: float,
+    id_mm: float,
+    thk_mm: float,
+    tabla: Optional[TablaMetricas] = None,
+    n: int = TORNILLOS_POR_UNION,
+    factor: float = FACTOR_PAR_ARRANQUE,
+) -> Optional[Dict[str, Any]]:
+    """Menor métrica que cumple (None si ninguna): metrica, largo, texto "M16x90", utilizacion."""
+    tabla = tabla if tabla is not None else tabla_metricas()
+    if not len(tabla) or id_mm <= 0 or thk_mm <= 0:
+        return None
+    par_d = max(float(par_nm), 0.0) * factor
+    cap = capacidad_par_nm(tabla, id_mm, thk_mm, n)
+    ok = (cap >= par_d) & (tabla.d >= METRICA_MIN_MM)
+    if not ok.any():
+        return None
+    i = int(ok.argmax())
+    largo = largo_tornillo(id_mm, float(tabla.d[i]))
+    return {
+        "metrica": tabla.textos[i],
+        "d": float(tabla.d[i]),
+        "largo": largo,
+        "texto": f"{tabla.textos[i]}x{largo}",
+        "n": n,
+        "capacidad_nm": float(cap[i]),
+        "par_diseno_nm": par_d,
+        "utilizacion": par_d / float(cap[i]) if cap[i] > 0 else None,
+    }
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+def _tabla_de(catalogs: Optional[Mapping[str, Any]]) -> TablaMetricas:
+    if catalogs is None:
+        return tabla_metricas()
+    metricas = tuple(str(m) for m in (catalogs.get("metricas_tornillos") or METRICAS_DEFECTO))
+    return tabla_metricas(metricas)
+
+
+def tornillo_definicion(
+    definicion: Mapping[str, Any],
+    catalogs: Optional[Mapping[str, Any]] = None,
+    par_nm: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Tornillería de la definición con el par de engine.potencia (None si falta tubo o ninguna cumple)."""
+    g = definicion.get
+    od = parse_num(g("eje_od"))
+    thk = parse_num(g("eje_thk"))
+    if od is None or thk is None:
+        return None
+    if par_nm is None:
+        from engine.potencia import potencia_definiciones
+
+        par = float(potencia_definiciones([definicion])["par_nm"][0])
+        par_nm = 0.0 if np.isnan(par) else par
+    return seleccionar_tornillo(par_nm, od - 2.0 * thk, thk, _tabla_de(catalogs))
+
+
+def metrica_definicion(
+    definicion: Mapping[str, Any],
+    catalogs: Optional[Mapping[str, Any]] = None,
+    par_nm: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Lo que se guarda en "metrica_tornillos": tornillo_definicion con "ok": True o, si
+    ninguna métrica aguanta el par, la regla de taller (M12 x ID + 25) con "ok": False.
+    None sin tubo eje.
+    """
+    t = tornillo_definicion(definicion, catalogs, par_nm)
+    if t is not None:
+        return dict(t, ok=True)
+    od = parse_num(definicion.get("eje_od"))
+    thk = parse_num(definicion.get("eje_thk"))
+    if od is None or thk is None or od <= 2.0 * thk:
+        return None
+    largo = largo_tornillo(od - 2.0 * thk, METRICA_REFERENCIA_MM)
+    return {"metrica": TORNILLO_METRICA, "largo": largo, "texto": f"{TORNILLO_METRICA}x{largo}", "ok": False,
+            "utilizacion": None}
+
+
+def texto_tornillos(t: Optional[Mapping[str, Any]]) -> str:
+    """"OK · 45 % del par" / "NO CUMPLE el par de arranque" para la UI ("" sin datos)."""
+    if not t:
+        return ""
+    if not t["ok"]:
+        return "NO CUMPLE el par de arranque (revisar unión)"
+    u = t.get("utilizacion")
+    return "OK" if u is None else f"OK · {100.0 * u:.0f} % del par"
+
+
+def tornillos_pedido(con, pedido_id: int, catalogs: Optional[Mapping[str, Any]] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+    """{sinfin_id: tornillo_definicion} de todo el pedido (una consulta, pares en una evaluación)."""
+    from engine.potencia import potencia_definiciones
+    from utils.db import list_sinfines_definiciones
+
+    filas = list_sinfines_definiciones(con, pedido_id)
+    pares = potencia_definiciones([d for _, _, d in filas])["par_nm"]
+    return {
+        sid: tornillo_definicion(d, catalogs, 0.0 if np.isnan(p) else float(p))
+        for (sid, _nombre, d), p in zip(filas, pares)
+    }
@@ -0,0 +1,152 @@
+# engine/vibracion.py
+"""
+Primera velocidad crítica del eje (flexión) frente a las rpm de trabajo, para todos
+los tubos del catálogo × nº de mangones intermedios a la vez (matriz NumPy).
+
+Cada vano se trata como viga biapoyada uniforme (tubo + espira; el material no se
+suma: amortigua más de lo que pesa):
+
+    ω₁ = (π / L)² · √(E·I / m')      n_c [rpm] = 30 · ω₁ / π
+
+con L = longitud entre testeros / (nº intermedios + 1). Cumple si
+rpm <= SEGURIDAD_VELOCIDAD · n_c. Con la matriz la UI sabe cuántos mangones
+intermedios hacen falta para el tubo elegido (o qué tubo evita ponerlos).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from engine.catalogo import modelo_catalogo
+from engine.estructura import (
+    E_ACERO_MPA,
+    ESPESOR_ESPIRA_DEFECTO_MM,
+    masa_espira_kg_m,
+    num_vanos,
+    secciones,
+)
+from utils.catalog_model import CatalogModel, Tubo, parse_num, tubo_key
+
+SEGURIDAD_VELOCIDAD = 0.7       # rpm de trabajo <= 70 % de la primera crítica (AJUSTABLE)
+INTERMEDIOS_MAX = 6
+
+
+def velocidad_critica(inercia_mm4, kg_m, vano_mm) -> np.ndarray:
+    """Primera crítica (rpm) de un vano biapoyado; vectorizado por broadcasting."""
+    ei = E_ACERO_MPA * 1e6 * np.asarray(inercia_mm4, dtype=float) * 1e-12    # N·m²
+    L = np.asarray(vano_mm, dtype=float) / 1000.0
+    omega = (np.pi / L) ** 2 * np.sqrt(ei / np.asarray(kg_m, dtype=float))
+    return 30.0 * omega / np.pi
+
+
+class Espira(NamedTuple):
+    """Datos de la espira que suman masa al eje (clave de caché con la longitud)."""
+
+    de_mm: float
+    paso_mm: float
+    espesor_mm: float = ESPESOR_ESPIRA_DEFECTO_MM
+
+
+class MapaCritico:
+    """
+    rpm_c[i, n]: primera crítica del tubo i (orden de model.tubos) con n intermedios
+    (n = 0..INTERMEDIOS_MAX).
+    """
+
+    __slots__ = ("tubos", "intermedios", "rpm_c", "_pos")
+
+    def __init__(self, tubos: Tuple[Tubo, ...], intermedios: np.ndarray, rpm_c: np.ndarray):
+        self.tubos = tubos
+        self.intermedios = intermedios
+        self.rpm_c = rpm_c
+        self._pos = {tubo_key(t.od, t.thk): i for i, t in enumerate(tubos)}
+
+    def posicion(self, tubo: Optional[Tubo]) -> Optional[int]:
+        return None if tubo is None else self._pos.get(tubo_key(tubo.od, tubo.thk))
+
+    def cumple(self, rpm: float, seguridad: float = SEGURIDAD_VELOCIDAD) -> np.ndarray:
+        """Matriz booleana tubos × intermedios."""
+        return rpm <= seguridad * self.rpm_c
+
+    def intermedios_necesarios(self, rpm: float, seguridad: float = SEGURIDAD_VELOCIDAD) -> np.ndarray:
+        """Por tubo: mínimo nº de mangones intermedios que cumple (-1 si ni con el máximo)."""
+        ok = self.cumple(rpm, seguridad)
+        return np.where(ok.any(axis=1), ok.argmax(axis=1), -1)
+
+
+@lru_cache(maxsize=128)
+def _mapa(tubos: Tuple[Tubo, ...], longitud_mm: float, espira: Espira, max_intermedios: int) -> MapaCritico:
+    s = secciones(tubos)
+    kg_m = s["kg_m"] + masa_espira_kg_m(espira.de_mm, s["od"], espira.paso_mm, espira.espesor_mm)
+    n = np.arange(max_intermedios + 1)
+    vanos = longitud_mm / (n + 1.0)
+    rpm_c = velocidad_critica(s["inercia_mm4"][:, None], kg_m[:, None], vanos[None, :])
+    return MapaCritico(tubos, n, rpm_c)
+
+
+def mapa_critico(
+    longitud_mm: float,
+    espira: Espira,
+    model: Optional[CatalogModel] = None,
+    max_intermedios: int = INTERMEDIOS_MAX,
+) -> MapaCritico:
+    """Velocidades críticas de todos los tubos × 0..max_intermedios (cacheado)."""
+    espira = Espira(*(round(float(x), 3) for x in espira))
+    return _mapa(modelo_catalogo(model).tubos, round(float(longitud_mm), 1), espira, int(max_intermedios))
+
+
+# ------------------ desde definiciones guardadas ------------------
+
+def critica_definicion(definicion: Mapping[str, Any], model: Optional[CatalogModel] = None) -> Dict[str, Any]:
+    """
+    Para el tubo y la disposición de la definición:
+      rpm_critica, margen (rpm / n_c), ok, intermedios_necesarios (None = ni con el máximo).
+    Todo None si faltan longitud, espira, paso o tubo.
+    """
+    model = modelo_catalogo(model)
+    g = definicion.get
+    vacio = {"rpm_critica": None, "margen": None, "ok": None, "intermedios_necesarios": None}
+    lt = parse_num(g("longitud_entre_testeros"))
+    de = parse_num(g("diam_espira"))
+    pasos = [p for p in (parse_num(g(k)) for k in ("paso1", "paso2", "paso3")) if p]
+    if not lt or not de or not pasos:
+        return vacio
+    espira = Espira(de, min(pasos), parse_num(g("espesor_espira")) or ESPESOR_ESPIRA_DEFECTO_MM)
+    mapa = mapa_critico(lt, espira, model)
+    i = mapa.posicion(model.tubo(g("eje_od"), g("eje_thk")))
+    if i is None:
+        return vacio
+
+    n_act = min(num_vanos(definicion) - 1, INTERMEDIOS_MAX)
+    rpm_c = float(mapa.rpm_c[i, n_act])
+    rpm = parse_num(g("rpm"))
+    out: Dict[str, Any] = {"rpm_critica": rpm_c, "margen": None, "ok": None, "intermedios_necesarios": None}
+    if rpm:
+        out["margen"] = rpm / rpm_c
+        out["ok"] = rpm <= SEGURIDAD_VELOCIDAD * rpm_c
+        nec = int(mapa.intermedios_necesarios(rpm)[i])
+        out["intermedios_necesarios"] = nec if nec >= 0 else None
+    return out
+
+
+def critica_pedido(con, pedido_id: int, model: Optional[CatalogModel] = None) -> Dict[int, Dict[str, Any]]:
+    """{sinfin_id: critica_definicion} de todo el pedido (una consulta)."""
+    from utils.db import list_sinfines_definiciones
+
+    model = modelo_catalogo(model)
+    return {sid: critica_definicion(d, model) for sid, _nombre, d in list_sinfines_definiciones(con, pedido_id)}
+
+
+def texto_critica(r: Mapping[str, Any]) -> str:
+    """"n_c 850 rpm · 7 % · OK · intermedios mín. 0" para la UI ("" sin datos)."""
+    if r.get("rpm_critica") is None:
+        return ""
+    s = f"n_c {r['rpm_critica']:.0f} rpm"
+    if r.get("margen") is None:
+        return s
+    s += f" · {100.0 * r['margen']:.0f} % · {'OK' if r['ok'] else 'NO CUMPLE'}"
+    nec = r.get("intermedios_necesarios")
+    s += f" · intermedios mín. {nec}" if nec is not None else f" · > {INTERMEDIOS_MAX} intermedios"
+    return s
@@ -1,9 +1,10 @@
 import csv
-import math
 from pathlib import Path
 import json
 from pathlib import Path
 
+from engine.reglas import longitud_inventor, num_espiras
+
 
 ILOGIC_DIR = Path(r"C:\edusonros_projects\SINFINES_CONRAD\iLogic")
 CSV_PATH = ILOGIC_DIR / "params.csv"
@@ -55,11 +56,8 @@ def export_params_to_csv(definicion: dict):
     diam_espira = fnum(definicion["diametro_espira"])
     espesor_chapa = fnum(definicion["espesor_chapa"])
 
-    # --- Correcciones industriales ---
-    HOLGURA_MANGONES = 100  # 50 + 50
-
-    L_inventor = L_app - (2 * espesor_testero) - HOLGURA_MANGONES
-    num_espiras = L_inventor / paso
+    # --- Correcciones industriales (engine.reglas: holgura mangones 50 + 50) ---
+    L_inventor = longitud_inventor(L_app, espesor_testero)
 
     params = {
         "Largo": round(L_inventor, 2),
@@ -69,7 +67,7 @@ def export_params_to_csv(definicion: dict):
         "DiametroExteriorEspira": diam_espira,
         "Espesor_Chapa": espesor_chapa,
         "Paso_Espira": paso,
-        "Num_Espiras": int(math.floor(num_espiras)),
+        "Num_Espiras": num_espiras(L_inventor, paso),
         "Mangon_Diametro": 50,
         "Mangon_Longitud": 60,
     }
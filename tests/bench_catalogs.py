@@ -0,0 +1,46 @@
+# tests/bench_catalogs.py
+"""
+Micro-benchmarks de la API de consulta de catálogos (no lo recoge pytest).
+
+    python -m tests.bench_catalogs            # vista compartida (JSON)
+    SINFINES_CATALOGOS=sqlite python -m tests.bench_catalogs
+
+Imprime µs por llamada (mejor de 5 repeticiones). Incluye el filtrado de autocompletado
+sobre 5000 entradas (objetivo: muy por debajo de un frame, 16 ms).
+"""
+import timeit
+
+from utils import catalogs
+from utils.autocomplete import PrefixIndex
+
+CASOS = (
+    ("get_materiales()", lambda: catalogs.get_materiales()),
+    ("get_eje_diametros()", lambda: catalogs.get_eje_diametros()),
+    ("get_tubo_exteriores()", lambda: catalogs.get_tubo_exteriores()),
+    ("get_tubo_espesores(60.3)", lambda: catalogs.get_tubo_espesores(60.3)),
+    ("get_tubo_interior(60.3, 2.6)", lambda: catalogs.get_tubo_interior(60.3, 2.6)),
+    ("get_rodamientos_for_d(55)", lambda: catalogs.get_rodamientos_for_d(55)),
+    ("get_rodamiento_dims('SKF 22211 E')", lambda: catalogs.get_rodamiento_dims("SKF 22211 E")),
+)
+
+_INDICE = PrefixIndex(f"SKF {n} E" for n in range(10000, 15000))
+CASOS_AUTOCOMPLETADO = (
+    ("PrefixIndex(5000).search('SKF 1499')", lambda: _INDICE.search("SKF 1499", limit=50)),
+    ("PrefixIndex(5000).search(.., fuzzy)", lambda: _INDICE.search("SKF 1499", limit=50, fuzzy=True)),
+)
+
+
+def main(number: int = 20_000):
+    catalogs.get_catalogs()  # carga fuera de la medida
+    print(f"backend: {catalogs.catalog_backend()}")
+    for nombre, fn in CASOS:
+        fn()  # primer acceso (materializa la sección)
+        best = min(timeit.repeat(fn, number=number, repeat=5))
+        print(f"  {nombre:38} {best * 1e6 / number:8.2f} µs")
+    for nombre, fn in CASOS_AUTOCOMPLETADO:
+        best = min(timeit.repeat(fn, number=200, repeat=5))
+        print(f"  {nombre:38} {best * 1e6 / 200:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
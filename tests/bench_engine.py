@@ -0,0 +1,65 @@
+# tests/bench_engine.py
+"""
+Benchmarks del motor de cálculo (no lo recoge pytest): los límites de tiempo que no
+deben ir en los tests unitarios.
+
+    python -m tests.bench_engine
+
+Imprime ms por llamada (mejor de 5 repeticiones) junto al objetivo de cada caso.
+"""
+import timeit
+
+import random
+
+from engine import calcular
+from engine.barrido import barrido, rango
+from engine.corte import Corte, plan_corte
+from engine.nesting import Pieza, anidar
+from tests.test_engine import DEFINICION
+from utils.catalogs import load_catalogs
+
+# mismo lote que tests/test_nesting.py (coronas, testeros y discos en dos grupos)
+_PIEZAS_NESTING = [
+    Pieza("espira", "corona", 180, 60, "S355", 4, 150),
+    Pieza("espira2", "corona", 120, 40, "S355", 4, 100),
+    Pieza("testero", "rect", 400, 400, "S355", 4, 40),
+    Pieza("tapa", "disco", 30, 0, "S355", 4, 60),
+    Pieza("testero", "rect", 300, 150, "S275JR", 10, 30),
+    Pieza("gigante", "rect", 4000, 100, "S275JR", 10, 1),
+]
+
+
+
+def _cortes():
+    """Mismo lote que tests/test_corte.py: 3000 ejes de 7 largos + 1000 mangones."""
+    rnd = random.Random(3)
+    largos = [rnd.uniform(300, 5000) for _ in range(7)]
+    out = [Corte(f"e{i}", round(rnd.choice(largos)), 60.3, 5.0, "S355J2H", "eje") for i in range(3000)]
+    out += [Corte(f"m{i}", rnd.uniform(200, 600), 70.0, 0.0, "C45", "mangon") for i in range(1000)]
+    return out
+
+
+_CORTES = _cortes()
+
+def _casos(model):
+    """(nombre, función, llamadas por repetición, objetivo en ms)."""
+    return [
+        ("calcular(definición)", lambda: calcular(DEFINICION, model), 2000, 0.2),
+        ("barrido(201 espiras x 36 pasos x tubos)",
+         lambda: barrido(rango(100, 300, 1), rango(50, 400, 10), model=model), 1, 2000.0),
+        ("anidar(350 piezas, 2 grupos)", lambda: anidar(_PIEZAS_NESTING), 1, 5000.0),
+        ("plan_corte(4000 cortes, 2 grupos)", lambda: plan_corte(_CORTES, kerf=3.0), 1, 5000.0),
+    ]
+
+
+def main():
+    model = load_catalogs()["_model"]
+    for nombre, fn, number, objetivo_ms in _casos(model):
+        fn()  # primer acceso (cachés del modelo)
+        ms = min(timeit.repeat(fn, number=number, repeat=5)) * 1000.0 / number
+        aviso = "" if ms < objetivo_ms else "  <-- SUPERA EL OBJETIVO"
+        print(f"  {nombre:38} {ms:10.3f} ms  (objetivo < {objetivo_ms:g} ms){aviso}")
+
+
+if __name__ == "__main__":
+    main()
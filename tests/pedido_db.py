@@ -0,0 +1,21 @@
+# tests/pedido_db.py
+"""BD de pedidos en memoria para los tests de los cálculos por pedido (no la recoge pytest)."""
+import json
+import sqlite3
+
+
+def pedido_db(sinfines, completado=None) -> sqlite3.Connection:
+    """
+    sinfines: [(id, pedido_id, nombre, definicion)], definicion = dict o None (sin guardar).
+    completado: {sinfin_id: 0/1} -> crea también estado_tareas (una tarea por sinfín).
+    """
+    con = sqlite3.connect(":memory:")
+    con.execute("CREATE TABLE sinfines (id INTEGER PRIMARY KEY, pedido_id INTEGER, nombre TEXT, definicion_json TEXT)")
+    con.executemany(
+        "INSERT INTO sinfines VALUES (?, ?, ?, ?)",
+        [(i, p, n, json.dumps(d) if d is not None else None) for i, p, n, d in sinfines],
+    )
+    if completado is not None:
+        con.execute("CREATE TABLE estado_tareas (sinfin_id INTEGER, tarea_id INTEGER, completado INTEGER)")
+        con.executemany("INSERT INTO estado_tareas VALUES (?, 1, ?)", list(completado.items()))
+    return con
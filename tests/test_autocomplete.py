@@ -0,0 +1,52 @@
+import math
+import unittest
+
+from utils.autocomplete import PrefixIndex, normalize
+
+
+class _Cuenta(list):
+    """Lista que cuenta las lecturas por índice (bisect y slices pasan por __getitem__)."""
+
+    lecturas = 0
+
+    def __getitem__(self, i):
+        self.lecturas += 1
+        return super().__getitem__(i)
+
+
+class PrefixIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.rods = PrefixIndex(["SKF 22208 E", "SKF 22312 E", "SKF 22212 E", "FAG 22212 E1"])
+
+    def test_prefix_on_any_word_keeps_catalog_order(self):
+        self.assertEqual(self.rods.prefix("2221"), ["SKF 22212 E", "FAG 22212 E1"])
+        # empieza-por primero, luego palabra interior
+        self.assertEqual(self.rods.prefix("f"), ["FAG 22212 E1"])
+        self.assertEqual(self.rods.prefix("e1"), ["FAG 22212 E1"])
+        self.assertEqual(self.rods.prefix(""), list(self.rods.values))
+
+    def test_numbers_accept_decimal_comma_and_accents_are_ignored(self):
+        idx = PrefixIndex(["2", "2.5", "25", "Polietileno", "Cáscara"])
+
+        self.assertEqual(idx.prefix("2,"), ["2.5"])
+        self.assertEqual(idx.prefix("cas"), ["Cáscara"])
+        self.assertEqual(normalize("  Cáscara  DE  Arroz "), "cascara de arroz")
+
+    def test_fuzzy_fills_after_prefix_matches(self):
+        self.assertEqual(self.rods.search("s08", fuzzy=False), [])
+        self.assertEqual(self.rods.search("s08", fuzzy=True), ["SKF 22208 E"])
+        self.assertEqual(self.rods.search("skf", limit=2, fuzzy=True), ["SKF 22208 E", "SKF 22312 E"])
+
+    def test_thousands_of_entries_prefix_is_logarithmic(self):
+        idx = PrefixIndex([f"SKF {n} E" for n in range(10000, 15000)])
+        idx._keys = _Cuenta(idx._keys)
+
+        res = idx.search("SKF 1499", limit=50, fuzzy=True)
+
+        self.assertEqual(res[:2], ["SKF 14990 E", "SKF 14991 E"])
+        # dos bisect sobre ~15000 claves + el slice: sin recorrido lineal (el tiempo, en bench_catalogs)
+        self.assertLessEqual(idx._keys.lecturas, 2 * math.ceil(math.log2(len(idx._keys) + 1)) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
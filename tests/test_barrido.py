@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from engine import calcular
+from engine.barrido import barrido, rango
+from utils.catalogs import load_catalogs
+
+
+class BarridoTest(unittest.TestCase):
+    def setUp(self):
+        self.model = load_catalogs()["_model"]
+
+    def test_grid_and_checks(self):
+        b = barrido([100, 200], [50, 150, 400], [("60.3", "2.6"), ("60,3", "4")], longitud=3000, model=self.model)
+
+        self.assertEqual(len(b), 2 * 3 * 2)
+        r = b.filtrar(de=200.0, paso=150.0, eje_thk=2.6).fila(0)
+        self.assertEqual((r["mangon"], r["tornillos"], r["n_rodamientos"]), (70, "M12x85", 2))
+        self.assertEqual((r["camisa_od"], r["valido"], r["num_espiras"]), (244.5, True, 19))
+        # 60.3 x 4: OD-ID = 8 -> no mecanizable
+        self.assertFalse(b.filtrar(eje_thk=4.0)["mecanizado_ok"].any())
+        # paso 400 con espira 100 -> paso/Ø = 4
+        self.assertFalse(b.filtrar(de=100.0, paso=400.0)["paso_ok"].any())
+
+    def test_ranking_and_row_as_definition(self):
+        top = barrido(rango(100, 300, 10), model=self.model).ranking()
+
+        self.assertTrue(top["valido"].all())
+        self.assertTrue(np.all(np.diff(top["camisa_od"]) >= 0))
+        d = top.definicion(0, base={"material": "S275JR"})
+        self.assertEqual(d["material"], "S275JR")
+        # la fila abierta como definición da lo mismo con el motor escalar
+        derivados = calcular(d, self.model)
+        self.assertTrue(derivados["mecanizado_ok"])
+        self.assertEqual(derivados["camisa_tubo"], d["002A_tubo"])
+        self.assertEqual(derivados["metrica_tornillos"], d["metrica_tornillos"])
+
+    def test_row_bolt_matches_definition(self):
+        # espiras grandes, lentas y largas: el par pide más que M12 en muchas filas
+        top = barrido(rango(250, 300, 10), model=self.model).ranking()
+        base = {"rpm": "15", "coef_llenado": "0.45", "densidad_aparente": "2.5", "longitud_entre_testeros": "12000"}
+        vistos = set()
+        for i in range(len(top)):
+            self.assertEqual(top.fila(i)["tornillos"], top.definicion(i)["metrica_tornillos"])
+            t = top.fila(i, base)["tornillos"]
+            self.assertEqual(t, top.definicion(i, base)["metrica_tornillos"])
+            vistos.add(t.split("x")[0])
+        self.assertGreater(len(vistos - {"M12"}), 0)
+
+    def test_large_sweep_is_vectorized(self):
+        # el tiempo (objetivo < 2 s), en tests/bench_engine.py
+        b = barrido(rango(100, 300, 1), rango(50, 400, 10), model=self.model)
+
+        self.assertEqual(len(b), 201 * 36 * len(self.model.tubos))
+        self.assertTrue(all(isinstance(v, np.ndarray) and len(v) == len(b) for v in b.cols.values()))
+        self.assertEqual(len(b.ranking()), int(b["valido"].sum()))
+
+
+if __name__ == "__main__":
+    unittest.main()
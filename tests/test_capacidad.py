@@ -0,0 +1,74 @@
+import math
+import unittest
+
+import numpy as np
+
+from engine.barrido import barrido
+from engine.capacidad import (
+    capacidad,
+    capacidad_barrido,
+    capacidad_definicion,
+    capacidad_pedido,
+    coef_inclinacion,
+    texto_capacidad,
+)
+from tests.pedido_db import pedido_db
+from utils.catalogs import load_catalogs
+
+DEF = {
+    "diam_espira": "200",
+    "eje_od": "60,3",
+    "paso1": "250",
+    "paso2": "200",
+    "paso3": "",
+    "rpm": "60",
+    "coef_llenado": "0.3",
+    "densidad_aparente": "0.8",
+    "angulo_inclinacion_deg": "0",
+    "sentido_material": "SUBIDA",
+}
+
+
+def _q(de, d, s, n, phi):
+    return 60.0 * math.pi / 4.0 * ((de / 1000) ** 2 - (d / 1000) ** 2) * (s / 1000) * n * phi
+
+
+class CapacidadTest(unittest.TestCase):
+    def test_formula_and_inclination(self):
+        r = capacidad(200, 60.3, 200, 60, 0.3, 0.8)
+        self.assertAlmostEqual(float(r["q_m3h"]), _q(200, 60.3, 200, 60, 0.3))
+        self.assertAlmostEqual(float(r["q_th"]), 0.8 * float(r["q_m3h"]))
+
+        self.assertAlmostEqual(float(coef_inclinacion(10)), 0.8)
+        self.assertAlmostEqual(float(coef_inclinacion(12.5)), 0.75)
+        self.assertAlmostEqual(float(coef_inclinacion(10, subida=False)), 1.0)
+        # broadcasting: varias rpm de golpe
+        self.assertEqual(capacidad(200, 60.3, 200, np.array([30, 60, 90]))["q_m3h"].shape, (3,))
+
+    def test_definition_uses_smallest_pitch_and_handles_missing_data(self):
+        r = capacidad_definicion(DEF)
+        self.assertAlmostEqual(r["q_m3h"], _q(200, 60.3, 200, 60, 0.3))
+        self.assertEqual(texto_capacidad(r), f"{r['q_m3h']:.1f} m³/h · {r['q_th']:.1f} t/h")
+
+        sin_densidad = capacidad_definicion(dict(DEF, densidad_aparente=""))
+        self.assertIsNone(sin_densidad["q_th"])
+        self.assertIsNone(capacidad_definicion({})["q_m3h"])
+        self.assertEqual(texto_capacidad(capacidad_definicion({})), "")
+
+        bajada = capacidad_definicion(dict(DEF, angulo_inclinacion_deg="20", sentido_material="BAJADA"))
+        self.assertAlmostEqual(bajada["q_m3h"], r["q_m3h"])
+
+    def test_pedido_and_sweep_in_one_call(self):
+        con = pedido_db([(1, 5, "A", DEF), (2, 5, "B", None)])
+        res = capacidad_pedido(con, 5)
+        con.close()
+        self.assertAlmostEqual(res[1]["q_m3h"], capacidad_definicion(DEF)["q_m3h"])
+        self.assertIsNone(res[2]["q_m3h"])
+
+        b = capacidad_barrido(barrido([200], [200], model=load_catalogs()["_model"]), rpm=60, llenado=0.3)
+        fila = b.filtrar(eje_od=60.3, eje_thk=2.6).fila(0)
+        self.assertAlmostEqual(fila["q_m3h"], _q(200, 60.3, 200, 60, 0.3))
+
+
+if __name__ == "__main__":
+    unittest.main()
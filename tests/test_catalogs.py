@@ -0,0 +1,520 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.pedido_db import pedido_db
+from utils.catalog_build import CatalogBuildError, build_catalogs
+from utils.catalog_model import build_model
+from utils.catalog_snapshot import compile_snapshot, read_snapshot
+import utils.catalog_store as catalog_store
+from utils.catalog_store import CatalogStore, import_catalogs
+from utils.catalog_watch import CatalogWatcher, changed_sections
+from utils.planos import resolver_planos_pedido
+from utils.rodamientos_ingest import convert_rodamientos
+from utils.catalogs import (
+    DEFAULT_JSON,
+    CatalogRegistry,
+    LazyCatalogs,
+    filter_espesores_por_od,
+    filter_rodamientos_por_tubo,
+    get_catalogs,
+    get_eje_diametros,
+    get_materiales,
+    get_rodamiento_dims,
+    get_rodamientos_for_d,
+    get_tubo_espesores,
+    get_tubo_exteriores,
+    get_tubo_interior,
+    load_catalogs,
+)
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+class CatalogRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalogos.json")
+        _write_json(self.path, {
+            "eje_od": ["60.3"],
+            "espesores_by_od": {"60.3": ["2.3", "3"]},
+            "rodamientos": [{"ref": "22212", "name": "SKF 22212 E", "d": 60, "D": 110, "B": 28}],
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loads_once_and_serves_from_cache(self):
+        reg = CatalogRegistry(self.path)
+        first = reg.get()
+        second = reg.get()
+
+        self.assertIs(first, second)
+        m = reg.metrics()
+        self.assertEqual(m["loads"], 1)
+        self.assertEqual(m["hits"], 1)
+
+    def test_view_is_read_only(self):
+        cat = CatalogRegistry(self.path).get()
+
+        with self.assertRaises(TypeError):
+            cat["eje_od"] = []
+        self.assertIsInstance(cat["eje_od"], tuple)
+        self.assertEqual(filter_espesores_por_od(cat, "60.3"), ["2.3", "3"])
+
+    def test_reloads_only_when_content_changes(self):
+        reg = CatalogRegistry(self.path)
+        first = reg.get()
+
+        # mismo contenido, distinto mtime -> no se re-parsea
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        self.assertIs(reg.get(), first)
+        self.assertEqual(reg.metrics()["touches"], 1)
+
+        _write_json(self.path, {"eje_od": ["76.1"]})
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 20_000_000))
+        second = reg.get()
+
+        self.assertEqual(second["eje_od"], ("76.1",))
+        m = reg.metrics()
+        self.assertEqual(m["loads"], 2)
+        self.assertEqual(m["reloads"], 1)
+
+
+class LazyCatalogsTest(unittest.TestCase):
+    def test_sections_are_materialized_on_first_access(self):
+        cat = LazyCatalogs({
+            "pasos": ["100", "150"],
+            "eje_od": ["60.3"],
+            "espesores_by_od": {"60.3": ["2.6"]},
+            "rodamientos": [{"ref": "22211", "name": "SKF 22211 E", "d": 55, "D": 100, "B": 25}],
+        })
+
+        self.assertEqual(cat["pasos"], ("100", "150"))
+        self.assertEqual(cat["materials"], ())  # sección por defecto
+        self.assertIn("rodamiento_names", cat)
+        self.assertIsNone(cat.get("_store"))
+
+        prof = cat.profile()
+        self.assertEqual(prof["sections"]["pasos"]["hits"], 1)
+        self.assertIn("rodamientos", prof["untouched"])
+        self.assertIn("_model", prof["untouched"])
+
+        # el modelo también se construye por partes
+        self.assertEqual(filter_rodamientos_por_tubo(cat, "60.3", "2.6"), ["SKF 22211 E"])
+        built = cat.profile()["model"]
+        self.assertEqual(sorted(built), ["compat", "rodamientos", "tubos"])
+        self.assertEqual(cat["rodamiento_names"], ("SKF 22211 E",))
+
+
+class CatalogSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalogos.json")
+        self.csv = os.path.join(self.tmp.name, "Pasos_Espiras.csv")
+        _write_json(self.path, {"pasos": ["100", "150"]})
+        with open(self.csv, "w", encoding="utf-8") as f:
+            f.write("Pasos\n100\n150\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_and_stale_detection(self):
+        compile_snapshot(load_catalogs(self.path, use_snapshot=False), self.path)
+
+        data = read_snapshot(self.path)
+        self.assertEqual(data["pasos"], ["100", "150"])
+        self.assertEqual(data["_model"].valor("pasos", "150"), 150.0)
+
+        with open(self.csv, "a", encoding="utf-8") as f:
+            f.write("200\n")
+        self.assertIsNone(read_snapshot(self.path))
+        # load_catalogs vuelve al JSON
+        self.assertEqual(load_catalogs(self.path)["pasos"], ["100", "150"])
+
+
+class CatalogBuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.json = os.path.join(self.dir, "catalogos.json")
+        _write_json(self.json, {"materials": ["S275JR"]})
+        self._csv("Pasos_Espiras.csv", '"Pasos\nEspiras"\n100\n150\n;\n')
+        self._csv("Lista_eje_tubo.csv", "D_exterior_mm;Espesor_mm;d_interior_mm;Plano Testeros\n60,3;2,6;55,1;P1\n60,3;3;54,3;P2\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _csv(self, name, text):
+        with open(os.path.join(self.dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _load(self):
+        with open(self.json, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_builds_sections_and_keeps_manual_ones(self):
+        report = build_catalogs(self.dir)
+
+        data = self._load()
+        self.assertEqual(sorted(report["rebuilt"]), ["Lista_eje_tubo.csv", "Pasos_Espiras.csv"])
+        self.assertEqual(data["pasos"], ["100", "150"])
+        self.assertEqual(data["espesores_by_od"], {"60.3": ["2.6", "3"]})
+        self.assertEqual(data["planos_testeros"][1], {"od": "60.3", "thk": "3", "id": "54.3", "plano": "P2"})
+        self.assertEqual(data["materials"], ["S275JR"])
+        self.assertIsNotNone(read_snapshot(self.json))
+
+    def test_only_changed_sources_are_rebuilt(self):
+        build_catalogs(self.dir, snapshot=False)
+        self._csv("Pasos_Espiras.csv", "Pasos\n100\n150\n200\n")
+
+        report = build_catalogs(self.dir, snapshot=False)
+
+        self.assertEqual(report["rebuilt"], ["Pasos_Espiras.csv"])
+        self.assertEqual(report["skipped"], ["Lista_eje_tubo.csv"])
+        self.assertEqual(self._load()["pasos"], ["100", "150", "200"])
+
+    def test_rebuild_keeps_load_ratings(self):
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+        for name in ("catalogos.json", "rodamientos.csv"):
+            shutil.copy(os.path.join(data_dir, name), self.dir)
+        with open(os.path.join(data_dir, "catalogos.json"), encoding="utf-8") as f:
+            original = json.load(f)["rodamientos"]
+
+        build_catalogs(self.dir, snapshot=False)
+
+        rebuilt = self._load()["rodamientos"]
+        self.assertEqual(rebuilt, original)
+        self.assertTrue(all(r.get("C") and r.get("C0") for r in rebuilt))
+
+    def test_single_column_keeps_decimal_comma(self):
+        self._csv("Espesor_Chapa.csv", '"Espesor\nChapa"\n1\n1,5\n2\n2,5\n3\n')
+
+        build_catalogs(self.dir, snapshot=False)
+
+        self.assertEqual(self._load()["espesores_chapa"], ["1", "1.5", "2", "2.5", "3"])
+
+    def test_repeated_or_unordered_values_abort(self):
+        for text in ("Pasos\n100\n150\n150\n", "Pasos\n150\n100\n"):
+            self._csv("Pasos_Espiras.csv", text)
+            with self.assertRaises(CatalogBuildError):
+                build_catalogs(self.dir, snapshot=False)
+        self.assertEqual(self._load(), {"materials": ["S275JR"]})
+
+    def test_invalid_source_aborts_without_writing(self):
+        self._csv("Pasos_Espiras.csv", "Pasos\n100\nabc\n")
+
+        with self.assertRaises(CatalogBuildError):
+            build_catalogs(self.dir, snapshot=False)
+        self.assertEqual(self._load(), {"materials": ["S275JR"]})
+
+
+class CatalogWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json = os.path.join(self.tmp.name, "catalogos.json")
+        self.csv = os.path.join(self.tmp.name, "Pasos_Espiras.csv")
+        _write_json(self.json, {"pasos": ["100"], "materials": ["S275JR"]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _bump(self, path, ns):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + ns))
+
+    def test_json_edit_pushes_new_catalog_with_changed_sections(self):
+        watcher = CatalogWatcher(self.json, build=False)
+        vistos = []
+        watcher.subscribe(lambda cat, cambios: vistos.append(cambios))
+        antes = watcher.catalogs
+
+        self.assertEqual(watcher.poll_once(), set())
+        _write_json(self.json, {"pasos": ["100", "150"], "materials": ["S275JR"]})
+        self._bump(self.json, 10_000_000)
+
+        self.assertEqual(watcher.poll_once(), {"pasos"})
+        self.assertEqual(vistos, [{"pasos"}])
+        self.assertEqual(watcher.catalogs["pasos"], ("100", "150"))
+        self.assertEqual(changed_sections(antes, watcher.catalogs), {"pasos"})
+
+    def test_csv_edit_runs_incremental_build(self):
+        watcher = CatalogWatcher(self.json)
+        with open(self.csv, "w", encoding="utf-8") as f:
+            f.write("Pasos\n100\n200\n")
+
+        self.assertEqual(watcher.poll_once(), {"pasos"})
+        self.assertEqual(watcher.catalogs["pasos"], ("100", "200"))
+        self.assertEqual(watcher.catalogs["materials"], ("S275JR",))
+        # nuestra propia escritura del JSON no vuelve a disparar
+        self.assertEqual(watcher.poll_once(), set())
+
+
+class CatalogModelTest(unittest.TestCase):
+    def test_parses_numbers_once_and_keeps_display_text(self):
+        model = build_model({
+            "eje_od": ["60,3"],
+            "espesores_by_od": {"60,3": ["2,3"]},
+            "pasos": ["150", "x"],
+        })
+
+        tubo = model.tubos[0]
+        self.assertEqual((tubo.od_text, tubo.thk_text), ("60,3", "2,3"))
+        self.assertAlmostEqual(tubo.id, 55.7)
+        self.assertIs(model.tubo("60.3", "2.3"), tubo)
+        self.assertEqual([p.text for p in model.listas["pasos"]], ["150"])
+        self.assertEqual(model.valor("pasos", "150"), 150.0)
+
+    def test_free_text_tube_falls_back_to_parsing(self):
+        model = build_model({})
+        self.assertAlmostEqual(model.tubo("70", "6").id, 58.0)
+        self.assertIsNone(model.tubo("", "6"))
+
+    def test_filter_rodamientos_with_real_catalog(self):
+        cat = load_catalogs()
+        # 60.3 x 2.6 -> ID 55.1 (d=55 entra en ±0.1), 60.3 x 2.3 -> ID 55.7
+        self.assertEqual(filter_rodamientos_por_tubo(cat, "60.3", "2.6"), ["SKF 22211 E", "SKF 22311 E"])
+        self.assertEqual(filter_rodamientos_por_tubo(cat, "60.3", "2.3"), [])
+        self.assertEqual(
+            filter_rodamientos_por_tubo(cat, "60.3", ""),
+            ["SKF 22208 E", "SKF 22209 E", "SKF 22210 E", "SKF 22310 E",
+             "SKF 22211 E", "SKF 22311 E", "SKF 22212 E", "SKF 22312 E"],
+        )
+        self.assertEqual(len(filter_rodamientos_por_tubo(cat, "", "")), 22)
+
+    def test_rodamiento_index_range_queries(self):
+        model = build_model({"rodamientos": [
+            {"ref": "b", "name": "B", "d": 50},
+            {"ref": "a", "name": "A", "d": 40},
+            {"ref": "a2", "name": "A", "d": 45},   # nombre repetido
+            {"ref": "c", "name": "C", "d": 50.05},
+            {"ref": "x", "name": "X"},             # sin d
+        ]})
+        idx = model.rod_index
+
+        self.assertEqual(idx.por_diametro(50.0), ["B", "C"])
+        self.assertEqual(idx.por_diametro(45.0), [])
+        self.assertEqual(idx.menores_que(50.0), ["A"])
+        self.assertEqual(idx.todos(), ["B", "A", "C", "X"])
+
+    def test_tubo_index_picks_smallest_camisa(self):
+        model = build_model({
+            "eje_od": ["219.1", "244.5", "273"],
+            "espesores_by_od": {"219.1": ["6.3"], "244.5": ["6.3"], "273": ["6.3", "8"]},
+        })
+        idx = model.tubo_index
+
+        # espira 200 -> ID mínimo 208 -> 219.1x6.3 (ID 206.5) no llega, 244.5x6.3 sí
+        self.assertEqual(idx.camisa(200).od_text, "244.5")
+        # ninguno llega -> el de mayor ID
+        self.assertEqual(idx.camisa(400).od_text, "273")
+        self.assertEqual(idx.camisa(400).thk_text, "6.3")
+        self.assertEqual([t.od for t in idx.camisas([100, 240])], [219.1, 273.0])
+
+    def test_plano_testeros_lookup_with_real_catalog(self):
+        model = load_catalogs()["_model"]
+        planos = model.planos
+
+        self.assertEqual(planos.codigo(21.3, 2), "002A.002.0213-0173")
+        self.assertEqual(planos.codigo(21.3, 2.1), "")
+        tubo = model.tubo("60,3", "2,6")
+        self.assertEqual(planos.codigo(tubo.od, tubo.thk), "002A.002.0603-0551")
+        self.assertEqual([p.codigo for p in planos.por_id(17.3)], ["002A.002.0213-0173"])
+        self.assertEqual(planos.codigos([(21.3, 2), (None, 2), (127, 6.3)]),
+                         ["002A.002.0213-0173", "", "002A.002.1270-1144"])
+
+    def test_resolver_planos_pedido_in_one_query(self):
+        con = pedido_db([
+            (1, 7, "S1", {"eje_od": "21.3", "eje_thk": "2", "camisa_tipo": "CIRCULAR", "002A_tubo": "127.0 / 114.4"}),
+            (2, 7, "S2", {"eje_od": "21.3", "eje_thk": "9", "camisa_tipo": "U", "002A_tubo": "127.0 / 114.4"}),
+            (3, 8, "otro", {}),
+            (4, 7, "vacío", None),
+        ])
+
+        planos = resolver_planos_pedido(con, 7, load_catalogs())
+        self.assertEqual(planos, {
+            1: {"nombre": "S1", "eje": "002A.002.0213-0173", "camisa": "002A.002.1270-1144"},
+            2: {"nombre": "S2", "eje": "", "camisa": ""},
+            4: {"nombre": "vacío", "eje": "", "camisa": ""},
+        })
+        con.close()
+
+    def test_compat_matrix_rows_with_real_catalog(self):
+        model = load_catalogs()["_model"]
+
+        row = model.compat("60,3", "2.6")
+        self.assertTrue(row.mecanizado_ok)
+        self.assertAlmostEqual(row.id, 55.1)
+        self.assertEqual(row.rodamientos, ("SKF 22211 E", "SKF 22311 E"))
+        self.assertEqual((row.mangon_stock, row.mangon, row.tornillos), (60, 70, "M12x85"))
+        self.assertFalse(model.compat("60.3", "4").mecanizado_ok)   # OD-ID = 8
+        self.assertIsNone(model.compat("60.3", ""))
+
+        # una fila por tubo de catálogo y mismos rodamientos que el índice por d
+        self.assertEqual(len(model.compat_matrix), len(model.tubos))
+        for row in model.compat_matrix.values():
+            self.assertEqual(list(row.rodamientos), model.rod_index.por_diametro(row.id, 0.1))
+
+    def test_compat_for_free_text_tube_is_computed_on_the_fly(self):
+        row = build_model({}).compat("70", "2.5")
+        self.assertTrue(row.mecanizado_ok)
+        self.assertEqual((row.mangon, row.tornillos, row.rodamientos), (75, "M12x90", ()))
+
+
+class CatalogStoreTest(unittest.TestCase):
+    def test_sqlite_filters_match_in_memory_filters(self):
+        cat = load_catalogs(use_snapshot=False)
+        con = sqlite3.connect(":memory:")
+        import_catalogs(con, cat)
+        store_cat = CatalogStore(con).as_catalogs()
+
+        self.assertEqual(list(store_cat["eje_od"]), list(cat["eje_od"]))
+        self.assertEqual(list(store_cat["planos_testeros"]), list(cat["planos_testeros"]))
+        for od in list(cat["eje_od"]) + ["", "70"]:
+            self.assertEqual(filter_espesores_por_od(store_cat, od), filter_espesores_por_od(cat, od))
+            for thk in list(cat["espesores_by_od"].get(od, [])) + ["", "6"]:
+                self.assertEqual(
+                    filter_rodamientos_por_tubo(store_cat, od, thk),
+                    filter_rodamientos_por_tubo(cat, od, thk),
+                )
+        con.close()
+
+    def test_sqlite_backend_reloads_when_json_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalogos.json")
+            _write_json(path, {"eje_od": ["60.3"], "espesores_by_od": {"60.3": ["2.6"]}})
+            with mock.patch.dict(os.environ, {"SINFINES_CATALOGOS": "sqlite"}), \
+                    mock.patch.object(catalog_store, "CATALOG_DB_PATH", os.path.join(tmp, "catalogos.db")):
+                first = get_catalogs(path)
+                self.assertIs(get_catalogs(path), first)
+
+                st = os.stat(path)
+                _write_json(path, {"eje_od": ["76.1"], "espesores_by_od": {"76.1": ["3"]}})
+                os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+                second = get_catalogs(path)
+                self.assertEqual(list(second["eje_od"]), ["76.1"])
+                self.assertIs(get_catalogs(path), second)
+                first["_store"].con.close()
+                second["_store"].con.close()
+
+
+class CatalogQueryApiTest(unittest.TestCase):
+    def setUp(self):
+        self.cat = load_catalogs()
+
+    def test_lists_and_tube_queries(self):
+        cat = self.cat
+        self.assertEqual(get_materiales(cat)[0], "S355J2+N")
+        self.assertEqual(get_eje_diametros(cat)[:3], ["40", "45", "50"])
+        self.assertEqual(get_tubo_exteriores(cat)[0], "21.3")
+
+        self.assertEqual(get_tubo_espesores(60.3, cat), get_tubo_espesores("60,3", cat))
+        self.assertEqual(list(get_tubo_espesores(60.3, cat)), list(cat["espesores_by_od"]["60.3"]))
+        self.assertEqual(get_tubo_espesores(61, cat), ())
+        self.assertAlmostEqual(get_tubo_interior(60.3, 2.6, cat), 55.1)
+        self.assertIsNone(get_tubo_interior(60.3, 2.5, cat))
+
+    def test_bearing_queries_accept_name_or_ref(self):
+        cat = self.cat
+        self.assertEqual(get_rodamientos_for_d(55, cat), ["SKF 22211 E", "SKF 22311 E"])
+        self.assertEqual(get_rodamientos_for_d(56, cat), [])
+        self.assertEqual(get_rodamiento_dims("SKF 22211 E", cat), {"d": 55.0, "D": 100.0, "B": 25.0})
+        self.assertEqual(get_rodamiento_dims("22211", cat), get_rodamiento_dims("SKF 22211 E", cat))
+        self.assertEqual(get_rodamiento_dims("no existe", cat), {"d": None, "D": None, "B": None})
+
+    def test_sqlite_backend_answers_the_same(self):
+        con = sqlite3.connect(":memory:")
+        import_catalogs(con, load_catalogs(use_snapshot=False))
+        store_cat = CatalogStore(con).as_catalogs()
+
+        for d in get_eje_diametros(self.cat):
+            self.assertEqual(get_rodamientos_for_d(d, store_cat), get_rodamientos_for_d(d, self.cat))
+        for name in self.cat["rodamiento_names"]:
+            self.assertEqual(get_rodamiento_dims(name, store_cat), get_rodamiento_dims(name, self.cat))
+        self.assertAlmostEqual(get_tubo_interior("60.3", "2.6", store_cat), 55.1)
+        con.close()
+
+    def test_queries_build_the_model_once(self):
+        # el tiempo por consulta se mide en tests/bench_catalogs.py
+        with open(DEFAULT_JSON, encoding="utf-8") as f:
+            cat = json.load(f)                     # dict a mano, sin "_model"
+        with mock.patch("utils.catalogs.build_model", wraps=build_model) as build:
+            for _ in range(100):
+                get_tubo_espesores(60.3, cat)
+                get_tubo_interior(60.3, 2.6, cat)
+                get_rodamientos_for_d(55, cat)
+                get_rodamiento_dims("SKF 22211 E", cat)
+        self.assertEqual(build.call_count, 1)
+        self.assertAlmostEqual(get_tubo_interior(60.3, 2.6, cat), 55.1)
+        with mock.patch("utils.catalogs.build_model", wraps=build_model) as build:
+            get_tubo_espesores(60.3, self.cat)
+        self.assertEqual(build.call_count, 0)
+
+
+class RodamientosIngestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, "proveedor.csv")
+        with open(self.csv, "w", encoding="utf-8") as f:
+            f.write("Serie;Referencia;d_mm;D_mm;B_mm;\n")
+            for ref, d in [("22312", 60), ("22208", 40), ("22212", 60), ("22208", 45), ("22310", 50)]:
+                f.write(f"{ref};SKF {ref} E;{d};{d * 2};{d // 2};\n")
+            f.write(";;;;;\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_external_sort_dedupes_and_orders_by_d_and_ref(self):
+        out = os.path.join(self.tmp.name, "rod.jsonl")
+        # run_size=2 fuerza varios tramos en disco + merge
+        report = convert_rodamientos(self.csv, out, "jsonl", run_size=2)
+
+        with open(out, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([r["ref"] for r in rows], ["22208", "22310", "22212", "22312"])
+        self.assertEqual(rows[0], {"ref": "22208", "name": "SKF 22208 E", "d": 40, "D": 80, "B": 20})
+        self.assertEqual((report["rows_in"], report["rows_out"], report["duplicates"]), (6, 4, 1))
+        self.assertGreater(report["runs"], 1)
+        self.assertGreater(report["rows_per_s"], 0)
+
+    def test_sqlite_output_feeds_catalog_store(self):
+        db = os.path.join(self.tmp.name, "cat.db")
+        convert_rodamientos(self.csv, db, "sqlite", run_size=2)
+
+        con = sqlite3.connect(db)
+        try:
+            store = CatalogStore(con)
+            self.assertEqual(store.rodamientos_por_diametro(60.0), ["SKF 22212 E", "SKF 22312 E"])
+            self.assertEqual(store.rodamientos_menores_que(55.0), ["SKF 22208 E", "SKF 22310 E"])
+        finally:
+            con.close()
+
+    def test_load_ratings_flow_through_to_store(self):
+        csv_cc = os.path.join(self.tmp.name, "cc.csv")
+        with open(csv_cc, "w", encoding="utf-8") as f:
+            f.write("Serie;Referencia;d_mm;D_mm;B_mm;C_kN;C0_kN;\n22211;SKF 22211 E;55;100;25;143;166;\n")
+        out = os.path.join(self.tmp.name, "cc.jsonl")
+        convert_rodamientos(csv_cc, out, "jsonl")
+        with open(out, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["C0"], 166)
+
+        db = os.path.join(self.tmp.name, "cc.db")
+        convert_rodamientos(csv_cc, db, "sqlite")
+        con = sqlite3.connect(db)
+        try:
+            r = CatalogStore(con).rodamiento("22211")
+            self.assertEqual((r.C, r.C0), (143.0, 166.0))
+        finally:
+            con.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
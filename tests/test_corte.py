@@ -0,0 +1,89 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+
+from engine.corte import (
+    INSERCION_MANGON_MM,
+    STOCK_TUBO_MM,
+    Corte,
+    cortes_definicion,
+    exportar_csv,
+    optimizar,
+    plan_corte,
+    plan_pedidos,
+    texto_plan,
+)
+from tests.pedido_db import pedido_db
+
+
+def _eje(largo, ref="x"):
+    return Corte(ref, largo, 60.3, 5.0, "S355J2H", "eje")
+
+
+class CorteTest(unittest.TestCase):
+    def _valido(self, barras, kerf):
+        for b in barras:
+            self.assertLessEqual(sum(c.largo + kerf for c in b.cortes), b.largo + kerf + 1e-6)
+
+    def test_known_optimum_and_stock_lengths(self):
+        # 4×5000 + 4×990: óptimo 2 barras de 12000 (5000+5000+990+990 + kerf)
+        cortes = [_eje(5000.0)] * 4 + [_eje(990.0)] * 4
+        barras, no_caben = optimizar(cortes, STOCK_TUBO_MM, kerf=3.0)
+        self.assertEqual([b.largo for b in barras], [12000.0, 12000.0])
+        self.assertEqual(no_caben, [])
+        # un corte que cabe justo sin kerf final; otro que no cabe en ningún largo
+        barras, no_caben = optimizar([_eje(6000.0), _eje(13000.0, "largo")], STOCK_TUBO_MM, kerf=3.0)
+        self.assertEqual([b.largo for b in barras], [6000.0])
+        self.assertEqual([c.ref for c in no_caben], ["largo"])
+
+    def test_thousands_of_cuts_grouped(self):
+        rnd = random.Random(3)
+        largos = [rnd.uniform(300, 5000) for _ in range(7)]
+        cortes = [_eje(round(rnd.choice(largos)), f"e{i}") for i in range(3000)]
+        cortes += [Corte(f"m{i}", rnd.uniform(200, 600), 70.0, 0.0, "C45", "mangon") for i in range(1000)]
+        planes = plan_corte(cortes, kerf=3.0)     # el tiempo, en tests/bench_engine.py
+        self.assertEqual([p.nombre for p in planes], ["Ø60.3x5 S355J2H", "Ø70 C45"])
+        refs = sorted(c.ref for p in planes for b in p.barras for c in b.cortes)
+        self.assertEqual(refs, sorted(c.ref for c in cortes))
+        eje, mangon = planes
+        self._valido(eje.barras, 3.0)
+        self._valido(mangon.barras, 3.0)
+        self.assertLessEqual(len(eje.barras), eje.cota_inferior(STOCK_TUBO_MM) * 1.02)
+        self.assertLess(eje.desperdicio, 0.03)
+        self.assertIn("Ø70 C45:", texto_plan(planes)[1])
+
+    def test_cuts_from_definitions_and_csv(self):
+        defi = {"eje_od": "60,3", "eje_thk": "3", "diam_espira": "200", "longitud_entre_testeros": "5000",
+                "002A_testeros": "10", "mangon_ext_conduccion": "200", "mangon_ext_conducido": "100",
+                "mangones_intermedios": True, "num_mangones_intermedios": "1"}
+        cortes = cortes_definicion(defi, "S1")
+        por_tipo = {}
+        for c in cortes:
+            por_tipo.setdefault(c.tipo, []).append(c)
+        self.assertEqual([c.largo for c in por_tipo["eje"]], [(5000 - 20 - 100) / 2] * 2)
+        self.assertEqual(len(por_tipo["camisa"]), 1)
+        self.assertEqual(por_tipo["camisa"][0].largo, 5000.0)
+        mangones = sorted(c.largo for c in por_tipo["mangon"])
+        self.assertEqual(mangones, sorted([200 + 10 + 50 + INSERCION_MANGON_MM, 100 + 10 + 50 + INSERCION_MANGON_MM,
+                                           2 * INSERCION_MANGON_MM]))
+        self.assertEqual({c.thk for c in por_tipo["mangon"]}, {0.0})
+
+        con = pedido_db([(pid, pid, "S1", defi) for pid in (1, 2, 3)], completado={1: 0, 2: 1, 3: 0})
+        planes = plan_pedidos(con)                   # pedidos abiertos: 1 y 3
+        eje = next(p for p in planes if p.od == 60.3)
+        self.assertEqual(sum(len(b.cortes) for b in eje.barras), 4)
+        self.assertTrue(all(c.ref.startswith(("P1/", "P3/")) for b in eje.barras for c in b.cortes))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plan.csv")
+            n = exportar_csv(planes, path)
+            with open(path, newline="", encoding="utf-8") as f:
+                filas = list(csv.reader(f, delimiter=";"))
+        self.assertEqual(len(filas), n + 1)
+        self.assertEqual(filas[0][:5], ["od", "thk", "material", "barra", "largo_barra"])
+
+
+if __name__ == "__main__":
+    unittest.main()
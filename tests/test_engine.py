@@ -0,0 +1,83 @@
+import sqlite3
+import unittest
+
+from engine import calcular, calcular_pedido
+from engine.barrido import barrido, rango
+from engine.reglas import longitud_inventor, longitud_total_exterior, num_espiras, ref_ventana_inspeccion
+from tests.pedido_db import pedido_db
+from utils.catalog_store import CatalogStore, import_catalogs
+from utils.catalogs import load_catalogs
+
+DEFINICION = {
+    "eje_od": "60,3",
+    "eje_thk": "2.6",
+    "diam_espira": "200",
+    "paso1": "150",
+    "longitud_entre_testeros": "3000",
+    "002A_testeros": "10",
+    "mangon_ext_conduccion": "120",
+    "mangon_ext_conducido": "80",
+    "mangones_intermedios": True,
+    "002A_vi_lleva": "Sí",
+}
+
+
+class EngineTest(unittest.TestCase):
+    def setUp(self):
+        self.model = load_catalogs()["_model"]
+
+    def test_rules(self):
+        self.assertEqual(ref_ventana_inspeccion(150), "VI-150")
+        self.assertEqual(ref_ventana_inspeccion(400.1), "VI-500")
+        self.assertEqual(longitud_total_exterior(3000, None, 80), (None, ["Longitud exterior mangón conducción"]))
+        self.assertEqual(longitud_inventor(3000, 10), 2880)
+        self.assertEqual(num_espiras(2880, 150), 19)
+
+    def test_derived_values_from_definition(self):
+        d = calcular(DEFINICION, self.model)
+
+        self.assertTrue(d["mecanizado_ok"])
+        self.assertAlmostEqual(d["eje_id"], 55.1)
+        self.assertEqual((d["mangon"], d["mangon_stock"], d["metrica_tornillos"]), (70, 60, "M12x85"))
+        self.assertEqual(d["rodamientos"], ("SKF 22211 E", "SKF 22311 E"))
+        # espira 200 -> ID >= 208 -> 244.5 x 6.3
+        self.assertEqual(d["camisa_tubo"], "244.5 / 231.9")
+        self.assertEqual(d["ventana_inspeccion_ref"], "VI-250")
+        self.assertEqual(d["cjto_intermedio_ref"], "CJTO-OD244-DM70")
+        self.assertEqual((d["longitud_total_ext"], d["faltan_longitud"]), (3200, []))
+        self.assertEqual((d["longitud_inventor"], d["num_espiras"]), (2880, 19))
+        self.assertEqual(d["plano_testeros_eje"], "002A.002.0603-0551")
+
+    def test_sqlite_backend_gives_the_same_results(self):
+        con = sqlite3.connect(":memory:")
+        import_catalogs(con, load_catalogs(use_snapshot=False))
+        store_model = CatalogStore(con).as_catalogs()["_model"]
+
+        d = calcular(DEFINICION, store_model)
+        self.assertEqual(d["rodamientos"], ("SKF 22211 E", "SKF 22311 E"))
+        self.assertEqual(d, calcular(DEFINICION, self.model))
+        validos = [len(barrido(rango(100, 300, 10), model=m).validos()) for m in (store_model, self.model)]
+        self.assertGreater(validos[1], 0)
+        self.assertEqual(validos[0], validos[1])
+        con.close()
+
+    def test_empty_definition_gives_empty_values(self):
+        d = calcular({}, self.model)
+        self.assertFalse(d["mecanizado_ok"])
+        self.assertIsNone(d["mangon"])
+        self.assertEqual(d["camisa_tubo"], "")
+        self.assertIsNone(d["num_espiras"])
+        self.assertEqual(len(d["faltan_longitud"]), 3)
+
+    def test_pedido_batch(self):
+        con = pedido_db([(i, 1, f"S{i}", DEFINICION) for i in range(1, 4)])
+        res = calcular_pedido(con, 1, self.model)
+        con.close()
+        self.assertEqual(sorted(res), [1, 2, 3])
+        self.assertEqual(res[2]["num_espiras"], 19)
+        # el lote da lo mismo que el escalar (el tiempo por llamada, en tests/bench_engine.py)
+        self.assertEqual(res[1], calcular(DEFINICION, self.model))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from engine.espira import CacheDesarrollos, desarrollo, desarrollos, desarrollos_definicion, num_discos
+
+
+class EspiraTest(unittest.TestCase):
+    def test_flat_pattern_geometry(self):
+        d = desarrollo(200, 60, 200, 4, k=0)
+        li, le = math.hypot(math.pi * 60, 200), math.hypot(math.pi * 200, 200)
+        self.assertAlmostEqual(d.r_int, 70 * li / (le - li))
+        self.assertAlmostEqual(d.r_ext - d.r_int, 70)
+        # el arco interior y el exterior de la corona miden lo que las hélices
+        self.assertAlmostEqual(math.radians(d.angulo_deg) * d.r_int, li)
+        self.assertAlmostEqual(math.radians(d.angulo_deg) * d.r_ext, le)
+        self.assertAlmostEqual(d.angulo_deg + d.hueco_deg, 360.0)
+        self.assertEqual(d.espiras_por_disco, 1)
+        # paso muy largo: caben dos sectores por corona
+        self.assertEqual(desarrollo(200, 60, 1000, 4, k=0).espiras_por_disco, 2)
+        self.assertEqual(num_discos(19, d), 19)
+
+    def test_neutral_fibre_and_vectorized(self):
+        sin = desarrollo(200, 60, 200, 4, k=0)
+        con = desarrollo(200, 60, 200, 4)
+        # la corona conserva la altura de la espira; la fibra neutra solo cambia θ y los radios
+        self.assertAlmostEqual(con.r_ext - con.r_int, (200 - 60) / 2)
+        self.assertAlmostEqual(sin.r_ext - sin.r_int, (200 - 60) / 2)
+        self.assertNotAlmostEqual(con.angulo_deg, sin.angulo_deg)
+        cols = desarrollos(200, 60, np.array([150.0, 200.0, 250.0]), 4)
+        self.assertAlmostEqual(float(cols["r_int"][1]), con.r_int)
+        self.assertTrue(np.all(np.diff(cols["hueco_deg"]) > 0))
+        with self.assertRaises(ValueError):
+            desarrollo(60, 200, 200, 4)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "des.db")
+            c1 = CacheDesarrollos(path)
+            a = c1.obtener(200, 60.3, 200, 4)
+            self.assertIs(c1.obtener(200.0, 60.30, 200, 4), a)
+            self.assertEqual((c1.hits, c1.misses), (1, 1))
+            c1.close()
+
+            c2 = CacheDesarrollos(path)        # otra sesión: sale del disco, sin recalcular
+            self.assertEqual(c2.obtener(200, 60.3, 200, 4), a)
+            self.assertEqual((c2.hits, c2.misses), (1, 0))
+
+            defi = {"diam_espira": "200", "eje_od": "60,3", "espesor_espira": "4", "paso1": "200", "paso2": "200",
+                    "paso3": "150"}
+            r = desarrollos_definicion(defi, c2)
+            self.assertEqual([p for p, _ in r], [200.0, 150.0])
+            self.assertEqual(r[0][1], a)
+            self.assertEqual(desarrollos_definicion({}, c2), [])
+            c2.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from engine.estructura import (
+    _comprobar,
+    E_ACERO_MPA,
+    Carga,
+    comprobar_eje_definicion,
+    comprobar_ejes,
+    comprobar_pedido,
+    masa_espira_kg_m,
+    num_vanos,
+    secciones,
+    texto_comprobacion,
+)
+from tests.pedido_db import pedido_db
+from utils.catalog_model import Tubo
+from utils.catalogs import load_catalogs
+
+DEF = {
+    "diam_espira": "200",
+    "paso1": "200",
+    "eje_od": "60.3",
+    "eje_thk": "2.6",
+    "espesor_espira": "4",
+    "longitud_entre_testeros": "5000",
+    "rpm": "60",
+    "coef_llenado": "0.3",
+    "densidad_aparente": "0.8",
+}
+
+
+class EstructuraTest(unittest.TestCase):
+    def setUp(self):
+        self.model = load_catalogs()["_model"]
+
+    def test_sections_and_beam_formula(self):
+        s = secciones((Tubo(60.3, 2.6),))
+        di = 60.3 - 5.2
+        self.assertAlmostEqual(float(s["inercia_mm4"][0]), np.pi / 64 * (60.3 ** 4 - di ** 4))
+        self.assertAlmostEqual(float(s["kg_m"][0]), np.pi / 4 * (60.3 ** 2 - di ** 2) * 7.85e-3)
+        # sin espira ni material la flecha es la del propio tubo
+        res = comprobar_ejes(3000, Carga(de_mm=60.3, paso_mm=100, espesor_espira_mm=0), self.model)
+        f = res.fila(self.model.tubo("60.3", "2.6"))
+        w = f["kg_m"] * 9.81 / 1000
+        self.assertAlmostEqual(f["flecha_mm"], 5 * w * 3000 ** 4 / (384 * E_ACERO_MPA * float(s["inercia_mm4"][0])))
+        self.assertEqual(float(masa_espira_kg_m(200, 200, 100, 4)), 0.0)
+
+    def test_proposes_lightest_passing_tube(self):
+        r = comprobar_eje_definicion(DEF, self.model, par_nm=0.0)
+        self.assertFalse(r["tubo"]["flecha_ok"])
+        self.assertTrue(texto_comprobacion(r).startswith("NO CUMPLE"))
+        res = comprobar_ejes(r["vano_mm"], Carga(200, 200, 4, 0.3, 0.8, 0.0), self.model)
+        ok = res["ok"]
+        self.assertTrue(ok.any())
+        self.assertEqual(float(res["kg_m"][ok].min()), res.fila(r["propuesto"])["kg_m"])
+
+        # con dos mangones intermedios el vano es 1/3 y el tubo elegido ya cumple
+        tres = comprobar_eje_definicion(
+            dict(DEF, mangones_intermedios=True, num_mangones_intermedios="2"), self.model, par_nm=0.0
+        )
+        self.assertEqual(num_vanos(dict(DEF, mangones_intermedios=True, num_mangones_intermedios="2")), 3)
+        self.assertAlmostEqual(tres["vano_mm"], 5000 / 3)
+        self.assertTrue(tres["tubo"]["ok"])
+
+    def test_cached_by_span_and_load(self):
+        a = comprobar_ejes(4000, Carga(200, 200, 4, 0.3, 0.8, 50.0), self.model)
+        self.assertIs(comprobar_ejes(4000.0, Carga(200.0, 200, 4, 0.3, 0.8, 50), self.model), a)
+        self.assertIsNot(comprobar_ejes(4100, Carga(200, 200, 4, 0.3, 0.8, 50.0), self.model), a)
+        # la caché va por la tupla de tubos, no por el modelo (no retiene modelos recargados)
+        self.assertIs(_comprobar(self.model.tubos, 4000.0, Carga(200.0, 200.0, 4.0, 0.3, 0.8, 50.0)), a)
+        # el material o el nombre no cambian la clave: mismo resultado
+        x = comprobar_eje_definicion(dict(DEF, material="AISI 304"), self.model)
+        y = comprobar_eje_definicion(DEF, self.model)
+        self.assertEqual(x, y)
+        self.assertIsNone(comprobar_eje_definicion({}, self.model)["tubo"])
+
+    def test_pedido(self):
+        con = pedido_db([(1, 5, "A", DEF), (2, 5, "B", None)])
+        res = comprobar_pedido(con, 5, self.model)
+        con.close()
+        self.assertEqual(res[1], comprobar_eje_definicion(DEF, self.model))
+        self.assertIsNone(res[2]["tubo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
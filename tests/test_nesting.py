@@ -0,0 +1,81 @@
+import itertools
+import math
+import os
+import tempfile
+import unittest
+
+from engine.espira import CacheDesarrollos
+from engine.nesting import Chapa, Pieza, _separadas, anidar, anidar_pedidos, piezas_definicion, texto_informe
+from tests.pedido_db import pedido_db
+
+
+def _sin_solapes(test, chapa):
+    for p, q in itertools.combinations(chapa.piezas, 2):
+        test.assertTrue(_separadas(p, q, chapa.separacion - 1e-3), (p, q))
+    for p in chapa.piezas:
+        x0, y0, x1, y1 = p.caja
+        test.assertTrue(x0 >= 0 and y0 >= 0 and x1 <= chapa.ancho and y1 <= chapa.alto)
+
+
+class NestingTest(unittest.TestCase):
+    def test_shapes_and_holes(self):
+        ch = Chapa(1000, 1000, separacion=10, margen=0)
+        self.assertTrue(ch.colocar(Pieza("c", "corona", 300, 150)))
+        # disco y rectángulo pequeños entran en el hueco de la corona
+        self.assertTrue(ch.colocar(Pieza("d", "disco", 100)))
+        self.assertEqual((ch.piezas[1].x, ch.piezas[1].y), (300, 300))
+        self.assertTrue(ch.colocar(Pieza("r", "rect", 600, 300)))
+        # un rectángulo que solo cabe girado
+        ch2 = Chapa(500, 1000, margen=0)
+        self.assertTrue(ch2.colocar(Pieza("r", "rect", 900, 400)))
+        self.assertEqual((ch2.piezas[0].a, ch2.piezas[0].b), (400, 900))
+        self.assertFalse(ch2.colocar(Pieza("r", "rect", 900, 400)))
+        _sin_solapes(self, ch)
+
+    def test_groups_utilisation_and_scale(self):
+        piezas = [
+            Pieza("espira", "corona", 180, 60, "S355", 4, 150),
+            Pieza("espira2", "corona", 120, 40, "S355", 4, 100),
+            Pieza("testero", "rect", 400, 400, "S355", 4, 40),
+            Pieza("tapa", "disco", 30, 0, "S355", 4, 60),
+            Pieza("testero", "rect", 300, 150, "S275JR", 10, 30),
+            Pieza("gigante", "rect", 4000, 100, "S275JR", 10, 1),
+        ]
+        res = anidar(piezas)              # el tiempo, en tests/bench_engine.py
+        self.assertEqual([(r.material, r.espesor) for r in res], [("S275JR", 10.0), ("S355", 4.0)])
+        s275, s355 = res
+        self.assertEqual(s275.no_caben, ["gigante"])
+        self.assertEqual(sum(len(c.piezas) for c in s355.chapas), 350)
+        self.assertAlmostEqual(s355.area_piezas, sum(p.area_real * p.cantidad for p in piezas[:4]))
+        self.assertTrue(0.4 < s355.aprovechamiento < 1.0)
+        # nº de chapas fijo para este lote (y nunca por debajo de la cota por área)
+        self.assertEqual(s355.formatos(), {"3000x1500": 8, "2000x1000": 1})
+        self.assertGreaterEqual(len(s355.chapas), math.ceil(s355.area_piezas / (3000 * 1500)))
+        # la última chapa baja al formato más pequeño en que cabe
+        self.assertEqual(s275.formatos(), {"2000x1000": 1})
+        for c in s275.chapas + s355.chapas:
+            _sin_solapes(self, c)
+        self.assertIn("NO CABEN: gigante", texto_informe(res)[0])
+
+    def test_pedido_blanks(self):
+        defi = {"material": "S355J2+N", "diam_espira": "200", "eje_od": "60,3", "eje_thk": "5",
+                "espesor_espira": "4", "paso1": "200", "longitud_entre_testeros": "2040", "002A_testeros": "8"}
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CacheDesarrollos(os.path.join(tmp, "des.db"))
+            piezas = piezas_definicion(defi, "S1", cache=cache)
+            espiras = [p for p in piezas if p.forma == "corona"]
+            self.assertEqual(sum(p.cantidad for p in espiras), 9)        # (2040 - 20 - 10) // 200
+            self.assertEqual(espiras[0].espesor, 4.0)
+            self.assertAlmostEqual(espiras[0].a - espiras[0].b, (200 - 60.3) / 2)    # corona a altura real
+            testeros = [p for p in piezas if p.forma == "rect"]
+            self.assertEqual((testeros[0].cantidad, testeros[0].espesor), (2, 8.0))
+
+            con = pedido_db([(pid, pid, "S1", defi) for pid in (1, 2)])
+            res = anidar_pedidos(con, [1, 2], cache=cache)
+            self.assertEqual([(r.material, r.espesor) for r in res], [("S355J2+N", 4.0), ("S355J2+N", 8.0)])
+            self.assertEqual(sum(len(c.piezas) for c in res[1].chapas), 4)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from engine.capacidad import capacidad_definicion
+from engine.potencia import (
+    Motorreductores,
+    cargar_motorreductores,
+    potencia,
+    potencia_definicion,
+    potencia_pedido,
+    seleccionar_motorreductor,
+    texto_potencia,
+)
+from tests.pedido_db import pedido_db
+
+DEF = {
+    "diam_espira": "200",
+    "eje_od": "60,3",
+    "paso1": "200",
+    "rpm": "60",
+    "coef_llenado": "0.3",
+    "densidad_aparente": "0.8",
+    "angulo_inclinacion_deg": "0",
+    "sentido_material": "SUBIDA",
+    "longitud_entre_testeros": "5000",
+    "factor_material": "2",
+    "tipo_disposicion": "Directo",
+}
+
+CATALOGO = [
+    {"ref": "A", "kw": 0.37, "rpm": 56, "par": 60, "fs": 1.6, "precio": 70},
+    {"ref": "B", "kw": 0.55, "rpm": 56, "par": 90, "fs": 1.6, "precio": 80},
+    {"ref": "C", "kw": 0.55, "rpm": 56, "par": 90, "fs": 1.6, "precio": 75},
+    {"ref": "D", "kw": 0.75, "rpm": 112, "par": 60, "fs": 1.6, "precio": 60},
+    {"ref": "E", "kw": 1.5, "rpm": 60, "par": 240, "fs": 1.6, "precio": 120},
+]
+
+
+class PotenciaTest(unittest.TestCase):
+    def test_formula(self):
+        r = potencia(10.0, 5.0, 200, angulo_deg=30, lambda_=2.0, rendimiento=0.95)
+        p_h, p_n, p_st = 10 * 5 * 2 / 367, 0.2 * 5 / 20, 10 * 2.5 / 367
+        self.assertAlmostEqual(float(r["p_kw"]), (p_h + p_n + p_st) / 0.95)
+        bajada = potencia(10.0, 5.0, 200, angulo_deg=30, lambda_=2.0, subida=False)
+        self.assertAlmostEqual(float(bajada["p_st_kw"]), 0.0)
+
+    def test_definition_uses_capacity_and_transmission(self):
+        q = capacidad_definicion(DEF)["q_th"]
+        r = potencia_definicion(DEF)
+        self.assertAlmostEqual(r["q_th"], q)
+        self.assertAlmostEqual(r["p_kw"], q * 5 * 2 / 367 + 0.2 * 5 / 20)
+        self.assertAlmostEqual(r["par_nm"], 9550 * r["p_kw"] / 60)
+        self.assertTrue(texto_potencia(r).endswith(" N·m"))
+
+        cadena = potencia_definicion(dict(DEF, tipo_disposicion="Con cadena"))
+        self.assertAlmostEqual(cadena["p_kw"], r["p_kw"] / 0.93)
+        self.assertIsNone(potencia_definicion(dict(DEF, longitud_entre_testeros=""))["p_kw"])
+        self.assertEqual(texto_potencia(potencia_definicion({})), "")
+        self.assertEqual(potencia_definicion({})["motorreductores"], [])
+
+    def test_selection_ranks_by_fit_then_price(self):
+        cat = Motorreductores(CATALOGO)
+        sel = seleccionar_motorreductor(0.5, 80.0, 60, cat)
+        # A: poca potencia; D: rpm fuera de tolerancia; B/C empatan -> el más barato primero
+        self.assertEqual([m["ref"] for m in sel], ["C", "B", "E"])
+        self.assertGreaterEqual(sel[0]["holgura_par"], 1.0)
+        self.assertEqual(seleccionar_motorreductor(50.0, 8000.0, 60, cat), [])
+        self.assertEqual(seleccionar_motorreductor(0.5, 80.0, 60, cat, limit=1)[0]["ref"], "C")
+
+    def test_catalog_file_is_cached_until_it_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mr.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(CATALOGO, f)
+            cat = cargar_motorreductores(path)
+            self.assertIs(cargar_motorreductores(path), cat)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(CATALOGO[:2], f)
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(len(cargar_motorreductores(path)), 2)
+        self.assertTrue(len(cargar_motorreductores()) > 0)
+
+    def test_pedido(self):
+        con = pedido_db([(1, 5, "A", DEF), (2, 5, "B", None)])
+        res = potencia_pedido(con, 5)
+        con.close()
+        self.assertAlmostEqual(res[1]["p_kw"], potencia_definicion(DEF)["p_kw"])
+        self.assertTrue(res[1]["motorreductores"])
+        self.assertTrue(math.isclose(res[1]["motorreductores"][0]["rpm"], 56))
+        self.assertIsNone(res[2]["p_kw"])
+        self.assertEqual(res[2]["motorreductores"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from engine.rodamientos import (
+    L10H_OBJETIVO,
+    TablaRodamientos,
+    cargas_apoyos,
+    empuje_axial_n,
+    ordenar_rodamientos,
+    rodamientos_definicion,
+    rodamientos_pedido,
+    texto_vida,
+    vida,
+)
+from tests.pedido_db import pedido_db
+from utils.catalog_model import Rodamiento
+from utils.catalogs import load_catalogs
+
+DEF = {
+    "diam_espira": "200",
+    "paso1": "200",
+    "eje_od": "60.3",
+    "eje_thk": "2.6",
+    "espesor_espira": "4",
+    "longitud_entre_testeros": "3000",
+    "rpm": "60",
+    "coef_llenado": "0.3",
+    "densidad_aparente": "0.8",
+}
+
+
+class RodamientosTest(unittest.TestCase):
+    def setUp(self):
+        self.cat = load_catalogs()
+
+    def test_iso_281_life(self):
+        t = TablaRodamientos([Rodamiento("A", "A", 55, 100, 25, 143, 166), Rodamiento("X", "X", 55, 100, 25)])
+        v = vida(t, 10000.0, 0.0, 100)
+        self.assertAlmostEqual(float(v["l10h"][0]), 1e6 / 6000 * 14.3 ** (10 / 3))
+        self.assertAlmostEqual(float(v["s0"][0]), 16.6)
+        self.assertTrue(np.isnan(v["l10h"][1]))
+        # con axial por encima de e manda Y2
+        self.assertAlmostEqual(float(vida(t, 1000.0, 1000.0, 100)["p_n"][0]), 0.67 * 1000 + 3.7 * 1000)
+
+    def test_ranking_cheapest_passing_first_then_by_life(self):
+        todos = ordenar_rodamientos(None, 20000.0, 5000.0, 100, self.cat)
+        self.assertEqual(len(todos), 22)
+        ok = [f for f in todos if f["ok"]]
+        self.assertTrue(ok and all(f["l10h"] >= L10H_OBJETIVO for f in ok))
+        self.assertEqual([f["coste"] for f in ok], sorted(f["coste"] for f in ok))
+        resto = todos[len(ok):]
+        self.assertFalse(any(f["ok"] for f in resto))
+        self.assertEqual([f["l10h"] for f in resto], sorted((f["l10h"] for f in resto), reverse=True))
+        # solo los candidatos pedidos
+        self.assertEqual({f["name"] for f in ordenar_rodamientos(["SKF 22311 E", "SKF 22211 E"], 1, 0, 60, self.cat)},
+                         {"SKF 22211 E", "SKF 22311 E"})
+
+    def test_definition_loads_and_default_order(self):
+        cargas = cargas_apoyos(DEF, self.cat["_model"], par_nm=100.0)
+        self.assertGreater(cargas["fa_conduccion"], 0)
+        self.assertEqual(cargas["fa_conducido"], 0.0)
+        self.assertAlmostEqual(cargas["fa_conduccion"], empuje_axial_n(100.0, 200, 60.3, 200))
+
+        r = rodamientos_definicion(DEF, self.cat)
+        self.assertEqual({f["name"] for f in r["conduccion"]}, {"SKF 22211 E", "SKF 22311 E"})
+        self.assertEqual(r["conduccion"][0]["name"], "SKF 22211 E")   # cumple y es el más barato
+        self.assertTrue(texto_vida(r["conduccion"][0]).endswith("OK"))
+        self.assertEqual(rodamientos_definicion(dict(DEF, rpm=""), self.cat)["conduccion"], [])
+        self.assertEqual(texto_vida(None), "")
+
+    def test_pedido(self):
+        con = pedido_db([(1, 5, "A", DEF)])
+        res = rodamientos_pedido(con, 5, self.cat)
+        con.close()
+        self.assertEqual(res[1], rodamientos_definicion(DEF, self.cat))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import math
+import unittest
+
+from engine.sinfin import calcular
+from engine.tornilleria import (
+    APLASTAMIENTO_ADM_MPA,
+    TAU_ADM_MPA,
+    capacidad_par_nm,
+    metrica_definicion,
+    seleccionar_tornillo,
+    tabla_metricas,
+    texto_tornillos,
+    tornillo_definicion,
+    tornillos_pedido,
+)
+from tests.pedido_db import pedido_db
+from utils.catalogs import load_catalogs
+
+DEF = {"eje_od": "60.3", "eje_thk": "2.6"}
+
+
+class TornilleriaTest(unittest.TestCase):
+    def test_capacity_table(self):
+        t = tabla_metricas(("M16", "M12", "m30", "X"))
+        self.assertEqual(t.textos, ("M12", "M16", "M30"))
+        cap = capacidad_par_nm(t, 55.1, 2.6)
+        por_plano = min(math.pi / 4 * 144 * TAU_ADM_MPA, 12 * 2.6 * APLASTAMIENTO_ADM_MPA)
+        self.assertAlmostEqual(float(cap[0]), 2 * 55.1 * por_plano / 1000)
+        # M30 en ID 55: agujero demasiado grande
+        self.assertEqual(float(cap[2]), 0.0)
+
+    def test_smallest_passing_metric(self):
+        # sin par: la regla de siempre (M12 x ID+25 a 5)
+        self.assertEqual(seleccionar_tornillo(0, 55.1, 2.6)["texto"], "M12x85")
+        sel = seleccionar_tornillo(900, 55.1, 2.6)
+        self.assertEqual(sel["metrica"], "M14")
+        self.assertLessEqual(sel["utilizacion"], 1.0)
+        self.assertIsNone(seleccionar_tornillo(10000, 55.1, 2.6))
+
+    def test_definition_and_pedido(self):
+        cat = load_catalogs()
+        self.assertEqual(tornillo_definicion(DEF, cat, par_nm=0.0)["texto"], "M12x85")
+        self.assertIsNone(tornillo_definicion({}, cat))
+
+        con = pedido_db([(1, 5, "A", DEF)])
+        res = tornillos_pedido(con, 5, cat)
+        con.close()
+        self.assertEqual(res[1]["texto"], "M12x85")
+
+    def test_metric_stays_pure_when_torque_fails(self):
+        cat = load_catalogs()
+        t = metrica_definicion(DEF, cat, par_nm=10000.0)
+        self.assertEqual((t["texto"], t["ok"]), ("M12x85", False))
+        self.assertTrue(texto_tornillos(t).startswith("NO CUMPLE"))
+        self.assertTrue(metrica_definicion(DEF, cat, par_nm=0.0)["ok"])
+        self.assertIsNone(metrica_definicion({}, cat))
+        self.assertEqual(texto_tornillos(None), "")
+
+        out = calcular(dict(DEF, diam_espira="200", paso1="200"), catalogs=cat, par_nm=10000.0)
+        self.assertEqual((out["metrica_tornillos"], out["tornillos_ok"]), ("M12x85", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import math
+import unittest
+
+import numpy as np
+
+from engine.vibracion import (
+    _mapa,
+    INTERMEDIOS_MAX,
+    Espira,
+    critica_definicion,
+    critica_pedido,
+    mapa_critico,
+    texto_critica,
+    velocidad_critica,
+)
+from tests.pedido_db import pedido_db
+from utils.catalogs import load_catalogs
+
+DEF = {
+    "diam_espira": "200",
+    "paso1": "200",
+    "eje_od": "60.3",
+    "eje_thk": "2.6",
+    "espesor_espira": "4",
+    "longitud_entre_testeros": "8000",
+    "rpm": "120",
+}
+
+
+class VibracionTest(unittest.TestCase):
+    def setUp(self):
+        self.model = load_catalogs()["_model"]
+
+    def test_formula(self):
+        # viga biapoyada: n_c = 30/π · (π/L)² · √(EI/m)
+        ei = 210e9 * 1e6 * 1e-12
+        esperado = 30 / math.pi * (math.pi / 2.0) ** 2 * math.sqrt(ei / 10.0)
+        self.assertAlmostEqual(float(velocidad_critica(1e6, 10.0, 2000)), esperado)
+        # la mitad de vano -> cuatro veces la crítica
+        self.assertAlmostEqual(float(velocidad_critica(1e6, 10.0, 1000)), 4 * esperado)
+
+    def test_matrix_tubes_by_supports(self):
+        mapa = mapa_critico(8000, Espira(200, 200, 4), self.model)
+        self.assertEqual(mapa.rpm_c.shape, (len(self.model.tubos), INTERMEDIOS_MAX + 1))
+        self.assertTrue(np.all(np.diff(mapa.rpm_c, axis=1) > 0))
+        self.assertIs(mapa_critico(8000.0, Espira(200.0, 200, 4), self.model), mapa)
+        # la caché va por la tupla de tubos, no por el modelo (no retiene modelos recargados)
+        self.assertIs(_mapa(self.model.tubos, 8000.0, Espira(200.0, 200.0, 4.0), INTERMEDIOS_MAX), mapa)
+
+        nec = mapa.intermedios_necesarios(120)
+        i = mapa.posicion(self.model.tubo("60.3", "2.6"))
+        self.assertTrue(mapa.cumple(120)[i, nec[i]])
+        self.assertFalse(mapa.cumple(120)[i, nec[i] - 1])
+        self.assertEqual(int(mapa.intermedios_necesarios(1e9)[i]), -1)
+
+    def test_definition_suggests_intermediate_supports(self):
+        r = critica_definicion(DEF, self.model)
+        self.assertFalse(r["ok"])
+        self.assertEqual(r["intermedios_necesarios"], 1)
+        self.assertIn("NO CUMPLE", texto_critica(r))
+
+        con_uno = critica_definicion(dict(DEF, mangones_intermedios=True, num_mangones_intermedios="1"), self.model)
+        self.assertTrue(con_uno["ok"])
+        self.assertAlmostEqual(con_uno["rpm_critica"], 4 * r["rpm_critica"])
+        self.assertIsNone(critica_definicion(dict(DEF, eje_od=""), self.model)["rpm_critica"])
+        self.assertEqual(texto_critica(critica_definicion({}, self.model)), "")
+
+    def test_pedido(self):
+        con = pedido_db([(1, 5, "A", DEF)])
+        res = critica_pedido(con, 5, self.model)
+        con.close()
+        self.assertEqual(res[1], critica_definicion(DEF, self.model))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# utils/autocomplete.py
+"""
+Índice de autocompletado para los combos de catálogo (sin dependencias de interfaz).
+
+    idx = PrefixIndex(["SKF 22208 E", "SKF 22312 E", ...])
+    idx.search("2231")        # -> ["SKF 22312 E", ...]  (prefijo de cualquier palabra)
+    idx.search("s2e", fuzzy=True)
+
+Las claves se normalizan una vez al construir (minúsculas, sin tildes, coma decimal
+como punto) y se guardan ordenadas: cada búsqueda por prefijo es un bisect + slice,
+así el filtrado cabe de sobra en un frame aunque el catálogo tenga miles de entradas.
+El difuso (subsecuencia: "s2e" casa con "SKF 22208 E") solo se lanza si los prefijos
+no llenan el límite, y es una única regex sobre todas las claves concatenadas.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Mayor que cualquier carácter normalizado: fin de rango de prefijo
+_HIGH = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Clave de búsqueda: sin tildes, casefold y coma decimal -> punto."""
+    s = unicodedata.normalize("NFKD", str(text or ""))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.casefold().replace(",", ".").split())
+
+
+class PrefixIndex:
+    """
+    Índice ordenado de prefijos sobre las entradas de un catálogo.
+    Cada entrada se indexa por el texto completo y por cada palabra ("SKF 22212 E"
+    se encuentra por "skf", "222" o "e"). Los resultados salen en orden de catálogo,
+    primero los que empiezan por la consulta y después los de palabra interior.
+    """
+
+    __slots__ = ("values", "_norm", "_keys", "_ids", "_blob", "_starts")
+
+    def __init__(self, values: Iterable[str]):
+        self.values: Tuple[str, ...] = tuple(str(v) for v in values)
+        self._norm: Tuple[str, ...] = tuple(normalize(v) for v in self.values)
+
+        pares: List[Tuple[str, int]] = []
+        for i, key in enumerate(self._norm):
+            pares.append((key, i))
+            pos = key.find(" ")
+            while pos >= 0:
+                pares.append((key[pos + 1:], i))
+                pos = key.find(" ", pos + 1)
+        pares.sort()
+        self._keys: List[str] = [k for k, _ in pares]
+        self._ids: List[int] = [i for _, i in pares]
+
+        # claves sin espacios, una por línea, para el difuso
+        compactas = [k.replace(" ", "") for k in self._norm]
+        self._blob = "\n".join(compactas)
+        self._starts: List[int] = []
+        pos = 0
+        for k in compactas:
+            self._starts.append(pos)
+            pos += len(k) + 1
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def prefix(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Entradas con alguna palabra que empieza por la consulta."""
+        q = normalize(query)
+        if not q:
+            return list(self.values[:limit])
+
+        lo = bisect_left(self._keys, q)
+        hi = bisect_left(self._keys, q + _HIGH, lo)
+        ids = set(self._ids[lo:hi])
+        # empieza-por delante, luego palabra interior; dentro, orden de catálogo
+        orden = sorted(ids, key=lambda i: (not self._norm[i].startswith(q), i))
+        return [self.values[i] for i in orden[:limit]]
+
+    def fuzzy(self, query: str, limit: Optional[int] = None, exclude: Sequence[str] = ()) -> List[str]:
+        """Entradas que contienen la consulta como subsecuencia (mejor cuanto más compacta)."""
+        q = normalize(query).replace(" ", "")
+        if not q:
+            return []
+        skip = set(exclude)
+        pat = re.compile("[^\n]*?".join(re.escape(ch) for ch in q))
+        best = {}
+        for m in pat.finditer(self._blob):
+            i = bisect_right(self._starts, m.start()) - 1
+            if i in best or self.values[i] in skip:
+                continue
+            # (hueco entre letras, posición en la clave)
+            best[i] = (m.end() - m.start() - len(q), m.start() - self._starts[i])
+        orden = sorted(best, key=lambda i: (best[i], i))
+        return [self.values[i] for i in orden[:limit]]
+
+    def search(self, query: str, limit: Optional[int] = 50, fuzzy: bool = False) -> List[str]:
+        """Prefijos y, si se pide y no se llega al límite, difusos a continuación."""
+        out = self.prefix(query, limit)
+        if fuzzy and (limit is None or len(out) < limit):
+            rest = None if limit is None else limit - len(out)
+            out.extend(self.fuzzy(query, rest, exclude=out))
+        return out
@@ -0,0 +1,319 @@
+# utils/catalog_build.py
+"""
+Pipeline de build de catálogos: data/*.csv -> data/catalogos.json (+ snapshot compilado).
+
+    python -m utils.catalog_build           # incremental
+    python -m utils.catalog_build --full    # reconstruye todas las secciones
+
+Cada CSV alimenta una o varias secciones del JSON. En data/catalogos.build.json se
+guarda el SHA-1 de cada fuente: solo se rehacen las secciones cuya fuente cambió.
+Las secciones que no salen de ningún CSV (materials, metricas_tornillos,
+tipo_disposicion, posicion_motor, eje_dim...) se conservan tal cual del JSON actual.
+
+Los CSV vienen de Excel (ES): separador ';', coma decimal y cabeceras entre comillas
+que pueden ocupar varias líneas ("Pasos\\nEspiras").
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.catalog_model import parse_num
+from utils.rodamientos_ingest import public_record, to_float
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+OUT_JSON = os.path.join(DATA_DIR, "catalogos.json")
+MANIFEST = os.path.join(DATA_DIR, "catalogos.build.json")
+
+
+class CatalogBuildError(ValueError):
+    """Errores de validación de una fuente: no se escribe nada."""
+
+
+# ------------------ Lectura CSV ------------------
+
+# Excel ES exporta con ';' y coma decimal: un CSV sin ';' es de una sola columna
+# ("1,5" en Espesor_Chapa.csv es 1.5, no dos campos)
+DELIMITER = ";"
+
+
+def _norm_header(h: str) -> str:
+    return " ".join(str(h or "").split())
+
+
+def read_csv_table(path: str) -> Tuple[List[str], List[List[str]]]:
+    """Devuelve (cabeceras normalizadas, filas). Las cabeceras multi-línea quedan en una línea."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=DELIMITER)
+        rows = [[c.strip() for c in row] for row in reader]
+
+    if not rows:
+        return [], []
+    header = [_norm_header(h) for h in rows[0]]
+    body = [r for r in rows[1:] if any(c for c in r)]
+    return header, body
+
+
+def num_text(value: float) -> str:
+    """Texto de catálogo para un número: 60.3, 2.5, 1500 (punto decimal, sin ceros de más)."""
+    return ("%.6f" % value).rstrip("0").rstrip(".")
+
+
+# ------------------ Builders por fuente ------------------
+
+def _numeric_column(path: str, col: int = 0) -> Tuple[List[str], List[str]]:
+    """
+    Columna numérica estrictamente creciente (vacíos al final permitidos). Un valor
+    repetido o fuera de orden es error: las listas alimentan combos ordenados.
+    Devuelve (valores, avisos).
+    """
+    _, rows = read_csv_table(path)
+    name = os.path.basename(path)
+    out: List[str] = []
+    errors: List[str] = []
+    warnings: List[str] = []
+    seen = set()
+    prev = None
+
+    for i, row in enumerate(rows, start=2):
+        raw = row[col] if col < len(row) else ""
+        if not raw:
+            continue
+        v = parse_num(raw)
+        if v is None or v <= 0:
+            errors.append(f"{name}:{i}: valor no válido {raw!r}")
+            continue
+        t = num_text(v)
+        if t in seen:
+            errors.append(f"{name}:{i}: valor repetido {raw!r}")
+            continue
+        if prev is not None and v < prev:
+            errors.append(f"{name}:{i}: fuera de orden {raw!r}")
+        seen.add(t)
+        prev = v
+        out.append(t)
+
+    if errors:
+        raise CatalogBuildError("\n".join(errors))
+    if not out:
+        raise CatalogBuildError(f"{name}: sin valores")
+    return out, warnings
+
+
+def build_diam_espira(path: str):
+    vals, warn = _numeric_column(path, 0)
+    return {"diam_espira": vals}, warn
+
+
+def build_pasos(path: str):
+    vals, warn = _numeric_column(path, 0)
+    return {"pasos": vals}, warn
+
+
+def build_espesores_chapa(path: str):
+    vals, warn = _numeric_column(path, 0)
+    return {"espesores_chapa": vals}, warn
+
+
+def build_distancia_testeros(path: str):
+    vals, warn = _numeric_column(path, 0)
+    return {"distancia_testeros": vals}, warn
+
+
+def build_tubos(path: str):
+    """Lista_eje_tubo.csv: D_exterior_mm;Espesor_mm;d_interior_mm;Plano Testeros"""
+    _, rows = read_csv_table(path)
+    name = os.path.basename(path)
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    eje_od: List[str] = []
+    espesores_by_od: Dict[str, List[str]] = {}
+    planos: List[Dict[str, str]] = []
+    for i, row in enumerate(rows, start=2):
+        row = row + [""] * (4 - len(row))
+        od = parse_num(row[0])
+        thk = parse_num(row[1])
+        di = parse_num(row[2])
+        if od is None or thk is None or od <= 0 or thk <= 0 or 2 * thk >= od:
+            errors.append(f"{name}:{i}: tubo no válido {row[:2]!r}")
+            continue
+        if di is not None and abs((od - 2 * thk) - di) > 0.05:
+            warnings.append(f"{name}:{i}: d_interior {row[2]} no cuadra con {num_text(od - 2 * thk)}")
+
+        od_t = num_text(od)
+        thk_t = num_text(thk)
+        if od_t not in espesores_by_od:
+            eje_od.append(od_t)
+            espesores_by_od[od_t] = []
+        if thk_t in espesores_by_od[od_t]:
+            warnings.append(f"{name}:{i}: tubo repetido {od_t}x{thk_t}")
+            continue
+        espesores_by_od[od_t].append(thk_t)
+        if row[3]:
+            planos.append({"od": od_t, "thk": thk_t, "id": num_text(od - 2 * thk), "plano": row[3]})
+
+    if errors:
+        raise CatalogBuildError("\n".join(errors))
+    return {"eje_od": eje_od, "espesores_by_od": espesores_by_od, "planos_testeros": planos}, warnings
+
+
+def build_rodamientos(path: str):
+    """rodamientos.csv: Serie;Referencia;d_mm;D_mm;B_mm[;C_kN;C0_kN] (mismo formato que utils.rodamientos_ingest)"""
+    header, rows = read_csv_table(path)
+    name = os.path.basename(path)
+    # d_mm / D_mm solo se distinguen por mayúsculas: búsqueda exacta
+    idx = {h: i for i, h in enumerate(header)}
+
+    def col(row, *names):
+        for n in names:
+            i = idx.get(n)
+            if i is not None and i < len(row):
+                return row[i]
+        return ""
+
+    errors: List[str] = []
+    warnings: List[str] = []
+    items: List[Dict[str, Any]] = []
+    refs = set()
+    for i, row in enumerate(rows, start=2):
+        serie = col(row, "Serie")
+        ref_name = col(row, "Referencia", "REF")
+        if not serie and not ref_name:
+            continue
+        d = parse_num(col(row, "d_mm", "d"))
+        D = parse_num(col(row, "D_mm", "D"))
+        B = parse_num(col(row, "B_mm", "B"))
+        if d is None or D is None or d <= 0 or D <= d:
+            errors.append(f"{name}:{i}: dimensiones no válidas d={d} D={D}")
+            continue
+        ref = serie or ref_name
+        if ref in refs:
+            warnings.append(f"{name}:{i}: ref repetida {ref!r} (se ignora)")
+            continue
+        refs.add(ref)
+        items.append(public_record({
+            "ref": ref,
+            "name": ref_name or serie,
+            "d": d,
+            "D": D,
+            "B": B,
+            "C": to_float(col(row, "C_kN", "C")),
+            "C0": to_float(col(row, "C0_kN", "C0")),
+        }))
+
+    if errors:
+        raise CatalogBuildError("\n".join(errors))
+    return {"rodamientos": items, "rodamiento_names": [it["name"] for it in items]}, warnings
+
+
+# fuente -> builder (cada builder devuelve ({sección: valor}, avisos))
+SOURCES: Dict[str, Callable[[str], Tuple[Dict[str, Any], List[str]]]] = {
+    "Diametro_Ext_Espiras.csv": build_diam_espira,
+    "Pasos_Espiras.csv": build_pasos,
+    "Espesor_Chapa.csv": build_espesores_chapa,
+    "Distancia_Testeros.csv": build_distancia_testeros,
+    "Lista_eje_tubo.csv": build_tubos,
+    "rodamientos.csv": build_rodamientos,
+}
+
+
+# ------------------ Pipeline ------------------
+
+def _sha1_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_catalogs(
+    data_dir: str = DATA_DIR,
+    out_json: Optional[str] = None,
+    manifest_path: Optional[str] = None,
+    full: bool = False,
+    snapshot: bool = True,
+) -> Dict[str, Any]:
+    """
+    Ejecuta el pipeline. Devuelve un informe:
+      {"rebuilt": [fuentes], "skipped": [fuentes], "warnings": [...], "written": bool}
+    Lanza CatalogBuildError si alguna fuente no valida (sin tocar el JSON).
+    """
+    out_json = out_json or os.path.join(data_dir, "catalogos.json")
+    manifest_path = manifest_path or os.path.join(data_dir, "catalogos.build.json")
+
+    catalog = _read_json(out_json, {})
+    manifest = {} if full else _read_json(manifest_path, {})
+    new_manifest: Dict[str, Any] = {}
+    report: Dict[str, Any] = {"rebuilt": [], "skipped": [], "warnings": [], "written": False}
+
+    for source, builder in SOURCES.items():
+        path = os.path.join(data_dir, source)
+        if not os.path.exists(path):
+            continue
+        sha1 = _sha1_file(path)
+        prev = manifest.get(source, {})
+        sections_present = all(sec in catalog for sec in prev.get("sections", []))
+
+        if prev.get("sha1") == sha1 and prev.get("sections") and sections_present:
+            new_manifest[source] = prev
+            report["skipped"].append(source)
+            continue
+
+        sections, warnings = builder(path)
+        catalog.update(sections)
+        new_manifest[source] = {"sha1": sha1, "sections": sorted(sections)}
+        report["rebuilt"].append(source)
+        report["warnings"].extend(warnings)
+
+    if report["rebuilt"]:
+        tmp = out_json + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp, out_json)
+        report["written"] = True
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+
+    if snapshot:
+        from utils.catalog_snapshot import compile_snapshot, read_snapshot
+        from utils.catalogs import load_catalogs
+
+        if report["written"] or read_snapshot(out_json) is None:
+            compile_snapshot(load_catalogs(out_json, use_snapshot=False), out_json)
+            report["snapshot"] = True
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        report = build_catalogs(full="--full" in argv)
+    except CatalogBuildError as e:
+        print(f"[ERROR] Catálogos no generados:\n{e}")
+        raise SystemExit(1)
+
+    for w in report["warnings"]:
+        print(f"[AVISO] {w}")
+    for s in report["rebuilt"]:
+        print(f"[OK] Rehecho : {s}")
+    for s in report["skipped"]:
+        print(f"[OK] Sin cambios: {s}")
+    print(f"[OK] JSON: {OUT_JSON}" + ("" if report["written"] else " (sin cambios)"))
+
+
+if __name__ == "__main__":
+    main()
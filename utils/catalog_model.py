@@ -0,0 +1,599 @@
+# utils/catalog_model.py
+"""
+Capa tipada de catálogos: los números del JSON vienen como texto ("60,3", "2,5")
+y aquí se parsean UNA sola vez al cargar. Cada registro guarda el valor numérico y
+el texto original (el que se muestra en los combos), así los callbacks de la UI
+no vuelven a hacer replace(",", ".") + float() en cada pulsación.
+
+Sin dependencias de interfaz: se puede usar desde la UI, exportadores o scripts.
+"""
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+def parse_num(text: Any) -> Optional[float]:
+    """Texto -> float admitiendo coma decimal. Devuelve None si no es número."""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return float(text)
+    s = str(text).strip()
+    if not s:
+        return None
+    try:
+        return float(s.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def num_key(text: Any) -> str:
+    """Clave normalizada para buscar por texto ("60,3" y " 60.3" -> "60.3")."""
+    return str(text if text is not None else "").strip().replace(",", ".")
+
+
+class NumText:
+    """Valor de catálogo: número ya parseado + texto original para mostrar."""
+
+    __slots__ = ("value", "text")
+
+    def __init__(self, value: float, text: str):
+        self.value = value
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"NumText({self.value!r}, {self.text!r})"
+
+
+class Tubo:
+    """Tubo de catálogo (eje o camisa). id = od - 2*thk."""
+
+    __slots__ = ("od", "thk", "id", "od_text", "thk_text")
+
+    def __init__(self, od: float, thk: float, od_text: str = "", thk_text: str = ""):
+        self.od = od
+        self.thk = thk
+        self.id = od - 2.0 * thk
+        self.od_text = od_text or f"{od:g}"
+        self.thk_text = thk_text or f"{thk:g}"
+
+    @property
+    def mecanizado_mm(self) -> float:
+        """Diferencia OD-ID (lo que se valida para el mecanizado)."""
+        return self.od - self.id
+
+    def __repr__(self) -> str:
+        return f"Tubo({self.od_text}x{self.thk_text})"
+
+
+class Rodamiento:
+    """Rodamiento de catálogo con dimensiones (mm) y capacidades C/C0 (kN) ya en float (None si faltan)."""
+
+    __slots__ = ("ref", "name", "d", "D", "B", "C", "C0")
+
+    def __init__(
+        self,
+        ref: str,
+        name: str,
+        d: Optional[float],
+        D: Optional[float],
+        B: Optional[float],
+        C: Optional[float] = None,
+        C0: Optional[float] = None,
+    ):
+        self.ref = ref
+        self.name = name
+        self.d = d
+        self.D = D
+        self.B = B
+        self.C = C
+        self.C0 = C0
+
+    def __repr__(self) -> str:
+        return f"Rodamiento({self.name!r}, d={self.d})"
+
+
+class RodamientoIndex:
+    """
+    Índice de rodamientos ordenado por Ø interior (d) para consultas por rango con bisect.
+    Los nombres se deduplican al construir (se queda la primera aparición por d creciente),
+    así cada consulta devuelve directamente un slice.
+    """
+
+    __slots__ = ("_ds", "_names", "_todos")
+
+    def __init__(self, rodamientos: Iterable[Rodamiento]):
+        rods = list(rodamientos)
+        con_d = sorted((r for r in rods if r.d is not None), key=lambda r: r.d)  # estable
+
+        seen = set()
+        ds: List[float] = []
+        names: List[str] = []
+        for r in con_d:
+            if r.name in seen:
+                continue
+            seen.add(r.name)
+            ds.append(r.d)
+            names.append(r.name)
+        self._ds = ds
+        self._names = names
+
+        seen = set()
+        todos: List[str] = []
+        for r in rods:
+            if r.name not in seen:
+                seen.add(r.name)
+                todos.append(r.name)
+        self._todos = todos
+
+    def __len__(self) -> int:
+        return len(self._todos)
+
+    def por_diametro(self, d: float, tol: float = 0.1) -> List[str]:
+        """Nombres con |d_rod - d| <= tol (orden por d)."""
+        lo = bisect_left(self._ds, d - tol)
+        hi = bisect_right(self._ds, d + tol)
+        return self._names[lo:hi]
+
+    def menores_que(self, od: float) -> List[str]:
+        """Nombres con d_rod < od (orden por d)."""
+        return self._names[:bisect_left(self._ds, od)]
+
+    def todos(self) -> List[str]:
+        """Todos los nombres en orden de catálogo."""
+        return list(self._todos)
+
+
+# Holgura diametral camisa-espira (4 mm por lado)
+CAMISA_HOLGURA_MM = 8.0
+
+
+class TuboIndex:
+    """
+    Tubos ordenados por Ø interior para elegir camisa con un solo bisect.
+    El orden es estable: a igual ID gana el primero del catálogo (menor OD).
+    Pensado también para procesos por lotes (miles de camisas con el mismo índice).
+    """
+
+    __slots__ = ("_ids", "_tubos")
+
+    def __init__(self, tubos: Iterable[Tubo]):
+        ordenados = sorted(tubos, key=lambda t: t.id)
+        self._tubos: List[Tubo] = ordenados
+        self._ids: List[float] = [t.id for t in ordenados]
+
+    def __len__(self) -> int:
+        return len(self._tubos)
+
+    def ordenados(self) -> List[Tubo]:
+        """Tubos por ID creciente (posiciones estables para procesos vectorizados)."""
+        return list(self._tubos)
+
+    def minimo_id(self, id_min: float) -> Optional[Tubo]:
+        """Tubo más pequeño con ID >= id_min (None si ninguno llega)."""
+        i = bisect_left(self._ids, id_min)
+        return self._tubos[i] if i < len(self._tubos) else None
+
+    def mayor(self) -> Optional[Tubo]:
+        """Tubo de mayor ID (el primero del catálogo si hay empate)."""
+        if not self._tubos:
+            return None
+        return self._tubos[bisect_left(self._ids, self._ids[-1])]
+
+    def camisa(self, diam_espira: float, holgura: float = CAMISA_HOLGURA_MM) -> Optional[Tubo]:
+        """
+        Camisa para una espira: menor tubo con ID >= Ø_espira + holgura.
+        Si ninguno cumple devuelve el de mayor ID (mismo criterio que la UI).
+        """
+        t = self.minimo_id(diam_espira + holgura)
+        return t if t is not None else self.mayor()
+
+    def camisas(self, diametros: Iterable[float], holgura: float = CAMISA_HOLGURA_MM) -> List[Optional[Tubo]]:
+        """Versión por lotes de camisa()."""
+        ids = self._ids
+        tubos = self._tubos
+        n = len(tubos)
+        fallback = self.mayor()
+        out: List[Optional[Tubo]] = []
+        for de in diametros:
+            i = bisect_left(ids, de + holgura)
+            out.append(tubos[i] if i < n else fallback)
+        return out
+
+
+def tubo_key(od: float, thk: float) -> Tuple[float, float]:
+    """Clave hash de un tubo: (OD, espesor) redondeados (60.3 == 60.30 == "60,3")."""
+    return (round(od, 2), round(thk, 2))
+
+
+class PlanoTesteros:
+    """Fila de Lista_eje_tubo.csv: tubo (OD x espesor, ID) -> código de plano de testeros."""
+
+    __slots__ = ("od", "thk", "id", "codigo")
+
+    def __init__(self, od: float, thk: float, id_mm: float, codigo: str):
+        self.od = od
+        self.thk = thk
+        self.id = id_mm
+        self.codigo = codigo
+
+    def __repr__(self) -> str:
+        return f"PlanoTesteros({self.codigo!r})"
+
+
+class PlanoIndex:
+    """
+    Códigos de plano de testeros:
+      - hash por (OD, espesor) normalizados -> O(1) para el tubo elegido en la UI
+      - lista ordenada por ID -> búsqueda por Ø interior con bisect
+    """
+
+    __slots__ = ("_by_key", "_ids", "_planos")
+
+    def __init__(self, planos: Iterable[PlanoTesteros]):
+        planos = list(planos)
+        self._by_key: Dict[Tuple[float, float], PlanoTesteros] = {}
+        for p in planos:
+            self._by_key.setdefault(tubo_key(p.od, p.thk), p)
+        self._planos: List[PlanoTesteros] = sorted(planos, key=lambda p: p.id)
+        self._ids: List[float] = [p.id for p in self._planos]
+
+    def __len__(self) -> int:
+        return len(self._planos)
+
+    def por_tubo(self, od: Optional[float], thk: Optional[float]) -> Optional[PlanoTesteros]:
+        if od is None or thk is None:
+            return None
+        return self._by_key.get(tubo_key(od, thk))
+
+    def codigo(self, od: Optional[float], thk: Optional[float]) -> str:
+        """Código de plano del tubo ("" si no está en la lista)."""
+        p = self.por_tubo(od, thk)
+        return p.codigo if p is not None else ""
+
+    def por_id(self, id_mm: float, tol: float = 0.05) -> List[PlanoTesteros]:
+        """Planos de tubos con |ID - id_mm| <= tol (orden por ID)."""
+        lo = bisect_left(self._ids, id_mm - tol)
+        hi = bisect_right(self._ids, id_mm + tol)
+        return self._planos[lo:hi]
+
+    def codigos(self, tubos: Iterable[Tuple[Optional[float], Optional[float]]]) -> List[str]:
+        """Versión por lotes de codigo() (p.ej. todos los sinfines de un pedido)."""
+        get = self._by_key.get
+        out: List[str] = []
+        for od, thk in tubos:
+            p = get(tubo_key(od, thk)) if od is not None and thk is not None else None
+            out.append(p.codigo if p is not None else "")
+        return out
+
+
+# Reglas del tubo eje (antes repartidas por los callbacks de SinfinWindow)
+MECANIZADO_MIN_MM = 4.0        # OD - ID admisible para mecanizar
+MECANIZADO_MAX_MM = 6.0
+RODAMIENTO_TOL_MM = 0.1        # d del rodamiento == ID del tubo (± tol)
+TUBO_INT_HOLGURA_MM = 0.2      # Ø tubo interior = ID + 0.2 (barra de compra: a 5 por arriba)
+MANGON_HOLGURA_MM = 10.0       # mangón = ID + 10, a 5 por arriba
+TORNILLO_METRICA = "M12"
+TORNILLO_HOLGURA_MM = 25.0     # largo tornillo = ID + 25, a 5 por arriba
+
+
+def ceil_to_5(x: float) -> int:
+    return int(math.ceil(x / 5.0) * 5)
+
+
+class Compatibilidad:
+    """
+    Fila de la matriz de compatibilidad de un tubo eje: todo lo que la UI deduce al
+    elegir (OD, espesor), ya calculado.
+    """
+
+    __slots__ = ("tubo", "mecanizado_ok", "rodamientos", "tubo_int", "mangon_stock", "mangon", "tornillo_len")
+
+    def __init__(self, tubo: Tubo, rod_index: RodamientoIndex):
+        id_mm = tubo.id
+        self.tubo = tubo
+        self.mecanizado_ok = MECANIZADO_MIN_MM <= tubo.mecanizado_mm <= MECANIZADO_MAX_MM
+        self.rodamientos: Tuple[str, ...] = tuple(rod_index.por_diametro(id_mm, RODAMIENTO_TOL_MM))
+        self.tubo_int = id_mm + TUBO_INT_HOLGURA_MM
+        self.mangon_stock = ceil_to_5(self.tubo_int)
+        self.mangon = ceil_to_5(id_mm + MANGON_HOLGURA_MM)
+        self.tornillo_len = ceil_to_5(id_mm + TORNILLO_HOLGURA_MM)
+
+    @property
+    def id(self) -> float:
+        return self.tubo.id
+
+    @property
+    def tornillos(self) -> str:
+        return f"{TORNILLO_METRICA}x{self.tornillo_len}"
+
+    def __repr__(self) -> str:
+        return f"Compatibilidad({self.tubo!r}, ok={self.mecanizado_ok}, rod={len(self.rodamientos)})"
+
+
+# Secciones "lista de números" del JSON que pasan a tuplas de NumText
+NUM_SECTIONS = ("diam_espira", "pasos", "espesores_chapa", "distancia_testeros", "eje_dim")
+
+
+class CatalogModel:
+    """
+    Catálogos ya parseados.
+      - tubos: todos los (od, thk) de eje_od/espesores_by_od, orden de catálogo
+        (+ tubo_index ordenado por ID para elegir camisa)
+      - rodamientos: registros con d/D/B numéricos (+ rod_index ordenado por d)
+      - listas numéricas (pasos, diam_espira, ...) como tuplas de NumText
+      - planos: códigos de plano de testeros por tubo (planos_testeros)
+      - compat: matriz de compatibilidad (una fila Compatibilidad por tubo de catálogo)
+
+    Cada parte (tubos, rodamientos, cada lista) se construye la primera vez que se usa;
+    `built` guarda los ms que costó cada una (perfil de arranque).
+    """
+
+    __slots__ = (
+        "_src", "_tubos", "_tubo_index", "_rodamientos", "_rod_by_name", "_rod_index",
+        "_listas", "_tubo_by_key", "_od_by_key", "_valores", "_planos", "built",
+        "_tubo_by_num", "_thk_by_od", "_rod_by_ref", "_compat",
+    )
+
+    def __init__(self, src: Optional[Mapping[str, Any]] = None):
+        self._src = src if src is not None else {}
+        self._tubos: Optional[Tuple[Tubo, ...]] = None
+        self._tubo_index = TuboIndex(())
+        self._rodamientos: Optional[Tuple[Rodamiento, ...]] = None
+        self._rod_by_name: Dict[str, Rodamiento] = {}
+        self._rod_index = RodamientoIndex(())
+        self._listas: Dict[str, Tuple[NumText, ...]] = {}
+        self._tubo_by_key: Dict[Tuple[str, str], Tubo] = {}
+        self._tubo_by_num: Dict[Tuple[float, float], Tubo] = {}
+        self._thk_by_od: Dict[float, Tuple[str, ...]] = {}
+        self._rod_by_ref: Dict[str, Rodamiento] = {}
+        self._compat: Optional[Dict[Tuple[float, float], Compatibilidad]] = None
+        self._od_by_key: Dict[str, float] = {}
+        self._valores: Dict[str, Dict[str, float]] = {}
+        self._planos: Optional[PlanoIndex] = None
+        self.built: Dict[str, float] = {}
+
+    # ------------------ construcción bajo demanda ------------------
+
+    def _ensure_tubos(self):
+        if self._tubos is not None:
+            return
+        t0 = time.perf_counter()
+        tubos = _build_tubos(self._src)
+        thk_by_od: Dict[float, List[str]] = {}
+        for t in tubos:
+            self._tubo_by_key.setdefault((num_key(t.od_text), num_key(t.thk_text)), t)
+            self._tubo_by_num.setdefault(tubo_key(t.od, t.thk), t)
+            self._od_by_key.setdefault(num_key(t.od_text), t.od)
+            thk_by_od.setdefault(round(t.od, 2), []).append(t.thk_text)
+        self._thk_by_od = {od: tuple(v) for od, v in thk_by_od.items()}
+        self._tubo_index = TuboIndex(tubos)
+        self._tubos = tubos
+        self.built["tubos"] = (time.perf_counter() - t0) * 1000.0
+
+    def _ensure_rodamientos(self):
+        if self._rodamientos is not None:
+            return
+        t0 = time.perf_counter()
+        rods = _build_rodamientos(self._src)
+        for r in rods:
+            self._rod_by_name.setdefault(r.name, r)
+            self._rod_by_ref.setdefault(r.ref, r)
+        self._rod_index = RodamientoIndex(rods)
+        self._rodamientos = rods
+        self.built["rodamientos"] = (time.perf_counter() - t0) * 1000.0
+
+    def _ensure_lista(self, seccion: str) -> Tuple[NumText, ...]:
+        items = self._listas.get(seccion)
+        if items is None:
+            t0 = time.perf_counter()
+            items = _num_list(self._src.get(seccion, []))
+            self._valores[seccion] = {num_key(it.text): it.value for it in items}
+            self._listas[seccion] = items
+            self.built[seccion] = (time.perf_counter() - t0) * 1000.0
+        return items
+
+    def _ensure_planos(self):
+        if self._planos is not None:
+            return
+        t0 = time.perf_counter()
+        self._planos = PlanoIndex(_build_planos(self._src))
+        self.built["planos"] = (time.perf_counter() - t0) * 1000.0
+
+    def _ensure_compat(self):
+        if self._compat is not None:
+            return
+        self._ensure_tubos()
+        self._ensure_rodamientos()
+        t0 = time.perf_counter()
+        compat: Dict[Tuple[float, float], Compatibilidad] = {}
+        for t in self._tubos:
+            key = tubo_key(t.od, t.thk)
+            if key not in compat:
+                compat[key] = Compatibilidad(t, self._rod_index)
+        self._compat = compat
+        self.built["compat"] = (time.perf_counter() - t0) * 1000.0
+
+    def materialize(self) -> "CatalogModel":
+        """Construye todo ya (para el snapshot) y suelta la referencia al dict de origen."""
+        self._ensure_tubos()
+        self._ensure_rodamientos()
+        self._ensure_planos()
+        self._ensure_compat()
+        for sec in NUM_SECTIONS:
+            self._ensure_lista(sec)
+        self._src = {}
+        return self
+
+    # ------------------ acceso ------------------
+
+    @property
+    def tubos(self) -> Tuple[Tubo, ...]:
+        self._ensure_tubos()
+        return self._tubos
+
+    @property
+    def tubo_index(self) -> TuboIndex:
+        self._ensure_tubos()
+        return self._tubo_index
+
+    @property
+    def rodamientos(self) -> Tuple[Rodamiento, ...]:
+        self._ensure_rodamientos()
+        return self._rodamientos
+
+    @property
+    def rod_by_name(self) -> Dict[str, Rodamiento]:
+        self._ensure_rodamientos()
+        return self._rod_by_name
+
+    @property
+    def rod_index(self) -> RodamientoIndex:
+        self._ensure_rodamientos()
+        return self._rod_index
+
+    @property
+    def planos(self) -> PlanoIndex:
+        self._ensure_planos()
+        return self._planos
+
+    @property
+    def compat_matrix(self) -> Dict[Tuple[float, float], Compatibilidad]:
+        """Matriz completa {tubo_key(od, thk): Compatibilidad} (procesos por lotes)."""
+        self._ensure_compat()
+        return self._compat
+
+    def compat(self, od_text: Any, thk_text: Any) -> Optional[Compatibilidad]:
+        """
+        Fila de compatibilidad del tubo elegido en los combos. Un tubo fuera de catálogo
+        (valor libre/antiguo) se calcula al vuelo con las mismas reglas.
+        """
+        tubo = self.tubo(od_text, thk_text)
+        if tubo is None:
+            return None
+        self._ensure_compat()
+        row = self._compat.get(tubo_key(tubo.od, tubo.thk))
+        return row if row is not None else Compatibilidad(tubo, self.rod_index)
+
+    @property
+    def listas(self) -> Dict[str, Tuple[NumText, ...]]:
+        for sec in NUM_SECTIONS:
+            self._ensure_lista(sec)
+        return self._listas
+
+    def lista(self, seccion: str) -> Tuple[NumText, ...]:
+        return self._ensure_lista(seccion)
+
+    def tubo(self, od_text: Any, thk_text: Any) -> Optional[Tubo]:
+        """
+        Tubo por texto de los combos. Si no está en catálogo (valor libre/antiguo)
+        se parsea como último recurso.
+        """
+        self._ensure_tubos()
+        key = (num_key(od_text), num_key(thk_text))
+        t = self._tubo_by_key.get(key)
+        if t is not None:
+            return t
+        od = parse_num(od_text)
+        thk = parse_num(thk_text)
+        if od is None or thk is None:
+            return None
+        return Tubo(od, thk, key[0], key[1])
+
+    def tubo_num(self, od: Optional[float], thk: Optional[float]) -> Optional[Tubo]:
+        """Tubo de catálogo por valores numéricos (None si el par no está en catálogo)."""
+        if od is None or thk is None:
+            return None
+        self._ensure_tubos()
+        return self._tubo_by_num.get(tubo_key(od, thk))
+
+    def espesores(self, od: Optional[float]) -> Tuple[str, ...]:
+        """Textos de espesor del OD (numérico) en orden de catálogo."""
+        if od is None:
+            return ()
+        self._ensure_tubos()
+        return self._thk_by_od.get(round(od, 2), ())
+
+    def rodamiento(self, key: Any) -> Optional[Rodamiento]:
+        """Rodamiento por nombre del desplegable o, si no, por ref."""
+        self._ensure_rodamientos()
+        k = str(key or "").strip()
+        r = self._rod_by_name.get(k)
+        return r if r is not None else self._rod_by_ref.get(k)
+
+    def od(self, od_text: Any) -> Optional[float]:
+        self._ensure_tubos()
+        v = self._od_by_key.get(num_key(od_text))
+        return v if v is not None else parse_num(od_text)
+
+    def valor(self, seccion: str, text: Any) -> Optional[float]:
+        """Valor numérico de un texto de la sección indicada (pasos, diam_espira...)."""
+        self._ensure_lista(seccion)
+        v = self._valores.get(seccion, {}).get(num_key(text))
+        return v if v is not None else parse_num(text)
+
+
+def _num_list(items: Iterable[Any]) -> Tuple[NumText, ...]:
+    out: List[NumText] = []
+    for it in items or []:
+        v = parse_num(it)
+        if v is not None:
+            out.append(NumText(v, str(it).strip()))
+    return tuple(out)
+
+
+def _build_tubos(data: Mapping[str, Any]) -> Tuple[Tubo, ...]:
+    espes_by = data.get("espesores_by_od", {}) or {}
+    out: List[Tubo] = []
+    for od_s in data.get("eje_od", []) or []:
+        od = parse_num(od_s)
+        if od is None:
+            continue
+        # las claves de espesores_by_od no siempre coinciden en formato con eje_od
+        espesores = espes_by.get(str(od_s), espes_by.get(str(int(od)) if od.is_integer() else str(od), []))
+        for thk_s in espesores or []:
+            thk = parse_num(thk_s)
+            if thk is None:
+                continue
+            out.append(Tubo(od, thk, str(od_s).strip(), str(thk_s).strip()))
+    return tuple(out)
+
+
+def _build_rodamientos(data: Mapping[str, Any]) -> Tuple[Rodamiento, ...]:
+    out: List[Rodamiento] = []
+    for r in data.get("rodamientos", []) or []:
+        name = (r.get("name") or r.get("ref") or "").strip()
+        if not name:
+            continue
+        ref = str(r.get("ref") or name).strip()
+        out.append(Rodamiento(
+            ref, name,
+            parse_num(r.get("d")), parse_num(r.get("D")), parse_num(r.get("B")),
+            parse_num(r.get("C")), parse_num(r.get("C0")),
+        ))
+    return tuple(out)
+
+
+def _build_planos(data: Mapping[str, Any]) -> Tuple[PlanoTesteros, ...]:
+    out: List[PlanoTesteros] = []
+    for r in data.get("planos_testeros", []) or []:
+        od = parse_num(r.get("od"))
+        thk = parse_num(r.get("thk"))
+        codigo = str(r.get("plano") or "").strip()
+        if od is None or thk is None or not codigo:
+            continue
+        di = parse_num(r.get("id"))
+        out.append(PlanoTesteros(od, thk, di if di is not None else od - 2.0 * thk, codigo))
+    return tuple(out)
+
+
+def build_model(data: Mapping[str, Any], lazy: bool = False) -> CatalogModel:
+    """
+    Modelo tipado del dict de catálogos. Por defecto se parsea todo ya;
+    con lazy=True cada parte se construye en su primer uso.
+    """
+    m = CatalogModel(data)
+    return m if lazy else m.materialize()
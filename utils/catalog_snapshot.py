@@ -0,0 +1,159 @@
+# utils/catalog_snapshot.py
+"""
+Snapshot binario de catálogos para arrancar rápido.
+
+Paso de build (desde la raíz del proyecto):
+    python -m utils.catalog_snapshot
+
+Compila data/catalogos.json (ya normalizado y con el modelo tipado) a
+data/catalogos.snapshot. Las fuentes de las que sale el catálogo (catalogos.json,
+rodamientos.json y los CSV de data/) quedan registradas con tamaño, mtime y SHA-1
+en la cabecera: si cualquiera cambia, el snapshot se considera obsoleto y
+load_catalogs() vuelve al JSON.
+
+Formato:
+    MAGIC (8 bytes) | versión (uint32) | len cabecera (uint32) | cabecera JSON | pickle
+
+El pickle solo se genera y lee localmente (no cargar snapshots de terceros).
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+SNAPSHOT_MAGIC = b"SINFCAT\x00"
+SNAPSHOT_VERSION = 5  # 2: CatalogModel con partes bajo demanda; 3: planos e índices numéricos; 4: compat; 5: C/C0
+_PREFIX = struct.Struct("<8sII")
+
+
+def snapshot_path_for(json_path: str) -> str:
+    """data/catalogos.json -> data/catalogos.snapshot"""
+    return os.path.splitext(json_path)[0] + ".snapshot"
+
+
+def default_sources(json_path: str) -> List[str]:
+    """Ficheros de los que depende el catálogo (para detectar snapshot obsoleto)."""
+    data_dir = os.path.dirname(os.path.abspath(json_path))
+    sources = [os.path.abspath(json_path)]
+    rod_json = os.path.join(data_dir, "rodamientos.json")
+    if os.path.exists(rod_json):
+        sources.append(rod_json)
+    sources.extend(sorted(glob.glob(os.path.join(data_dir, "*.csv"))))
+    return sources
+
+
+def _sha1_file(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_entry(path: str, base_dir: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {
+        "path": os.path.relpath(path, base_dir),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha1": _sha1_file(path),
+    }
+
+
+def compile_snapshot(data: Dict[str, Any], json_path: str, out_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Escribe el snapshot de `data` (dict ya normalizado de load_catalogs).
+    Devuelve la cabecera escrita.
+    """
+    out_path = out_path or snapshot_path_for(json_path)
+    base_dir = os.path.dirname(os.path.abspath(json_path))
+
+    header = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sources": [_source_entry(p, base_dir) for p in default_sources(json_path)],
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(payload)
+    os.replace(tmp, out_path)
+    return header
+
+
+def _read_header(f) -> Optional[Dict[str, Any]]:
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) != _PREFIX.size:
+        return None
+    magic, version, header_len = _PREFIX.unpack(prefix)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    try:
+        return json.loads(f.read(header_len).decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def _is_fresh(header: Dict[str, Any], json_path: str) -> bool:
+    base_dir = os.path.dirname(os.path.abspath(json_path))
+    recorded = header.get("sources", [])
+    current = [os.path.relpath(p, base_dir) for p in default_sources(json_path)]
+    if [s.get("path") for s in recorded] != current:
+        return False  # se ha añadido o quitado alguna fuente
+
+    for s in recorded:
+        path = os.path.join(base_dir, s["path"])
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != s.get("size"):
+            return False
+        if st.st_mtime_ns == s.get("mtime_ns"):
+            continue
+        # mtime distinto: solo es obsoleto si cambió el contenido
+        if _sha1_file(path) != s.get("sha1"):
+            return False
+    return True
+
+
+def read_snapshot(json_path: str, snapshot_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Devuelve el dict de catálogos del snapshot, o None si no existe / está obsoleto."""
+    snapshot_path = snapshot_path or snapshot_path_for(json_path)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, "rb") as f:
+            header = _read_header(f)
+            if header is None or not _is_fresh(header, json_path):
+                return None
+            return pickle.loads(f.read())
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+        return None
+
+
+def main():
+    from utils.catalogs import DEFAULT_JSON, load_catalogs
+
+    t0 = time.perf_counter()
+    data = load_catalogs(DEFAULT_JSON, use_snapshot=False)
+    header = compile_snapshot(data, DEFAULT_JSON)
+    ms = (time.perf_counter() - t0) * 1000.0
+
+    out = snapshot_path_for(DEFAULT_JSON)
+    print(f"[OK] Snapshot: {out}")
+    print(f"[OK] Fuentes : {len(header['sources'])}")
+    print(f"[OK] Tamaño  : {os.path.getsize(out)} bytes ({ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
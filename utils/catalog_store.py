@@ -0,0 +1,363 @@
+# utils/catalog_store.py
+"""
+Catálogos en SQLite con índices (alternativa al JSON en memoria).
+
+Las tablas llevan prefijo cat_ para poder vivir en la BD de la aplicación
+(data/pedidos.db) o en una BD hermana (data/catalogos.db, la de por defecto).
+
+Uso:
+    python -m utils.catalog_store            # (re)importa data/catalogos.json
+    SINFINES_CATALOGOS=sqlite                # get_catalogs() tira de la BD
+
+Con la BD, los combos pequeños se cargan en memoria (as_catalogs) y los filtros
+de utils.catalogs (espesores por OD, rodamientos por tubo) hacen consultas por
+rango sobre índices, sin cargar los rodamientos.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from utils.catalog_model import Rodamiento, Tubo, build_model, num_key, parse_num
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DB_PATH = os.path.join(BASE_DIR, "data", "catalogos.db")
+
+# Listas simples que se guardan en cat_listas (texto + valor numérico si lo tiene)
+LIST_SECTIONS = (
+    "materials",
+    "diam_espira",
+    "pasos",
+    "espesores_chapa",
+    "distancia_testeros",
+    "eje_dim",
+    "metricas_tornillos",
+    "tipo_disposicion",
+    "posicion_motor",
+)
+
+
+def init_catalog_schema(con: sqlite3.Connection):
+    con.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS cat_meta (
+            clave TEXT PRIMARY KEY,
+            valor TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS cat_tubos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orden INTEGER NOT NULL,
+            od REAL NOT NULL,
+            thk REAL NOT NULL,
+            di REAL NOT NULL,                 -- od - 2*thk
+            od_key TEXT NOT NULL,             -- texto normalizado ("60,3" -> "60.3")
+            thk_key TEXT NOT NULL,
+            od_text TEXT NOT NULL,
+            thk_text TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cat_tubos_od_key ON cat_tubos(od_key, orden);
+        CREATE INDEX IF NOT EXISTS idx_cat_tubos_di ON cat_tubos(di, orden);
+
+        CREATE TABLE IF NOT EXISTS cat_rodamientos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orden INTEGER NOT NULL,
+            ref TEXT NOT NULL,
+            name TEXT NOT NULL,
+            d REAL,                           -- Ø interior
+            d_ext REAL,                       -- D (SQLite no distingue d/D en columnas)
+            ancho REAL,                       -- B
+            principal INTEGER NOT NULL DEFAULT 0,  -- 1 = primera aparición del nombre (por d)
+            c_din REAL,                       -- C (kN)
+            c_est REAL                        -- C0 (kN)
+        );
+        CREATE INDEX IF NOT EXISTS idx_cat_rodamientos_d ON cat_rodamientos(principal, d, orden);
+        CREATE INDEX IF NOT EXISTS idx_cat_rodamientos_name ON cat_rodamientos(name);
+        CREATE INDEX IF NOT EXISTS idx_cat_rodamientos_ref ON cat_rodamientos(ref);
+
+        CREATE TABLE IF NOT EXISTS cat_listas (
+            seccion TEXT NOT NULL,
+            orden INTEGER NOT NULL,
+            texto TEXT NOT NULL,
+            valor REAL,                       -- NULL si no es numérico (materiales...)
+            PRIMARY KEY (seccion, orden)
+        );
+        CREATE INDEX IF NOT EXISTS idx_cat_listas_valor ON cat_listas(seccion, valor);
+
+        CREATE TABLE IF NOT EXISTS cat_planos (
+            orden INTEGER NOT NULL,
+            od TEXT NOT NULL,                 -- texto de catálogo ("60.3")
+            thk TEXT NOT NULL,
+            di TEXT,
+            plano TEXT NOT NULL               -- código de plano de testeros
+        );
+        """
+    )
+    # BD creadas antes de C/C0
+    cols = {r[1] for r in con.execute("PRAGMA table_info(cat_rodamientos)")}
+    for col in ("c_din", "c_est"):
+        if col not in cols:
+            con.execute(f"ALTER TABLE cat_rodamientos ADD COLUMN {col} REAL")
+    con.commit()
+
+
+_INSERT_RODAMIENTO = """
+    INSERT INTO cat_rodamientos (orden, ref, name, d, d_ext, ancho, principal, c_din, c_est)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def import_catalogs(con: sqlite3.Connection, catalogs: Mapping[str, Any], source_sha1: str = ""):
+    """Vuelca un dict de catálogos (load_catalogs) en las tablas cat_*. Reemplaza lo anterior."""
+    init_catalog_schema(con)
+    model = catalogs.get("_model") or build_model(catalogs)
+
+    with con:
+        con.execute("DELETE FROM cat_tubos")
+        con.execute("DELETE FROM cat_rodamientos")
+        con.execute("DELETE FROM cat_listas")
+        con.execute("DELETE FROM cat_planos")
+
+        con.executemany(
+            """
+            INSERT INTO cat_tubos (orden, od, thk, di, od_key, thk_key, od_text, thk_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (i, t.od, t.thk, t.id, num_key(t.od_text), num_key(t.thk_text), t.od_text, t.thk_text)
+                for i, t in enumerate(model.tubos)
+            ],
+        )
+
+        principales = set()
+        seen = set()
+        for r in sorted((r for r in model.rodamientos if r.d is not None), key=lambda r: r.d):
+            if r.name not in seen:
+                seen.add(r.name)
+                principales.add(id(r))
+        con.executemany(
+            _INSERT_RODAMIENTO,
+            [
+                (i, r.ref, r.name, r.d, r.D, r.B, 1 if id(r) in principales else 0, r.C, r.C0)
+                for i, r in enumerate(model.rodamientos)
+            ],
+        )
+
+        rows = []
+        for sec in LIST_SECTIONS:
+            for i, texto in enumerate(catalogs.get(sec, []) or []):
+                texto = str(texto).strip()
+                valor = parse_num(texto.upper().lstrip("M")) if sec == "metricas_tornillos" else parse_num(texto)
+                rows.append((sec, i, texto, valor))
+        con.executemany("INSERT INTO cat_listas (seccion, orden, texto, valor) VALUES (?, ?, ?, ?)", rows)
+
+        con.executemany(
+            "INSERT INTO cat_planos (orden, od, thk, di, plano) VALUES (?, ?, ?, ?, ?)",
+            [
+                (i, str(p.get("od", "")), str(p.get("thk", "")), str(p.get("id", "")), str(p.get("plano", "")))
+                for i, p in enumerate(catalogs.get("planos_testeros", []) or [])
+            ],
+        )
+
+        con.execute(
+            "INSERT INTO cat_meta (clave, valor) VALUES ('source_sha1', ?) "
+            "ON CONFLICT(clave) DO UPDATE SET valor=excluded.valor",
+            (source_sha1,),
+        )
+
+
+def import_rodamientos(con: sqlite3.Connection, items: Iterable[Mapping[str, Any]], batch: int = 5_000) -> int:
+    """
+    Reemplaza cat_rodamientos a partir de un iterable YA ordenado por d (p.ej. la salida
+    de utils.rodamientos_ingest), insertando por lotes sin materializar la lista.
+    Devuelve el número de filas insertadas.
+    """
+    init_catalog_schema(con)
+    seen = set()
+    n = 0
+    buf: List[tuple] = []
+
+    with con:
+        con.execute("DELETE FROM cat_rodamientos")
+        for it in items:
+            name = str(it.get("name") or it.get("ref") or "").strip()
+            if not name:
+                continue
+            principal = 0
+            d = parse_num(it.get("d"))
+            if d is not None and name not in seen:
+                seen.add(name)
+                principal = 1
+            buf.append((
+                n, str(it.get("ref") or name), name, d, parse_num(it.get("D")), parse_num(it.get("B")), principal,
+                parse_num(it.get("C")), parse_num(it.get("C0")),
+            ))
+            n += 1
+            if len(buf) >= batch:
+                con.executemany(_INSERT_RODAMIENTO, buf)
+                buf = []
+        if buf:
+            con.executemany(_INSERT_RODAMIENTO, buf)
+    return n
+
+
+class CatalogStore:
+    """Consultas indexadas sobre las tablas cat_* (mismas reglas que utils.catalogs)."""
+
+    def __init__(self, con: sqlite3.Connection):
+        self.con = con
+
+    def source_sha1(self) -> str:
+        r = self.con.execute("SELECT valor FROM cat_meta WHERE clave = 'source_sha1'").fetchone()
+        return r[0] if r else ""
+
+    def lista(self, seccion: str) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT texto FROM cat_listas WHERE seccion = ? ORDER BY orden", (seccion,)
+            )
+        ]
+
+    def eje_od(self) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT od_text FROM cat_tubos GROUP BY od_key ORDER BY MIN(orden)"
+            )
+        ]
+
+    def espesores_por_od(self, od_text: str) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT thk_text FROM cat_tubos WHERE od_key = ? ORDER BY orden", (num_key(od_text),)
+            )
+        ]
+
+    def tubo(self, od_text: str, thk_text: str) -> Optional[Tubo]:
+        r = self.con.execute(
+            "SELECT od, thk, od_text, thk_text FROM cat_tubos WHERE od_key = ? AND thk_key = ? "
+            "ORDER BY orden LIMIT 1",
+            (num_key(od_text), num_key(thk_text)),
+        ).fetchone()
+        if r is not None:
+            return Tubo(r[0], r[1], r[2], r[3])
+        od = parse_num(od_text)
+        thk = parse_num(thk_text)
+        if od is None or thk is None:
+            return None
+        return Tubo(od, thk)
+
+    def rodamientos_por_diametro(self, d: float, tol: float = 0.1) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT name FROM cat_rodamientos WHERE principal = 1 AND d BETWEEN ? AND ? "
+                "ORDER BY d, orden",
+                (d - tol, d + tol),
+            )
+        ]
+
+    def rodamientos_menores_que(self, od: float) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT name FROM cat_rodamientos WHERE principal = 1 AND d < ? ORDER BY d, orden",
+                (od,),
+            )
+        ]
+
+    def rodamientos_todos(self) -> List[str]:
+        return [
+            r[0]
+            for r in self.con.execute(
+                "SELECT name FROM cat_rodamientos GROUP BY name ORDER BY MIN(orden)"
+            )
+        ]
+
+    def rodamientos_registros(self) -> List[Dict[str, Any]]:
+        """Todos los rodamientos en orden de catálogo (registros como los del JSON) para el modelo."""
+        return [
+            {"ref": r[0], "name": r[1], "d": r[2], "D": r[3], "B": r[4], "C": r[5], "C0": r[6]}
+            for r in self.con.execute(
+                "SELECT ref, name, d, d_ext, ancho, c_din, c_est FROM cat_rodamientos ORDER BY orden"
+            )
+        ]
+
+    def rodamiento(self, key: str) -> Optional[Rodamiento]:
+        """Rodamiento por nombre o, si no, por ref (ambas columnas indexadas)."""
+        k = (key or "").strip()
+        for col in ("name", "ref"):
+            r = self.con.execute(
+                f"SELECT ref, name, d, d_ext, ancho, c_din, c_est FROM cat_rodamientos WHERE {col} = ? "
+                "ORDER BY orden LIMIT 1",
+                (k,),
+            ).fetchone()
+            if r is not None:
+                return Rodamiento(*r)
+        return None
+
+    def planos_testeros(self) -> List[Dict[str, str]]:
+        return [
+            {"od": r[0], "thk": r[1], "id": r[2], "plano": r[3]}
+            for r in self.con.execute("SELECT od, thk, di, plano FROM cat_planos ORDER BY orden")
+        ]
+
+    def as_catalogs(self) -> Dict[str, Any]:
+        """
+        Dict compatible con load_catalogs() para la UI: listas de combos y tubos en memoria,
+        rodamientos NO (los filtros van a la BD a través de "_store"). El _model sí los lleva:
+        sin ellos la compatibilidad del motor saldría sin rodamientos.
+        """
+        data: Dict[str, Any] = {sec: self.lista(sec) for sec in LIST_SECTIONS}
+        data["eje_od"] = self.eje_od()
+        data["espesores_by_od"] = {od: self.espesores_por_od(od) for od in data["eje_od"]}
+        data["planos_testeros"] = self.planos_testeros()
+        data["rodamientos"] = []
+        data["rodamiento_names"] = []
+        data["_rod_by_name"] = {}
+        # el motor (compatibilidad, barrido) necesita el índice de rodamientos por d
+        data["_model"] = build_model(dict(data, rodamientos=self.rodamientos_registros()))
+        data["_store"] = self
+        return data
+
+
+def _sha1_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def open_catalog_store(db_path: str = CATALOG_DB_PATH, json_path: Optional[str] = None) -> CatalogStore:
+    """
+    Abre la BD de catálogos. Si se indica json_path y la BD no corresponde a ese JSON
+    (hash distinto o BD vacía), la reimporta.
+    """
+    con = sqlite3.connect(db_path)
+    init_catalog_schema(con)
+    store = CatalogStore(con)
+
+    if json_path:
+        sha1 = _sha1_file(json_path)
+        if store.source_sha1() != sha1:
+            from utils.catalogs import load_catalogs
+
+            import_catalogs(con, load_catalogs(json_path, use_snapshot=False), sha1)
+    return store
+
+
+def main():
+    from utils.catalogs import DEFAULT_JSON
+
+    store = open_catalog_store(CATALOG_DB_PATH, DEFAULT_JSON)
+    n_tubos = store.con.execute("SELECT COUNT(*) FROM cat_tubos").fetchone()[0]
+    n_rod = store.con.execute("SELECT COUNT(*) FROM cat_rodamientos").fetchone()[0]
+    store.con.close()
+    print(f"[OK] BD catálogos: {CATALOG_DB_PATH}")
+    print(f"[OK] Tubos: {n_tubos} · Rodamientos: {n_rod}")
+
+
+if __name__ == "__main__":
+    main()
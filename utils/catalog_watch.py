@@ -0,0 +1,176 @@
+# utils/catalog_watch.py
+"""
+Recarga en caliente de catálogos.
+
+Un hilo en segundo plano hace os.stat() de las fuentes (catalogos.json, rodamientos.json
+y data/*.csv) cada `interval_s` segundos. Si cambia alguna:
+  - si cambió un CSV, se lanza el build incremental (utils.catalog_build) que reescribe
+    catalogos.json y el snapshot (un error de validación deja el catálogo anterior)
+  - se recarga el registro compartido (utils.catalogs.CatalogRegistry)
+  - se avisa a los suscriptores con el nuevo catálogo y las secciones que cambiaron
+
+Tkinter no es thread-safe: las ventanas NO deben tocar widgets desde el callback.
+Lo normal es consultar `watcher.catalogs` desde un `after()` y comparar con
+changed_sections() (ver SinfinWindow._poll_catalogs).
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from utils.catalog_snapshot import default_sources
+from utils.catalogs import DEFAULT_JSON, get_registry
+
+Listener = Callable[[Mapping[str, Any], Set[str]], None]
+
+DEFAULT_INTERVAL_S = 2.0
+_MISSING = object()
+
+
+def changed_sections(old: Optional[Mapping[str, Any]], new: Mapping[str, Any]) -> Set[str]:
+    """
+    Secciones públicas (sin "_") que difieren entre dos catálogos.
+    Con LazyCatalogs se compara lo leído del JSON, sin materializar secciones.
+    """
+    keys = {k for k in new if not k.startswith("_")}
+    if old is None:
+        return keys
+    keys |= {k for k in old if not k.startswith("_")}
+
+    new_raw = getattr(new, "raw", new)
+    old_raw = getattr(old, "raw", old)
+    out = set()
+    for k in keys:
+        a = old_raw.get(k, _MISSING)
+        b = new_raw.get(k, _MISSING)
+        if a is _MISSING or b is _MISSING:
+            # sección derivada (p.ej. rodamiento_names): comparar ya materializada
+            if old.get(k) != new.get(k):
+                out.add(k)
+        elif a != b:
+            out.add(k)
+    return out
+
+
+class CatalogWatcher:
+    def __init__(self, json_path: str = DEFAULT_JSON, interval_s: float = DEFAULT_INTERVAL_S, build: bool = True):
+        self.json_path = os.path.abspath(json_path)
+        self.interval_s = interval_s
+        self.build = build
+        self.registry = get_registry(self.json_path)
+        self.catalogs: Mapping[str, Any] = self.registry.get()
+        self.last_error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._listeners: List[Listener] = []
+        self._signature = self._stat_sources()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------ suscripción ------------------
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Registra un callback (se llama desde el hilo del watcher). Devuelve el 'unsubscribe'."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def _unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    # ------------------ hilo ------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "CatalogWatcher":
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="catalog-watch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.poll_once()
+            except Exception as e:  # el watcher no debe morir por un fichero a medio guardar
+                self.last_error = str(e)
+
+    # ------------------ sondeo ------------------
+
+    def _stat_sources(self) -> Tuple[Tuple[str, int, int], ...]:
+        sig = []
+        for p in default_sources(self.json_path):
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            sig.append((p, st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def poll_once(self) -> Set[str]:
+        """
+        Un ciclo de sondeo (también sirve para tests / llamadas manuales).
+        Devuelve las secciones que cambiaron (vacío si nada).
+        """
+        sig = self._stat_sources()
+        if sig == self._signature:
+            return set()
+
+        antes = dict((p, (m, s)) for p, m, s in self._signature)
+        csv_cambiado = any(
+            p.lower().endswith(".csv") and antes.get(p) != (m, s) for p, m, s in sig
+        )
+        self._signature = sig
+
+        if self.build and csv_cambiado:
+            from utils.catalog_build import CatalogBuildError, build_catalogs
+
+            try:
+                build_catalogs(os.path.dirname(self.json_path), out_json=self.json_path)
+                self.last_error = None
+            except CatalogBuildError as e:
+                self.last_error = str(e)
+            # el build reescribe el JSON: no volver a disparar por nuestra propia escritura
+            self._signature = self._stat_sources()
+
+        nuevo = self.registry.get()
+        if nuevo is self.catalogs:
+            return set()
+
+        cambios = changed_sections(self.catalogs, nuevo)
+        self.catalogs = nuevo
+        with self._lock:
+            listeners = list(self._listeners)
+        for cb in listeners:
+            cb(nuevo, cambios)
+        return cambios
+
+
+_WATCHERS: Dict[str, CatalogWatcher] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def get_catalog_watcher(json_path: str = DEFAULT_JSON, start: bool = True) -> CatalogWatcher:
+    """Watcher compartido por proceso (se arranca la primera vez que se pide)."""
+    key = os.path.abspath(json_path)
+    with _WATCHERS_LOCK:
+        w = _WATCHERS.get(key)
+        if w is None:
+            w = CatalogWatcher(key)
+            _WATCHERS[key] = w
+    if start:
+        w.start()
+    return w
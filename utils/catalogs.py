@@ -13,29 +13,69 @@ Estructura esperada en catalogos.json (mínimo):
   "rodamiento_names": ["SKF 22208 E", ...]   # opcional, se puede derivar
   "eje_od": [[...],
   "espesores_by_od": { "60,3": ["2","3"], ... },
+  "planos_testeros": [ {"od":"21.3","thk":"2","id":"17.3","plano":"002A.002.0213-0173"}, ... ],
   "metricas_tornillos": ["M8",...],
   "tipo_disposicion": [...],
   "posicion_motor": [...] 
 }
+
+Uso normal: get_catalogs() -> vista compartida de solo lectura (se carga una vez por
+proceso y solo se relee si cambia el fichero). load_catalogs() lee siempre de disco.
+Con SINFINES_CATALOGOS=sqlite los filtros consultan data/catalogos.db (utils/catalog_store.py).
+
+La vista compartida es perezosa (LazyCatalogs): cada sección se congela/indexa en su
+primer acceso. Con SINFINES_PERFIL_CATALOGOS=1 la app imprime al salir qué secciones
+se llegaron a tocar y cuánto costó cada una (ver catalog_profile()).
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+from utils.catalog_model import (
+    MECANIZADO_MAX_MM,
+    MECANIZADO_MIN_MM,
+    RODAMIENTO_TOL_MM,
+    CatalogModel,
+    Tubo,
+    build_model,
+    parse_num,
+)
+from utils.catalog_snapshot import read_snapshot
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_JSON = os.path.join(BASE_DIR, "data", "catalogos.json")
 
 
-def load_catalogs(json_path: str = DEFAULT_JSON) -> Dict[str, Any]:
+def load_catalogs(json_path: str = DEFAULT_JSON, use_snapshot: bool = True, lazy: bool = False):
+    """
+    Lee y normaliza el JSON de catálogos (siempre desde disco, dict mutable).
+    Si hay un snapshot compilado vigente (utils/catalog_snapshot.py) se usa ese;
+    si está obsoleto o no existe, se parsea el JSON.
+    Con lazy=True devuelve una LazyCatalogs (solo lectura, secciones bajo demanda).
+    Para uso normal desde la UI usa get_catalogs(), que comparte la carga.
+    """
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"No existe el JSON de catálogos: {json_path}")
 
+    if use_snapshot:
+        data = read_snapshot(json_path)
+        if data is not None:
+            return LazyCatalogs(data) if lazy else data
+
     with open(json_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
+    return LazyCatalogs(data) if lazy else _normalize_catalogs(data)
+
+
+def _normalize_catalogs(data: Dict[str, Any]) -> Dict[str, Any]:
     # Normalizaciones suaves (para evitar KeyError)
     data.setdefault("materials", [])
     data.setdefault("diam_espira", [])
@@ -46,35 +86,331 @@ def load_catalogs(json_path: str = DEFAULT_JSON) -> Dict[str, Any]:
     data.setdefault("espesores_by_od", {})
     data.setdefault("metricas_tornillos", [])
     data.setdefault("rodamientos", [])
+    data.setdefault("planos_testeros", [])
 
     if "rodamiento_names" not in data or not isinstance(data["rodamiento_names"], list):
-        data["rodamiento_names"] = [
-            (r.get("name") or r.get("ref") or "").strip()
-            for r in data.get("rodamientos", [])
-            if (r.get("name") or r.get("ref"))
-        ]
+        data["rodamiento_names"] = _rodamiento_names(data)
 
     # mapa name->rodamiento (para acceder rápido a d/D/B si hace falta)
-    data["_rod_by_name"] = {
+    data["_rod_by_name"] = _rod_by_name(data)
+
+    # capa tipada (números parseados una sola vez)
+    data["_model"] = build_model(data)
+
+    return data
+
+
+def _rodamiento_names(data: Mapping[str, Any]) -> List[str]:
+    return [
+        (r.get("name") or r.get("ref") or "").strip()
+        for r in data.get("rodamientos", [])
+        if (r.get("name") or r.get("ref"))
+    ]
+
+
+def _rod_by_name(data: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
         (r.get("name") or r.get("ref") or "").strip(): r
         for r in data.get("rodamientos", [])
         if (r.get("name") or r.get("ref"))
     }
 
-    return data
+
+def catalog_model(catalogs: Mapping[str, Any]) -> CatalogModel:
+    """
+    Modelo tipado asociado a los catálogos. Si no viene de load_catalogs (dict a mano),
+    se construye una vez y se guarda en el propio dict como "_model": las consultas
+    siguientes no vuelven a recorrer el catálogo.
+    """
+    model = catalogs.get("_model")
+    if model is None:
+        model = build_model(catalogs)
+        if isinstance(catalogs, MutableMapping):
+            catalogs["_model"] = model
+    return model
+
+
+def tubo_mecanizado_ok(
+    tubo: Optional[Tubo],
+    min_diff_mm: float = MECANIZADO_MIN_MM,
+    max_diff_mm: float = MECANIZADO_MAX_MM,
+) -> bool:
+    """Igual que is_mecanizado_ok pero sobre un tubo ya parseado."""
+    return tubo is not None and min_diff_mm <= tubo.mecanizado_mm <= max_diff_mm
+
+
+# =========================
+# REGISTRO COMPARTIDO (caché por proceso)
+# =========================
+def _freeze(obj: Any) -> Any:
+    """Vista de solo lectura: dict -> MappingProxyType, list -> tuple (recursivo)."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+# Secciones que siempre existen (vacías si el JSON no las trae), como en _normalize_catalogs
+_DEFAULT_SECTIONS: Dict[str, Any] = {
+    "materials": [],
+    "diam_espira": [],
+    "pasos": [],
+    "espesores_chapa": [],
+    "distancia_testeros": [],
+    "eje_od": [],
+    "espesores_by_od": {},
+    "metricas_tornillos": [],
+    "rodamientos": [],
+    "planos_testeros": [],
+}
+_DERIVED_SECTIONS = ("rodamiento_names", "_rod_by_name", "_model")
+_MISSING = object()
+
+
+class LazyCatalogs(Mapping):
+    """
+    Catálogos de solo lectura que se materializan por secciones: el JSON se lee una vez,
+    pero cada sección se congela (tuplas / MappingProxyType) y el modelo tipado se
+    construye parte a parte en el primer acceso. Así abrir la lista de pedidos o la
+    sección General no paga rodamientos, tornillería, etc.
+
+    `profile()` dice qué secciones se han tocado, cuántas veces y lo que costaron.
+    """
+
+    def __init__(self, raw: Dict[str, Any]):
+        for k, default in _DEFAULT_SECTIONS.items():
+            raw.setdefault(k, type(default)())
+        self._raw = raw
+        self._cache: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._created = time.perf_counter()
+        self._profile: Dict[str, Dict[str, float]] = {}
+        keys = dict.fromkeys(_DEFAULT_SECTIONS)
+        keys.update(dict.fromkeys(raw))
+        keys.update(dict.fromkeys(_DERIVED_SECTIONS))
+        self._keys = tuple(keys)
+
+    @property
+    def raw(self) -> Mapping[str, Any]:
+        """Secciones tal cual vienen del JSON/snapshot (para comparar sin materializar)."""
+        return MappingProxyType(self._raw)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._materialize(key)
+        self._profile[key]["hits"] += 1
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _materialize(self, key: str) -> Any:
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            if key not in self._keys:
+                raise KeyError(key)
+
+            t0 = time.perf_counter()
+            raw = self._raw
+            if key == "_model":
+                value = raw.get("_model") or build_model(raw, lazy=True)
+            elif key == "_rod_by_name":
+                value = _freeze(raw.get("_rod_by_name") or _rod_by_name(raw))
+            elif key == "rodamiento_names" and not isinstance(raw.get(key), list):
+                value = tuple(_rodamiento_names(raw))
+            else:
+                value = _freeze(raw.get(key, _DEFAULT_SECTIONS.get(key)))
+
+            self._cache[key] = value
+            self._profile[key] = {
+                "ms": (time.perf_counter() - t0) * 1000.0,
+                "first_access_ms": (t0 - self._created) * 1000.0,
+                "hits": 0,
+            }
+            return value
+
+    def profile(self) -> Dict[str, Any]:
+        """
+        {"sections": {sección: {ms, first_access_ms, hits}}, "model": {parte: ms},
+         "untouched": [secciones que nadie pidió]}
+        """
+        with self._lock:
+            model = self._cache.get("_model")
+            return {
+                "sections": {k: dict(v) for k, v in self._profile.items()},
+                "model": dict(model.built) if model is not None else {},
+                "untouched": [k for k in self._keys if k not in self._cache],
+            }
+
+
+class CatalogRegistry:
+    """
+    Carga el JSON de catálogos una sola vez por proceso y entrega vistas de solo lectura.
+
+    En cada get() solo se hace un os.stat(); si cambia mtime/tamaño se relee el fichero
+    y se compara su hash: si el contenido es el mismo no se vuelve a parsear.
+    """
+
+    def __init__(self, json_path: str = DEFAULT_JSON):
+        self.json_path = json_path
+        self._lock = threading.RLock()
+        self._view: Optional[Mapping[str, Any]] = None
+        self._stat_key: Optional[tuple] = None
+        self._sha1: Optional[str] = None
+        self._metrics: Dict[str, Any] = {
+            "loads": 0,          # parseos completos del JSON
+            "reloads": 0,        # parseos por cambio de contenido (tras el primero)
+            "hits": 0,           # get() servidos desde caché
+            "touches": 0,        # cambió mtime pero no el contenido
+            "source": None,      # "snapshot" o "json" (última carga)
+            "last_load_ms": 0.0,
+            "total_load_ms": 0.0,
+        }
+
+    def get(self) -> Mapping[str, Any]:
+        try:
+            st = os.stat(self.json_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No existe el JSON de catálogos: {self.json_path}")
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if self._view is not None and stat_key == self._stat_key:
+                self._metrics["hits"] += 1
+                return self._view
+            return self._reload(stat_key)
+
+    def invalidate(self) -> None:
+        """Fuerza re-lectura en el próximo get()."""
+        with self._lock:
+            self._stat_key = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._metrics)
+            out["path"] = self.json_path
+            out["sha1"] = self._sha1
+            return out
+
+    def _reload(self, stat_key: tuple) -> Mapping[str, Any]:
+        t0 = time.perf_counter()
+        with open(self.json_path, "rb") as f:
+            raw = f.read()
+        sha1 = hashlib.sha1(raw).hexdigest()
+
+        if self._view is not None and sha1 == self._sha1:
+            self._stat_key = stat_key
+            self._metrics["touches"] += 1
+            return self._view
+
+        data = read_snapshot(self.json_path)
+        source = "snapshot"
+        if data is None:
+            data = json.loads(raw.decode("utf-8"))
+            source = "json"
+        view = LazyCatalogs(data)
+
+        if self._view is not None:
+            self._metrics["reloads"] += 1
+        self._view = view
+        self._stat_key = stat_key
+        self._sha1 = sha1
+
+        ms = (time.perf_counter() - t0) * 1000.0
+        self._metrics["loads"] += 1
+        self._metrics["source"] = source
+        self._metrics["last_load_ms"] = ms
+        self._metrics["total_load_ms"] += ms
+        return view
+
+
+_REGISTRIES: Dict[str, CatalogRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(json_path: str = DEFAULT_JSON) -> CatalogRegistry:
+    key = os.path.abspath(json_path)
+    with _REGISTRIES_LOCK:
+        reg = _REGISTRIES.get(key)
+        if reg is None:
+            reg = CatalogRegistry(key)
+            _REGISTRIES[key] = reg
+        return reg
+
+
+# "json" (por defecto) o "sqlite" (utils/catalog_store.py, data/catalogos.db)
+CATALOG_BACKEND_ENV = "SINFINES_CATALOGOS"
+_STORE_CATALOGS: Dict[str, Tuple[tuple, Mapping[str, Any]]] = {}      # ruta -> (mtime/tamaño del JSON, vista)
+
+
+def catalog_backend() -> str:
+    """Backend de catálogos configurado: "json" o "sqlite"."""
+    return os.environ.get(CATALOG_BACKEND_ENV, "json").strip().lower() or "json"
+
+
+def get_catalogs(json_path: str = DEFAULT_JSON) -> Mapping[str, Any]:
+    """Catálogos compartidos (solo lectura). Es lo que deben usar las ventanas."""
+    if catalog_backend() == "sqlite":
+        return _get_store_catalogs(json_path)
+    return get_registry(json_path).get()
+
+
+def _get_store_catalogs(json_path: str) -> Mapping[str, Any]:
+    from utils.catalog_store import CATALOG_DB_PATH, open_catalog_store
+
+    key = os.path.abspath(json_path)
+    st = os.stat(key)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    with _REGISTRIES_LOCK:
+        hit = _STORE_CATALOGS.get(key)
+        if hit is not None and hit[0] == stat_key:
+            return hit[1]
+        # primera vez o JSON cambiado: open_catalog_store compara el hash y reimporta si hace falta
+        cat = MappingProxyType(open_catalog_store(CATALOG_DB_PATH, json_path).as_catalogs())
+        _STORE_CATALOGS[key] = (stat_key, cat)
+        return cat
+
+
+def catalog_metrics(json_path: str = DEFAULT_JSON) -> Dict[str, Any]:
+    """Métricas de carga del registro (parseos, aciertos de caché, ms de carga)."""
+    return get_registry(json_path).metrics()
+
+
+PROFILE_ENV = "SINFINES_PERFIL_CATALOGOS"
+
+
+def catalog_profile(json_path: str = DEFAULT_JSON) -> Dict[str, Any]:
+    """Perfil de la vista compartida actual: secciones tocadas, coste y las no usadas."""
+    view = get_registry(json_path)._view
+    if not isinstance(view, LazyCatalogs):
+        return {"sections": {}, "model": {}, "untouched": []}
+    return view.profile()
+
+
+def format_catalog_profile(profile: Mapping[str, Any]) -> str:
+    lines = ["[CATALOGOS] Perfil de arranque"]
+    for sec, p in sorted(profile["sections"].items(), key=lambda kv: kv[1]["first_access_ms"]):
+        lines.append(
+            f"  {sec:20} +{p['first_access_ms']:8.1f} ms  build {p['ms']:6.2f} ms  accesos {int(p['hits'])}"
+        )
+    for part, ms in profile["model"].items():
+        lines.append(f"  modelo.{part:13} build {ms:6.2f} ms")
+    if profile["untouched"]:
+        lines.append("  sin tocar: " + ", ".join(profile["untouched"]))
+    return "\n".join(lines)
 
 
 def _to_float(text: str) -> Optional[float]:
-    if text is None:
-        return None
-    s = str(text).strip()
-    if not s:
-        return None
-    s = s.replace(",", ".")
-    try:
-        return float(s)
-    except Exception:
-        return None
+    return parse_num(text)
 
 
 def tubo_id_mm(eje_od_mm_text: str, eje_thk_mm_text: str) -> Optional[float]:
@@ -102,76 +438,113 @@ def mecanizado_diff_mm(eje_od_mm_text: str, eje_thk_mm_text: str) -> Optional[fl
 def is_mecanizado_ok(
     eje_od_mm_text: str,
     eje_thk_mm_text: str,
-    min_diff_mm: float = 4.0,
-    max_diff_mm: float = 6.0,
+    min_diff_mm: float = MECANIZADO_MIN_MM,
+    max_diff_mm: float = MECANIZADO_MAX_MM,
 ) -> bool:
     """Valida si la diferencia OD-ID está dentro del rango permitido."""
     diff = mecanizado_diff_mm(eje_od_mm_text, eje_thk_mm_text)
     return diff is not None and min_diff_mm <= diff <= max_diff_mm
 
 
-def filter_espesores_por_od(catalogs: Dict[str, Any], eje_od_mm_text: str) -> List[str]:
+def filter_espesores_por_od(catalogs: Mapping[str, Any], eje_od_mm_text: str) -> List[str]:
     """Devuelve espesores disponibles para el OD seleccionado."""
+    store = catalogs.get("_store")
+    if store is not None:
+        return store.espesores_por_od(eje_od_mm_text or "")
+
     od = (eje_od_mm_text or "").strip()
     espes = catalogs.get("espesores_by_od", {}).get(od, [])
-    return list(espes) if isinstance(espes, list) else []
+    return list(espes) if isinstance(espes, (list, tuple)) else []
 
 
-def filter_rodamientos_por_tubo(catalogs: Dict[str, Any], eje_od_mm_text: str, eje_thk_mm_text: str) -> List[str]:
+def filter_rodamientos_por_tubo(catalogs: Mapping[str, Any], eje_od_mm_text: str, eje_thk_mm_text: str) -> List[str]:
     """
     Filtra rodamientos en base al tubo eje.
     Regla:
       - si se conoce Ø interior (od - 2*thk) => d == Ø interior (±0.1 mm)
       - si no, pero hay Ø exterior => d < Ø exterior (regla "suave")
       - si no hay datos => devuelve todos
-    Devuelve nombres (rodamiento_names).
+    Devuelve nombres (rodamiento_names), sin duplicados. Con filtro, ordenados por d
+    (fila de la matriz de compatibilidad o bisect sobre el índice precalculado).
     """
-    rodamientos = catalogs.get("rodamientos", []) or []
-    if not rodamientos:
+    store = catalogs.get("_store")
+    if store is not None:
+        tubo = store.tubo(eje_od_mm_text, eje_thk_mm_text)
+        if tubo is not None:
+            return store.rodamientos_por_diametro(tubo.id, RODAMIENTO_TOL_MM)
+        od = _to_float(eje_od_mm_text)
+        if od is not None:
+            return store.rodamientos_menores_que(od)
+        return store.rodamientos_todos()
+
+    model = catalog_model(catalogs)
+    index = model.rod_index
+    if not len(index):
         return []
 
-    od = _to_float(eje_od_mm_text)
-    tid = tubo_id_mm(eje_od_mm_text, eje_thk_mm_text)
-
-    out: List[str] = []
-    if tid is not None:
-        for r in rodamientos:
-            d = r.get("d", None)
-            name = (r.get("name") or r.get("ref") or "").strip()
-            if not name or d is None:
-                continue
-            try:
-                d = float(d)
-            except Exception:
-                continue
-            if abs(d - tid) <= 0.1:
-                out.append(name)
-
-    elif od is not None:
-        for r in rodamientos:
-            d = r.get("d", None)
-            name = (r.get("name") or r.get("ref") or "").strip()
-            if not name or d is None:
-                continue
-            try:
-                d = float(d)
-            except Exception:
-                continue
-            if d < od:
-                out.append(name)
-
-    else:
-        out = [
-            (r.get("name") or r.get("ref") or "").strip()
-            for r in rodamientos
-            if (r.get("name") or r.get("ref"))
-        ]
-
-    # quitar duplicados manteniendo orden
-    seen = set()
-    uniq: List[str] = []
-    for x in out:
-        if x and x not in seen:
-            seen.add(x)
-            uniq.append(x)
-    return uniq
+    row = model.compat(eje_od_mm_text, eje_thk_mm_text)
+    if row is not None:
+        return list(row.rodamientos)
+
+    od = model.od(eje_od_mm_text)
+    if od is not None:
+        return index.menores_que(od)
+
+    return index.todos()
+
+
+# =========================
+# API DE CONSULTA (DefinicionWindow)
+# =========================
+# Todas sobre la vista compartida (o los catálogos que se pasen) y los índices del
+# modelo: listas tal cual (sin copiar), hash por OD / (OD, espesor) / nombre-ref y
+# bisect por d. Nada recorre el catálogo en cada llamada.
+
+def _cat(catalogs: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+    return catalogs if catalogs is not None else get_catalogs()
+
+
+def get_materiales(catalogs: Optional[Mapping[str, Any]] = None) -> Sequence[str]:
+    return _cat(catalogs).get("materials", ())
+
+
+def get_eje_diametros(catalogs: Optional[Mapping[str, Any]] = None) -> Sequence[str]:
+    """Ø de eje macizo (sección eje_dim); también es la lista de d de rodamiento."""
+    return _cat(catalogs).get("eje_dim", ())
+
+
+def get_tubo_exteriores(catalogs: Optional[Mapping[str, Any]] = None) -> Sequence[str]:
+    return _cat(catalogs).get("eje_od", ())
+
+
+def get_tubo_espesores(od: Any, catalogs: Optional[Mapping[str, Any]] = None) -> Sequence[str]:
+    """Espesores del tubo de Ø exterior `od` (número o texto), orden de catálogo."""
+    return catalog_model(_cat(catalogs)).espesores(parse_num(od))
+
+
+def get_tubo_interior(od: Any, e: Any, catalogs: Optional[Mapping[str, Any]] = None) -> Optional[float]:
+    """Ø interior del tubo (od, e) de catálogo; None si el par no está en catálogo."""
+    tubo = catalog_model(_cat(catalogs)).tubo_num(parse_num(od), parse_num(e))
+    return tubo.id if tubo is not None else None
+
+
+def get_rodamientos_for_d(d: Any, catalogs: Optional[Mapping[str, Any]] = None, tol: float = 0.1) -> List[str]:
+    """Nombres de rodamiento con |d_rod - d| <= tol (orden por d)."""
+    d = parse_num(d)
+    if d is None:
+        return []
+    cat = _cat(catalogs)
+    store = cat.get("_store")
+    if store is not None:
+        return store.rodamientos_por_diametro(d, tol)
+    return catalog_model(cat).rod_index.por_diametro(d, tol)
+
+
+def get_rodamiento_dims(ref: Any, catalogs: Optional[Mapping[str, Any]] = None) -> Dict[str, Optional[float]]:
+    """{"d","D","B"} del rodamiento (por nombre o ref); None en lo que no se conozca."""
+    cat = _cat(catalogs)
+    store = cat.get("_store")
+    rod = store.rodamiento(str(ref or "")) if store is not None else catalog_model(cat).rodamiento(ref)
+    if rod is None:
+        return {"d": None, "D": None, "B": None}
+    return {"d": rod.d, "D": rod.D, "B": rod.B}
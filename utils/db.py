@@ -42,6 +42,21 @@ def get_pedido(con: sqlite3.Connection, pedido_id: int):
     ).fetchone()
 
 
+def list_pedidos_abiertos(con: sqlite3.Connection) -> list:
+    """Ids de los pedidos con alguna tarea de algún sinfín sin completar."""
+    return [
+        r[0]
+        for r in con.execute(
+            """
+            SELECT DISTINCT s.pedido_id
+            FROM sinfines s JOIN estado_tareas e ON e.sinfin_id = s.id
+            WHERE e.completado = 0
+            ORDER BY s.pedido_id ASC
+            """
+        )
+    ]
+
+
 def create_pedido(
     con: sqlite3.Connection,
     numero_pedido: str,
@@ -174,6 +189,21 @@ def get_sinfin_definicion(con: sqlite3.Connection, sinfin_id: int) -> dict:
         return {}
 
 
+def list_sinfines_definiciones(con: sqlite3.Connection, pedido_id: int):
+    """[(id, nombre, definicion)] de todos los sinfines del pedido en una sola consulta."""
+    out = []
+    for r in con.execute(
+        "SELECT id, nombre, definicion_json FROM sinfines WHERE pedido_id = ? ORDER BY id ASC",
+        (pedido_id,),
+    ):
+        try:
+            d = json.loads(r[2]) if r[2] else {}
+        except Exception:
+            d = {}
+        out.append((r[0], r[1], d))
+    return out
+
+
 def set_sinfin_definicion(con, sinfin_id: int, data: dict):
     payload = json.dumps(data, ensure_ascii=False)
     cur = con.cursor()
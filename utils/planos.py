@@ -0,0 +1,75 @@
+# utils/planos.py
+"""
+Códigos de plano de testeros (Lista_eje_tubo.csv) para todos los sinfines de un pedido.
+
+    planos = resolver_planos_pedido(con, pedido_id)
+    # -> {sinfin_id: {"nombre": ..., "eje": "002A.002.0213-0173", "camisa": ""}}
+
+Una sola consulta a la BD y un lookup por hash (PlanoIndex.codigos) por tubo,
+en vez de abrir cada definición y recorrer la lista por separado.
+"""
+from __future__ import annotations
+
+import csv
+import sys
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from utils.catalog_model import parse_num
+from utils.catalogs import catalog_model, get_catalogs
+from utils.db import list_sinfines_definiciones
+
+Tubo = Tuple[Optional[float], Optional[float]]
+
+
+def tubo_eje(definicion: Mapping[str, Any]) -> Tubo:
+    return parse_num(definicion.get("eje_od")), parse_num(definicion.get("eje_thk"))
+
+
+def tubo_camisa(definicion: Mapping[str, Any]) -> Tubo:
+    """(OD, espesor) de la camisa circular; "002A_tubo" se guarda como "OD / ID"."""
+    if str(definicion.get("camisa_tipo", "")).strip().upper() != "CIRCULAR":
+        return None, None
+    partes = str(definicion.get("002A_tubo", "")).split("/")
+    if len(partes) != 2:
+        return None, None
+    od, di = parse_num(partes[0]), parse_num(partes[1])
+    if od is None or di is None:
+        return None, None
+    return od, (od - di) / 2.0
+
+
+def resolver_planos_pedido(con, pedido_id: int, catalogs: Optional[Mapping[str, Any]] = None) -> Dict[int, Dict[str, str]]:
+    filas = list_sinfines_definiciones(con, pedido_id)
+    planos = catalog_model(catalogs if catalogs is not None else get_catalogs()).planos
+
+    ejes = planos.codigos(tubo_eje(d) for _, _, d in filas)
+    camisas = planos.codigos(tubo_camisa(d) for _, _, d in filas)
+    return {
+        sid: {"nombre": nombre, "eje": eje, "camisa": camisa}
+        for (sid, nombre, _), eje, camisa in zip(filas, ejes, camisas)
+    }
+
+
+def main(argv=None) -> int:
+    """python -m utils.planos <pedido_id>  -> CSV (sinfin;nombre;eje;camisa) por stdout."""
+    from utils.db import connect
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Uso: python -m utils.planos <pedido_id>", file=sys.stderr)
+        return 2
+    con = connect()
+    try:
+        planos = resolver_planos_pedido(con, int(argv[0]))
+    finally:
+        con.close()
+
+    w = csv.writer(sys.stdout, delimiter=";")
+    w.writerow(["sinfin", "nombre", "plano_testeros_eje", "plano_testeros_camisa"])
+    for sid, p in planos.items():
+        w.writerow([sid, p["nombre"], p["eje"], p["camisa"]])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
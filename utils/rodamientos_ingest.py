@@ -0,0 +1,270 @@
+# utils/rodamientos_ingest.py
+"""
+Ingesta en streaming de catálogos de rodamientos de proveedor (CSV de cientos de miles de filas).
+
+    rows = iter_rodamientos_csv("data/rodamientos.csv")    # generador, fila a fila
+    report = convert_rodamientos(IN_CSV, OUT, formato="jsonl")
+
+Pasos:
+  1) parseo con generador (csv.DictReader), normalización de columnas y números
+  2) deduplicado por ref (gana la primera aparición; solo se guardan las refs en memoria)
+  3) ordenación externa por (d, ref): tramos de `run_size` filas ordenados en memoria y
+     volcados a temporales JSONL, luego heapq.merge -> memoria acotada a un tramo
+  4) escritura en streaming: JSON Lines, JSON (formato de data/rodamientos.json),
+     CSV normalizado o tabla cat_rodamientos de la BD de catálogos (utils.catalog_store)
+
+El informe incluye filas/s para comparar proveedores y máquinas.
+"""
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_RUN_SIZE = 50_000
+FORMATOS = ("json", "jsonl", "csv", "sqlite")
+
+# d desconocido al final (mismo criterio que el conversor original)
+_D_NONE = 1e18
+
+
+def _detect_delimiter(sample: str) -> str:
+    # Excel ES suele exportar con ';'
+    if sample.count(";") > sample.count(","):
+        return ";"
+    return ","
+
+
+def to_float(x) -> Optional[float]:
+    """Número de una celda de proveedor ("1,5", "104?", "") -> float o None."""
+    if x is None:
+        return None
+    s = str(x).strip().replace(",", ".").replace("?", "")
+    if not s:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def _num(v: Optional[float]) -> Any:
+    """40.0 -> 40 para que el JSON quede como el catálogo escrito a mano."""
+    if v is None:
+        return None
+    return int(v) if v.is_integer() else v
+
+
+def _first(row: Dict[str, Any], *names: str) -> str:
+    # tolerar nombres alternativos de columnas (y espacios/tabuladores de más)
+    for n in names:
+        v = row.get(n)
+        if v:
+            return str(v).strip()
+    return ""
+
+
+def iter_rodamientos_csv(path: str, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Genera {"ref","name","d","D","B","C","C0"} por fila del CSV de proveedor.
+      - "Serie" -> ref (clave corta), "Referencia" -> name (texto del desplegable)
+      - C / C0: capacidades de carga dinámica / estática en kN (None si no vienen)
+      - filas sin serie ni referencia se saltan (stats["invalid"])
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("rows_in", 0)
+    stats.setdefault("invalid", 0)
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(2048)
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter=_detect_delimiter(sample))
+        if reader.fieldnames:
+            reader.fieldnames = [(h or "").strip() for h in reader.fieldnames]
+
+        for row in reader:
+            stats["rows_in"] += 1
+            serie = _first(row, "Serie", "serie", "SERIE")
+            name = _first(row, "Referencia", "referencia", "REF")
+            if not serie and not name:
+                stats["invalid"] += 1
+                continue
+            yield {
+                "ref": serie if serie else name,
+                "name": name if name else serie,
+                "d": to_float(_first(row, "d_mm", "d")),
+                "D": to_float(_first(row, "D_mm.1", "D_mm", "D")),
+                "B": to_float(_first(row, "B_mm", "B")),
+                "C": to_float(_first(row, "C_kN", "C")),
+                "C0": to_float(_first(row, "C0_kN", "C0")),
+            }
+
+
+def dedupe_by_ref(items: Iterable[Dict[str, Any]], stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """Descarta refs repetidas (gana la primera). Solo guarda las refs, no las filas."""
+    stats = stats if stats is not None else {}
+    stats.setdefault("duplicates", 0)
+    seen = set()
+    for it in items:
+        ref = it["ref"]
+        if ref in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(ref)
+        yield it
+
+
+def sort_key(it: Dict[str, Any]) -> Tuple[float, str]:
+    d = it["d"] if it["d"] is not None else _D_NONE
+    return (d, str(it.get("ref", "")))
+
+
+def _write_run(chunk: List[Dict[str, Any]], tmp_dir: str) -> str:
+    chunk.sort(key=sort_key)
+    fd, path = tempfile.mkstemp(prefix="rod_run_", suffix=".jsonl", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for it in chunk:
+            f.write(json.dumps(it, ensure_ascii=False))
+            f.write("\n")
+    return path
+
+
+def _read_run(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def external_sort(
+    items: Iterable[Dict[str, Any]],
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[str] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Ordena por (d, ref) con memoria acotada a `run_size` filas.
+    Si todo cabe en un tramo no se toca disco. Los temporales se borran al agotar el generador.
+    """
+    stats = stats if stats is not None else {}
+    run_size = max(1, int(run_size))
+    runs: List[str] = []
+    chunk: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="rodamientos_", dir=tmp_dir) as work:
+        for it in items:
+            chunk.append(it)
+            if len(chunk) >= run_size:
+                runs.append(_write_run(chunk, work))
+                chunk = []
+
+        stats["runs"] = len(runs) + (1 if chunk else 0)
+        if not runs:
+            chunk.sort(key=sort_key)
+            yield from chunk
+            return
+
+        if chunk:
+            runs.append(_write_run(chunk, work))
+            chunk = []
+        yield from heapq.merge(*(_read_run(p) for p in runs), key=sort_key)
+
+
+# ------------------ Escritores (streaming) ------------------
+
+def public_record(it: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de un rodamiento tal como se escriben en los JSON de catálogo (C/C0 si los hay)."""
+    out = {"ref": it["ref"], "name": it["name"], "d": _num(it["d"]), "D": _num(it["D"]), "B": _num(it["B"])}
+    # C/C0 solo si el proveedor los da (los JSON antiguos no los llevan)
+    for k in ("C", "C0"):
+        if it.get(k) is not None:
+            out[k] = _num(it[k])
+    return out
+
+
+def write_jsonl(items: Iterable[Dict[str, Any]], out_path: str) -> int:
+    n = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for it in items:
+            f.write(json.dumps(public_record(it), ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            n += 1
+    return n
+
+
+def write_json(items: Iterable[Dict[str, Any]], out_path: str) -> int:
+    """Array JSON con un rodamiento por línea (formato de data/rodamientos.json)."""
+    n = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for it in items:
+            f.write(",\n  " if n else "\n  ")
+            f.write(json.dumps(public_record(it), ensure_ascii=False, separators=(",", ":")))
+            n += 1
+        f.write("\n]\n" if n else "]\n")
+    return n
+
+
+def write_csv(items: Iterable[Dict[str, Any]], out_path: str) -> int:
+    n = 0
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["ref", "name", "d", "D", "B", "C", "C0"])
+        for it in items:
+            p = public_record(it)
+            w.writerow([p["ref"], p["name"], p["d"], p["D"], p["B"], p.get("C"), p.get("C0")])
+            n += 1
+    return n
+
+
+def write_sqlite(items: Iterable[Dict[str, Any]], db_path: str, batch: int = 5_000) -> int:
+    """Reemplaza cat_rodamientos de la BD de catálogos (utils.catalog_store) por lotes."""
+    from utils.catalog_store import import_rodamientos
+
+    con = sqlite3.connect(db_path)
+    try:
+        return import_rodamientos(con, items, batch=batch)
+    finally:
+        con.close()
+
+
+_WRITERS = {
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "sqlite": write_sqlite,
+}
+
+
+def convert_rodamientos(
+    in_csv: str,
+    out_path: str,
+    formato: str = "jsonl",
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    CSV de proveedor -> salida ordenada por (d, ref) sin cargar el CSV entero.
+    Devuelve informe: rows_in, rows_out, duplicates, invalid, runs, seconds, rows_per_s.
+    """
+    if formato not in _WRITERS:
+        raise ValueError(f"Formato no soportado: {formato} (usa {', '.join(FORMATOS)})")
+    if not os.path.exists(in_csv):
+        raise FileNotFoundError(f"No existe: {in_csv}")
+
+    stats: Dict[str, Any] = {}
+    t0 = time.perf_counter()
+    rows = dedupe_by_ref(iter_rodamientos_csv(in_csv, stats), stats)
+    n = _WRITERS[formato](external_sort(rows, run_size, tmp_dir, stats), out_path)
+    seconds = time.perf_counter() - t0
+
+    stats["rows_out"] = n
+    stats["seconds"] = seconds
+    stats["rows_per_s"] = stats["rows_in"] / seconds if seconds > 0 else 0.0
+    stats["formato"] = formato
+    stats["out"] = out_path
+    return stats